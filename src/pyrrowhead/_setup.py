@@ -5,7 +5,12 @@ import configparser
 import typer
 
 from pyrrowhead import utils, rich_console
-from pyrrowhead.constants import APP_NAME, LOCAL_CLOUDS_SUBDIR, CONFIG_FILE
+from pyrrowhead.constants import (
+    APP_NAME,
+    LOCAL_CLOUDS_SUBDIR,
+    CONFIG_FILE,
+    CACHE_SUBDIR,
+)
 
 
 def _is_initialized(pyrrowhead_path: Path) -> Tuple[bool, bool, bool]:
@@ -30,7 +35,7 @@ def _setup_pyrrowhead():
     elif len(list(pyrrowhead_path.iterdir())) == 0:
         rich_console.print("Empty pyrrowhead directory found.")
     elif any(
-        p.name not in {LOCAL_CLOUDS_SUBDIR, CONFIG_FILE}
+        p.name not in {LOCAL_CLOUDS_SUBDIR, CONFIG_FILE, CACHE_SUBDIR}
         for p in pyrrowhead_path.iterdir()
     ):
         rich_console.print(
@@ -1,4 +1,5 @@
 from collections.abc import Sequence
+from itertools import chain
 from pathlib import Path
 from typing import Optional, List, Callable
 from functools import wraps
@@ -17,6 +18,16 @@ from pyrrowhead.cloud.run import start_local_cloud, stop_local_cloud
 from pyrrowhead.cloud.configuration import enable_ssl as enable_ssl_func
 from pyrrowhead.cloud.client_add import add_client_system
 from pyrrowhead.cloud.inspect import inspect
+from pyrrowhead.cloud.snapshot import export_snapshot, import_snapshot
+from pyrrowhead.management.bulk import (
+    DEFAULT_CHUNK_SIZE,
+    write_report,
+    create_section_table,
+    section_errors,
+)
+from pyrrowhead.management.cache import configure_cache
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead.management.common import OPT_CONCURRENCY
 from pyrrowhead.utils import (
     switch_directory,
     set_active_cloud as set_active_cloud_func,
@@ -460,3 +471,87 @@ def cli_inspect(
     rich_console.print(core_table)
     if len(client_table.rows) > 1:
         rich_console.print(client_table)
+
+
+snapshot_app = typer.Typer(
+    name="snapshot",
+    help="Export the registry state of a local cloud to a snapshot file, "
+    "or restore it from one.",
+)
+cloud_app.add_typer(snapshot_app)
+
+OPT_SNAPSHOT_FILE = typer.Option(
+    ...,
+    "--file",
+    "-f",
+    dir_okay=False,
+    metavar="SNAPSHOT_FILE",
+    help="Gzip compressed NDJSON snapshot file.",
+)
+
+
+@snapshot_app.command(name="export")
+@print_pyrrowhead_error
+def snapshot_export(
+    cloud_identifier: str = ARG_CLOUD_IDENTIFIER,
+    cloud_name: Optional[str] = OPT_CLOUD_NAME,
+    organization_name: Optional[str] = OPT_ORG_NAME,
+    clouds_directory: Path = OPT_CLOUDS_DIRECTORY,
+    snapshot_file: Path = OPT_SNAPSHOT_FILE,
+):
+    """
+    Exports the systems, services, orchestration store and authorization rules of a
+    running local cloud to a snapshot file.
+
+    The records are always fetched from the core systems, never from the cache.
+    """
+    configure_cache(fresh=True)
+    counts = export_snapshot(ArrowheadClient(clouds_directory), snapshot_file)
+
+    exported = ", ".join(f"{count} {section}" for section, count in counts.items())
+    rich_console.print(f"Exported {exported} records to {snapshot_file}")
+
+
+@snapshot_app.command(name="import")
+@print_pyrrowhead_error
+def snapshot_import(
+    cloud_identifier: str = ARG_CLOUD_IDENTIFIER,
+    cloud_name: Optional[str] = OPT_CLOUD_NAME,
+    organization_name: Optional[str] = OPT_ORG_NAME,
+    clouds_directory: Path = OPT_CLOUDS_DIRECTORY,
+    snapshot_file: Path = OPT_SNAPSHOT_FILE,
+    concurrency: int = OPT_CONCURRENCY,
+    chunk_size: int = typer.Option(
+        DEFAULT_CHUNK_SIZE,
+        "--chunk-size",
+        min=1,
+        help="Number of orchestration rules added per request.",
+    ),
+    report: Optional[Path] = typer.Option(
+        None,
+        dir_okay=False,
+        metavar="REPORT_FILE",
+        help="Write the result of every request to REPORT_FILE as NDJSON.",
+    ),
+):
+    """
+    Restores a snapshot file into a running local cloud.
+
+    Ids in the snapshot are remapped to the ids of the restored systems, service
+    definitions and interfaces in the local cloud. Core systems and their services
+    are skipped, and systems and services that are already registered are reported
+    as existing.
+    """
+    # Existing registrations must be checked against the actual state
+    configure_cache(fresh=True)
+    results = import_snapshot(
+        ArrowheadClient(clouds_directory), snapshot_file, concurrency, chunk_size
+    )
+    if report is not None:
+        write_report(report, chain.from_iterable(results.values()))
+
+    rich_console.print(create_section_table(results, "Snapshot import"))
+    for error in section_errors(results):
+        rich_console.print(error, style="red", highlight=False)
+    if not all(result.ok for result in chain.from_iterable(results.values())):
+        raise typer.Exit(-1)
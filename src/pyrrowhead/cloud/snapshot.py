@@ -0,0 +1,367 @@
+import gzip
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from pyrrowhead.management.bulk import (
+    AuthorizationRule,
+    BulkResult,
+    OrchestrationRule,
+    DEFAULT_CHUNK_SIZE,
+)
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead.management.index import SystemKey, SYSTEM_NOT_FOUND
+from pyrrowhead.management.utils import DEFAULT_CONCURRENCY
+from pyrrowhead.utils import PyrrowheadError
+
+SNAPSHOT_FORMAT = "pyrrowhead-snapshot"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SECTIONS = ("system", "service", "orchestration", "authorization")
+
+
+def _system_entry(system: Dict) -> Dict:
+    entry = {
+        "id": system["id"],
+        "name": system["systemName"],
+        "address": system["address"],
+        "port": system["port"],
+    }
+    if system.get("authenticationInfo"):
+        entry["authenticationInfo"] = system["authenticationInfo"]
+    return entry
+
+
+def _service_entry(service: Dict) -> Dict:
+    return {
+        "id": service["id"],
+        "definition": service["serviceDefinition"]["serviceDefinition"],
+        "provider": service["provider"]["id"],
+        "uri": service["serviceUri"],
+        "interfaces": [
+            interface["interfaceName"] for interface in service["interfaces"]
+        ],
+        "secure": service["secure"],
+        "metadata": service.get("metadata"),
+        "version": service.get("version"),
+    }
+
+
+def _orchestration_entry(rule: Dict) -> Dict:
+    return {
+        "id": rule["id"],
+        "definition": rule["serviceDefinition"]["serviceDefinition"],
+        "interface": rule["serviceInterface"]["interfaceName"],
+        "consumer": rule["consumerSystem"]["id"],
+        "provider": rule["providerSystem"]["id"],
+        "priority": rule["priority"],
+        "attribute": rule.get("attribute"),
+    }
+
+
+def _authorization_entry(rule: Dict) -> Dict:
+    return {
+        "id": rule["id"],
+        "definition": rule["serviceDefinition"]["serviceDefinition"],
+        "interfaces": [interface["interfaceName"] for interface in rule["interfaces"]],
+        "consumer": rule["consumerSystem"]["id"],
+        "provider": rule["providerSystem"]["id"],
+    }
+
+
+def snapshot_entries(client: ArrowheadClient) -> Iterator[Tuple[str, Dict]]:
+    """
+    Yield the section and entry of every record of a snapshot of the cloud.
+
+    Systems come first, and services and rules refer to them by their id in the
+    exported cloud. Orchestration rules with foreign providers belong to other
+    clouds and are left out.
+    """
+    for system in client.list_systems():
+        yield "system", _system_entry(system)
+    for service in client.list_services():
+        yield "service", _service_entry(service)
+    for rule in client.list_orchestration_rules():
+        if not rule.get("foreign"):
+            yield "orchestration", _orchestration_entry(rule)
+    for rule in client.list_authorization_rules():
+        yield "authorization", _authorization_entry(rule)
+
+
+def export_snapshot(client: ArrowheadClient, snapshot_path: Path) -> Dict[str, int]:
+    """
+    Write a snapshot of the systems, services, orchestration store and
+    authorization rules of a cloud.
+
+    The snapshot is gzip compressed NDJSON, with a header line followed by one line
+    per record. Records are streamed from the core systems to the file, and the
+    file only replaces ``snapshot_path`` once it is complete.
+
+    Returns:
+        The number of records exported per section.
+    """
+    counts = dict.fromkeys(SNAPSHOT_SECTIONS, 0)
+    snapshot_path = Path(snapshot_path)
+    temp_path = snapshot_path.with_name(f".{snapshot_path.name}.{os.getpid()}.tmp")
+    try:
+        with gzip.open(temp_path, "wt") as snapshot_file:
+            header = {
+                "format": SNAPSHOT_FORMAT,
+                "version": SNAPSHOT_VERSION,
+                "created": time.time(),
+            }
+            snapshot_file.write(json.dumps(header) + "\n")
+            for section, entry in snapshot_entries(client):
+                snapshot_file.write(
+                    json.dumps({"kind": section, **entry}, separators=(",", ":")) + "\n"
+                )
+                counts[section] += 1
+        os.replace(temp_path, snapshot_path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+    return counts
+
+
+def read_snapshot(snapshot_path: Path) -> Dict[str, List[Dict]]:
+    """
+    Read the entries of a snapshot file, grouped by section.
+
+    Raises:
+        PyrrowheadError: If the file is not a readable snapshot.
+    """
+    sections: Dict[str, List[Dict]] = {section: [] for section in SNAPSHOT_SECTIONS}
+    line_number = 1
+    try:
+        with gzip.open(snapshot_path, "rt") as snapshot_file:
+            header = json.loads(next(snapshot_file, "null"))
+            if not isinstance(header, dict) or header.get("format") != SNAPSHOT_FORMAT:
+                raise PyrrowheadError(f"{snapshot_path} is not a pyrrowhead snapshot.")
+            if header.get("version") != SNAPSHOT_VERSION:
+                raise PyrrowheadError(
+                    f"Unsupported snapshot version {header.get('version')}, "
+                    f"supported version is {SNAPSHOT_VERSION}."
+                )
+            for line_number, line in enumerate(snapshot_file, start=2):
+                entry = json.loads(line)
+                sections[entry.pop("kind")].append(entry)
+    except (OSError, EOFError) as e:
+        raise PyrrowheadError(f"Could not read snapshot {snapshot_path}: {e}")
+    except (ValueError, KeyError, AttributeError) as e:
+        raise PyrrowheadError(
+            f"Malformed snapshot {snapshot_path} at line {line_number}: {e!r}"
+        )
+
+    return sections
+
+
+def _system_request(system_entry: Dict) -> Dict:
+    system_request = {
+        "systemName": system_entry["name"],
+        "address": system_entry["address"],
+        "port": system_entry["port"],
+    }
+    if "authenticationInfo" in system_entry:
+        system_request["authenticationInfo"] = system_entry["authenticationInfo"]
+    return system_request
+
+
+def _failed(entry: Dict, message: str) -> BulkResult:
+    return BulkResult(entry, {"errorMessage": message}, 0)
+
+
+def _exists(entry: Dict, record_id: int) -> BulkResult:
+    return BulkResult(entry, {"id": record_id, "exists": True}, 200)
+
+
+def import_snapshot(
+    client: ArrowheadClient,
+    snapshot_path: Path,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, List[BulkResult]]:
+    """
+    Restore a snapshot into a cloud.
+
+    Systems and services are registered concurrently, orchestration rules are stored
+    concurrently ``chunk_size`` rules per request, and authorization rules are
+    compacted into as few requests as possible and sent concurrently. The ids in the
+    snapshot are remapped to the ids the systems, service definitions and interfaces
+    have in the target cloud, which are looked up once the systems and services are
+    registered.
+
+    Core systems and the services they provide are not imported, since the target
+    cloud has its own. Systems, services and orchestration store rules that already
+    exist in the target cloud are not added again, and have a successful result
+    with status 200 and ``exists`` set in the response data.
+
+    Returns:
+        The results per section. Entries that could not be remapped have a failed
+        result with status 0.
+
+    Raises:
+        PyrrowheadError: If the file is not a readable snapshot.
+    """
+    snapshot = read_snapshot(snapshot_path)
+    results: Dict[str, List[BulkResult]] = {}
+
+    systems = {entry["id"]: entry for entry in snapshot["system"]}
+    system_keys: Dict[int, SystemKey] = {
+        old_id: (entry["name"], entry["address"], entry["port"])
+        for old_id, entry in systems.items()
+    }
+    core_ids = {
+        old_id for old_id, key in system_keys.items() if client.is_core_system(key)
+    }
+    imported_ids = [old_id for old_id in systems if old_id not in core_ids]
+
+    results["system"] = []
+    new_systems = []
+    existing_ids = client.get_system_ids(system_keys[old_id] for old_id in imported_ids)
+    for old_id, existing_id in zip(imported_ids, existing_ids):
+        if existing_id == SYSTEM_NOT_FOUND:
+            new_systems.append(_system_request(systems[old_id]))
+        else:
+            results["system"].append(_exists(systems[old_id], existing_id))
+    results["system"].extend(client.add_systems(new_systems, concurrency))
+    system_ids = {
+        old_id: new_id
+        for old_id, new_id in zip(
+            system_keys, client.get_system_ids(system_keys.values())
+        )
+        if new_id != SYSTEM_NOT_FOUND
+    }
+
+    existing_services = {
+        (
+            service["serviceDefinition"]["serviceDefinition"],
+            service["provider"]["id"],
+            service["serviceUri"],
+        ): service["id"]
+        for service in client.list_services()
+    }
+    registry_requests = []
+    results["service"] = []
+    for entry in snapshot["service"]:
+        if entry["provider"] in core_ids:
+            continue
+        if entry["provider"] not in systems:
+            results["service"].append(_failed(entry, "Unknown provider system."))
+            continue
+        existing_key = (
+            entry["definition"],
+            system_ids.get(entry["provider"]),
+            entry["uri"],
+        )
+        if existing_key in existing_services:
+            results["service"].append(_exists(entry, existing_services[existing_key]))
+            continue
+        registry_requests.append(
+            {
+                "serviceDefinition": entry["definition"],
+                "serviceUri": entry["uri"],
+                "interfaces": entry["interfaces"],
+                "secure": entry["secure"],
+                "providerSystem": _system_request(systems[entry["provider"]]),
+                "metadata": entry["metadata"],
+                "version": entry["version"],
+            }
+        )
+    results["service"].extend(client.register_services(registry_requests, concurrency))
+
+    existing_rules = {
+        (
+            rule["consumerSystem"]["id"],
+            (
+                rule["providerSystem"]["systemName"],
+                rule["providerSystem"]["address"],
+                rule["providerSystem"]["port"],
+            ),
+            rule["serviceDefinition"]["serviceDefinition"],
+            rule["serviceInterface"]["interfaceName"],
+        ): rule["id"]
+        for rule in client.list_orchestration_rules()
+        if not rule.get("foreign")
+    }
+    orchestration_rules = []
+    results["orchestration"] = []
+    for entry in snapshot["orchestration"]:
+        if entry["consumer"] not in system_ids or entry["provider"] not in systems:
+            results["orchestration"].append(
+                _failed(entry, "Consumer or provider system is not registered.")
+            )
+            continue
+        store_key = (
+            system_ids[entry["consumer"]],
+            system_keys[entry["provider"]],
+            entry["definition"],
+            entry["interface"],
+        )
+        if store_key in existing_rules:
+            results["orchestration"].append(_exists(entry, existing_rules[store_key]))
+            continue
+        orchestration_rules.append(
+            OrchestrationRule(
+                entry["definition"],
+                entry["interface"],
+                system_keys[entry["provider"]],
+                system_ids[entry["consumer"]],
+                system_keys[entry["consumer"]],
+                entry["priority"],
+                entry["attribute"],
+            )
+        )
+    results["orchestration"].extend(
+        client.add_orchestration_rules(
+            orchestration_rules, chunk_size, concurrency=concurrency
+        )
+    )
+
+    # Authorization rules may refer to service definitions and interfaces of any
+    # provider, so their ids are looked up among all registered services
+    definition_ids = client.service_index.definition_ids
+    interface_ids = client.service_index.interface_ids
+
+    authorization_rules: List[AuthorizationRule] = []
+    results["authorization"] = []
+    for entry in snapshot["authorization"]:
+        if entry["consumer"] not in system_ids or entry["provider"] not in system_ids:
+            results["authorization"].append(
+                _failed(entry, "Consumer or provider system is not registered.")
+            )
+            continue
+        if entry["definition"] not in definition_ids:
+            results["authorization"].append(
+                _failed(
+                    entry,
+                    f"No registered service has service definition "
+                    f'{entry["definition"]}.',
+                )
+            )
+            continue
+        unknown_interfaces = set(entry["interfaces"]) - interface_ids.keys()
+        if unknown_interfaces:
+            results["authorization"].append(
+                _failed(
+                    entry,
+                    f"No registered service has interface "
+                    f'{", ".join(sorted(unknown_interfaces))}.',
+                )
+            )
+            continue
+        authorization_rules.extend(
+            AuthorizationRule(
+                system_ids[entry["consumer"]],
+                system_ids[entry["provider"]],
+                interface_ids[interface],
+                definition_ids[entry["definition"]],
+            )
+            for interface in entry["interfaces"]
+        )
+    results["authorization"].extend(
+        client.add_authorization_rules(authorization_rules, concurrency)
+    )
+
+    return results
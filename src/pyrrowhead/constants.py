@@ -9,6 +9,7 @@ CLOUD_CONFIG_FILE_NAME = "cloud_config.yaml"
 CONFIG_FILE = "config.cfg"
 ORG_CERT_DIR = "org_certs"
 ROOT_CERT_DIR = "root_certs"
+CACHE_SUBDIR = "cache"
 
 # Typer constants
 ARG_ORG_NAME = typer.Argument(
@@ -1,13 +1,66 @@
+from typing import Optional
+
 import typer
 
-from pyrrowhead.management.cli import sr_app, orch_app, auth_app, sys_app
+from pyrrowhead.management.cli import (
+    sr_app,
+    orch_app,
+    auth_app,
+    sys_app,
+    search_cli,
+    apply_cli,
+    audit_cli,
+)
+from pyrrowhead.management.cache import configure_cache, DEFAULT_CACHE_TTL
+from pyrrowhead.management.utils import (
+    configure_timeouts,
+    set_command_deadline,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+)
 from pyrrowhead.cloud.cli import cloud_app
 
 # from pyrrowhead.org.cli import org_app
 from pyrrowhead._setup import _setup_pyrrowhead
 from pyrrowhead.tui import TuiApp
 
-app = typer.Typer(callback=_setup_pyrrowhead)
+
+def main_callback(
+    connect_timeout: float = typer.Option(
+        DEFAULT_CONNECT_TIMEOUT,
+        metavar="SECONDS",
+        help="Seconds to wait for a connection to a core system.",
+    ),
+    read_timeout: float = typer.Option(
+        DEFAULT_READ_TIMEOUT,
+        metavar="SECONDS",
+        help="Seconds to wait for data from a core system.",
+    ),
+    deadline: Optional[float] = typer.Option(
+        None,
+        metavar="SECONDS",
+        help="Abort the command if all core system calls have not completed "
+        "within SECONDS.",
+    ),
+    hedge_after: Optional[float] = typer.Option(
+        None,
+        metavar="SECONDS",
+        help="Resend read requests that have not completed after SECONDS "
+        "and use the first response.",
+    ),
+    cache_ttl: float = typer.Option(
+        DEFAULT_CACHE_TTL,
+        metavar="SECONDS",
+        help="Reuse list responses fetched within SECONDS, 0 disables the cache.",
+    ),
+):
+    _setup_pyrrowhead()
+    configure_timeouts(connect_timeout, read_timeout, hedge_after)
+    set_command_deadline(deadline)
+    configure_cache(ttl=cache_ttl)
+
+
+app = typer.Typer(callback=main_callback)
 app.add_typer(sr_app)
 app.add_typer(orch_app)
 app.add_typer(auth_app)
@@ -15,6 +68,9 @@ app.add_typer(sys_app)
 app.add_typer(cloud_app)
 # The org command is work in progress
 # app.add_typer(org_app)
+app.command("search")(search_cli)
+app.command("apply")(apply_cli)
+app.command("audit")(audit_cli)
 
 
 @app.command("interactive")
@@ -21,6 +21,8 @@ from pyrrowhead.management.systemregistry import (
     list_systems,
     remove_system,
 )
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead.management.async_client import AsyncManagementClient
 
 __all__ = [
     # SERVICE REGISTRY
@@ -42,4 +44,7 @@ __all__ = [
     "add_system",
     "list_systems",
     "remove_system",
+    # CLIENTS
+    "ArrowheadClient",
+    "AsyncManagementClient",
 ]
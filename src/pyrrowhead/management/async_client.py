@@ -0,0 +1,168 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Optional, Tuple, Callable, Any, List, Dict
+
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead.management.common import AccessPolicy
+from pyrrowhead.management.utils import DEFAULT_CONCURRENCY, ensure_pool_size
+
+
+class AsyncManagementClient:
+    """
+    Asyncio interface to the management operations.
+
+    Every operation is run by ``client`` in a worker pool of ``concurrency`` threads
+    sharing the pooled core system connections, so any number of operations can be
+    awaited together with :func:`asyncio.gather` while at most ``concurrency``
+    requests are in flight at the same time.
+
+    Args:
+        concurrency: Maximum number of concurrent requests.
+        client: Client used for the operations, a client for the active local cloud
+          is created if not given.
+
+    Example:
+        >>> async with AsyncManagementClient(concurrency=32) as client:
+        ...     await asyncio.gather(
+        ...         *(client.add_system(name, address, port)
+        ...           for name, address, port in systems)
+        ...     )
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        client: Optional[ArrowheadClient] = None,
+    ):
+        self.concurrency = concurrency
+        self.client = client if client is not None else ArrowheadClient()
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="pyrrowhead"
+        )
+        ensure_pool_size(concurrency)
+
+    async def __aenter__(self) -> "AsyncManagementClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    async def _run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    async def _collect(self, func: Callable[..., Any], *args, **kwargs) -> List[Dict]:
+        return await self._run(lambda: list(func(*args, **kwargs)))
+
+    # SERVICE REGISTRY
+    async def list_services(
+        self,
+        service_definition: Optional[str] = None,
+        system_name: Optional[str] = None,
+        system_id: Optional[int] = None,
+    ) -> List[Dict]:
+        return await self._collect(
+            self.client.list_services, service_definition, system_name, system_id
+        )
+
+    async def inspect_service(self, service_id: int):
+        return await self._run(self.client.inspect_service, service_id)
+
+    async def add_service(
+        self,
+        service_definition: str,
+        uri: str,
+        interface: str,
+        access_policy: AccessPolicy,
+        system: Tuple[str, str, int],
+    ):
+        return await self._run(
+            self.client.add_service,
+            service_definition,
+            uri,
+            interface,
+            access_policy,
+            system,
+        )
+
+    async def delete_service(self, service_id: int):
+        return await self._run(self.client.delete_service, service_id)
+
+    async def grouped_services(self):
+        return await self._run(self.client.grouped_services)
+
+    # SYSTEM REGISTRY
+    async def list_systems(self) -> List[Dict]:
+        return await self._collect(self.client.list_systems)
+
+    async def add_system(
+        self,
+        system_name: str,
+        system_address: str,
+        system_port: int,
+        certificate_file: Optional[Path] = None,
+    ):
+        return await self._run(
+            self.client.add_system,
+            system_name,
+            system_address,
+            system_port,
+            certificate_file,
+        )
+
+    async def remove_system(self, system_id: int):
+        return await self._run(self.client.remove_system, system_id)
+
+    # ORCHESTRATOR
+    async def list_orchestration_rules(self) -> List[Dict]:
+        return await self._collect(self.client.list_orchestration_rules)
+
+    async def add_orchestration_rule(
+        self,
+        service_definition: str,
+        service_interface: str,
+        provider_system: Tuple[str, str, int],
+        consumer_id: Optional[int] = None,
+        priority: int = 1,
+        metadata: Optional[int] = None,
+        add_auth_rule: Optional[bool] = None,
+    ):
+        return await self._run(
+            self.client.add_orchestration_rule,
+            service_definition=service_definition,
+            service_interface=service_interface,
+            provider_system=provider_system,
+            consumer_id=consumer_id,
+            priority=priority,
+            metadata=metadata,
+            add_auth_rule=add_auth_rule,
+        )
+
+    async def remove_orchestration_rule(self, orchestration_id: int):
+        return await self._run(self.client.remove_orchestration_rule, orchestration_id)
+
+    # AUTHORIZATION
+    async def list_authorization_rules(self) -> List[Dict]:
+        return await self._collect(self.client.list_authorization_rules)
+
+    async def add_authorization_rule(
+        self,
+        consumer_id: int,
+        provider_id: int,
+        interface_id: int,
+        service_definition_id: int,
+    ):
+        return await self._run(
+            self.client.add_authorization_rule,
+            consumer_id,
+            provider_id,
+            interface_id,
+            service_definition_id,
+        )
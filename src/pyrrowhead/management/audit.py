@@ -0,0 +1,255 @@
+import json
+from collections import Counter
+from typing import Dict, Iterable, Iterator, NamedTuple, Set, TextIO, Tuple
+
+from rich import box
+from rich.table import Table, Column
+
+from pyrrowhead.management.client import ArrowheadClient
+
+DANGLING_REFERENCE = "dangling reference"
+UNREGISTERED_SERVICE = "unregistered service"
+MISSING_AUTHORIZATION = "missing authorization"
+DUPLICATE = "duplicate"
+
+
+class Issue(NamedTuple):
+    check: str
+    kind: str
+    record_id: int
+    message: str
+
+
+def _system_label(system: Dict) -> str:
+    return f'{system["systemName"]} (id: {system["id"]})'
+
+
+def audit(
+    systems: Iterable[Dict],
+    services: Iterable[Dict],
+    orchestration_rules: Iterable[Dict],
+    authorization_rules: Iterable[Dict],
+) -> Iterator[Issue]:
+    """
+    Check that the records of a cloud are consistent with each other.
+
+    Each dataset is iterated once, in the order systems, services, authorization
+    rules and orchestration rules. Every record is checked against hash indexes of
+    the datasets before it, so the audit takes time linear in the number of records
+    and only holds the indexes in memory. Reported issues are:
+
+    - Services, orchestration rules and authorization rules referring to systems
+      that are not registered.
+    - Orchestration rules whose provider does not register the service with the
+      rule interface.
+    - Orchestration rules without an authorization rule for the consumer, provider,
+      service definition and interface.
+    - Systems, services, orchestration rules and authorization rules registered
+      more than once. Services are only duplicates if they also have the same
+      service uri.
+
+    Orchestration rules with foreign providers are only checked for their consumer
+    and for duplicates, since the provider belongs to another cloud.
+
+    Yields:
+        The issues, in the order they are found.
+    """
+    system_ids: Set[int] = set()
+    system_keys: Dict[Tuple[str, str, int], int] = {}
+    for system in systems:
+        system_ids.add(system["id"])
+        key = (system["systemName"], system["address"], system["port"])
+        if key in system_keys:
+            yield Issue(
+                DUPLICATE,
+                "system",
+                system["id"],
+                f"Same name, address and port as system {system_keys[key]}",
+            )
+        else:
+            system_keys[key] = system["id"]
+
+    def dangling(kind: str, record: Dict, *roles: Tuple[str, str]) -> Iterator[Issue]:
+        for role, field in roles:
+            if record[field]["id"] not in system_ids:
+                yield Issue(
+                    DANGLING_REFERENCE,
+                    kind,
+                    record["id"],
+                    f"{role.capitalize()} {_system_label(record[field])} is not "
+                    f"registered",
+                )
+
+    # (service definition, provider id, interface) -> service id
+    registered: Dict[Tuple[str, int, str], int] = {}
+    # (service definition, provider id, service uri) -> service id
+    registrations: Dict[Tuple[str, int, str], int] = {}
+    for service in services:
+        yield from dangling("service", service, ("provider", "provider"))
+        service_definition = service["serviceDefinition"]["serviceDefinition"]
+        registration_key = (
+            service_definition,
+            service["provider"]["id"],
+            service["serviceUri"],
+        )
+        if registration_key in registrations:
+            yield Issue(
+                DUPLICATE,
+                "service",
+                service["id"],
+                f'{service_definition} at {service["serviceUri"]} is also '
+                f'registered by {_system_label(service["provider"])} as service '
+                f"{registrations[registration_key]}",
+            )
+        else:
+            registrations[registration_key] = service["id"]
+        for interface in service["interfaces"]:
+            registered.setdefault(
+                (
+                    service_definition,
+                    service["provider"]["id"],
+                    interface["interfaceName"],
+                ),
+                service["id"],
+            )
+
+    # (consumer id, provider id, service definition, interface) -> rule id
+    authorized: Dict[Tuple[int, int, str, str], int] = {}
+    for rule in authorization_rules:
+        yield from dangling(
+            "authorization",
+            rule,
+            ("consumer", "consumerSystem"),
+            ("provider", "providerSystem"),
+        )
+        for interface in rule["interfaces"]:
+            authorization_key = (
+                rule["consumerSystem"]["id"],
+                rule["providerSystem"]["id"],
+                rule["serviceDefinition"]["serviceDefinition"],
+                interface["interfaceName"],
+            )
+            if authorization_key in authorized:
+                yield Issue(
+                    DUPLICATE,
+                    "authorization",
+                    rule["id"],
+                    f"Same consumer, provider, service definition and interface "
+                    f"as authorization rule {authorized[authorization_key]}",
+                )
+            else:
+                authorized[authorization_key] = rule["id"]
+
+    stored: Dict[Tuple[int, int, bool, str, str], int] = {}
+    for rule in orchestration_rules:
+        consumer_id = rule["consumerSystem"]["id"]
+        provider_id = rule["providerSystem"]["id"]
+        service_definition = rule["serviceDefinition"]["serviceDefinition"]
+        interface_name = rule["serviceInterface"]["interfaceName"]
+        foreign = bool(rule.get("foreign"))
+
+        store_key = (
+            consumer_id,
+            provider_id,
+            foreign,
+            service_definition,
+            interface_name,
+        )
+        if store_key in stored:
+            yield Issue(
+                DUPLICATE,
+                "orchestration",
+                rule["id"],
+                f"Same consumer, provider, service definition and interface as "
+                f"orchestration rule {stored[store_key]}",
+            )
+        else:
+            stored[store_key] = rule["id"]
+
+        if foreign:
+            yield from dangling("orchestration", rule, ("consumer", "consumerSystem"))
+            continue
+        yield from dangling(
+            "orchestration",
+            rule,
+            ("consumer", "consumerSystem"),
+            ("provider", "providerSystem"),
+        )
+        if (service_definition, provider_id, interface_name) not in registered:
+            yield Issue(
+                UNREGISTERED_SERVICE,
+                "orchestration",
+                rule["id"],
+                f'{_system_label(rule["providerSystem"])} does not register '
+                f"{service_definition} with interface {interface_name}",
+            )
+        if (
+            consumer_id,
+            provider_id,
+            service_definition,
+            interface_name,
+        ) not in authorized:
+            yield Issue(
+                MISSING_AUTHORIZATION,
+                "orchestration",
+                rule["id"],
+                f'{_system_label(rule["consumerSystem"])} is not authorized to use '
+                f"{service_definition} with interface {interface_name} of "
+                f'{_system_label(rule["providerSystem"])}',
+            )
+
+
+def audit_cloud(client: ArrowheadClient) -> Iterator[Issue]:
+    """
+    Audit a cloud, see :func:`audit`.
+
+    Raises:
+        PyrrowheadError: If a core system responds with an error.
+    """
+    return audit(
+        client.list_systems(),
+        client.list_services(),
+        client.list_orchestration_rules(),
+        client.list_authorization_rules(),
+    )
+
+
+def report_issues(issues: Iterable[Issue], report_file: TextIO) -> Iterator[Issue]:
+    """
+    Write issues to a report file as NDJSON, one line per issue, as they are
+    yielded on.
+    """
+    for issue in issues:
+        report_file.write(json.dumps(issue._asdict()) + "\n")
+        yield issue
+
+
+def create_summary_table(issue_counts: Counter) -> Table:
+    summary_table = Table(
+        Column(header="Check", style="bright_white"),
+        Column(header="Kind", style="bright_blue"),
+        Column(header="Issues", style="red"),
+        title="Audit",
+        box=box.SIMPLE,
+    )
+    for (check, kind), count in sorted(issue_counts.items()):
+        summary_table.add_row(check, kind, str(count))
+
+    return summary_table
+
+
+def create_issue_table(issues: Iterable[Issue]) -> Table:
+    issue_table = Table(
+        Column(header="Check", style="bright_white"),
+        Column(header="Kind", style="bright_blue"),
+        Column(header="id", style="red"),
+        Column(header="Details"),
+        title="Issues",
+        box=box.SIMPLE,
+    )
+    for issue in issues:
+        issue_table.add_row(
+            issue.check, issue.kind, str(issue.record_id), issue.message
+        )
+
+    return issue_table
@@ -1,57 +1,58 @@
+from typing import Iterator, Iterable, Dict, List, Optional
+
 from rich import box
 from rich.table import Table, Column
 
-from pyrrowhead.management.utils import get_service, post_service
-from pyrrowhead.utils import (
-    get_core_system_address_and_port,
-    get_active_cloud_directory,
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead.management.bulk import AuthorizationRequest, BulkResult
+from pyrrowhead.management.filters import (
+    RecordFilter,
+    equality_filter,
+    AUTHORIZATION_FIELDS,
 )
 
 
-def list_authorization_rules():
-    active_cloud_directory = get_active_cloud_directory()
-    address, port, secure, scheme = get_core_system_address_and_port(
-        "authorization",
-        active_cloud_directory,
-    )
-    response = get_service(
-        f"{scheme}://{address}:{port}/authorization/mgmt/intracloud",
-        active_cloud_directory,
+def list_authorization_rules(filter_expression: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Yield the intracloud authorization rules, fetched page by page.
+
+    Raises:
+        ValueError: If the filter expression is invalid.
+        PyrrowheadError: If the authorization system responds with an error.
+    """
+    return ArrowheadClient().list_authorization_rules(filter_expression)
+
+
+def authorization_filter(
+    service_definition: Optional[str],
+    consumer_id: Optional[int],
+    consumer_name: Optional[str],
+    provider_id: Optional[int],
+    provider_name: Optional[str],
+) -> RecordFilter:
+    return equality_filter(
+        AUTHORIZATION_FIELDS,
+        definition=service_definition,
+        consumer_id=consumer_id,
+        consumer=consumer_name,
+        provider_id=provider_id,
+        provider=provider_name,
     )
-    response_data = response.json()
-    status = response.status_code
-    return response_data, status
 
 
 def add_authorization_rule(
     consumer_id: int, provider_id: int, interface_id: int, service_definition_id: int
 ):
-    active_cloud_directory = get_active_cloud_directory()
-    address, port, secure, scheme = get_core_system_address_and_port(
-        "authorization",
-        active_cloud_directory,
-    )
-
-    rule_message = {
-        "consumerId": consumer_id,
-        "providerIds": [provider_id],
-        "interfaceIds": [interface_id],
-        "serviceDefinitionIds": [service_definition_id],
-    }
-
-    # TODO: use the response data
-    response_data = post_service(  # noqa
-        f"{scheme}://{address}:{port}/authorization/mgmt/intracloud/",
-        active_cloud_directory,
-        json=rule_message,
+    return ArrowheadClient().add_authorization_rule(
+        consumer_id, provider_id, interface_id, service_definition_id
     )
 
 
-def remove_authorization_rule():
-    raise NotImplementedError
+def remove_authorization_rule(authorization_id: int):
+    return ArrowheadClient().remove_authorization_rule(authorization_id)
 
 
-def create_authorization_table(response_data):
+def create_authorization_table(auth_rules: Iterable[Dict]):
     auth_table = Table(
         Column(header="id", style="red"),
         Column(header="Consumer (id)", style="bright_blue"),
@@ -66,7 +67,7 @@ def create_authorization_table(response_data):
         box=box.HORIZONTALS,
     )
 
-    for auth_rule in response_data["data"]:
+    for auth_rule in auth_rules:
         row_data = [
             str(auth_rule["id"]),
             f'{auth_rule["consumerSystem"]["systemName"]}',
@@ -82,3 +83,45 @@ def create_authorization_table(response_data):
         auth_table.add_row(*row_data)
 
     return auth_table
+
+
+def create_request_table(
+    auth_requests: List[AuthorizationRequest],
+    results: Optional[List[BulkResult]] = None,
+) -> Table:
+    """Table of compacted authorization requests, with their results if given."""
+    request_table = Table(
+        Column(header="#", style="bright_white"),
+        Column(header="Consumer id", style="bright_blue"),
+        Column(header="Provider ids", style="blue"),
+        Column(header="Service definition ids", style="green"),
+        Column(header="Interface ids", style="bright_yellow"),
+        Column(header="Rules", style="bright_white"),
+        title="Authorization requests",
+        caption=f"{sum(request.rule_count for request in auth_requests)} rules in "
+        f"{len(auth_requests)} requests",
+        box=box.SIMPLE,
+    )
+    if results is not None:
+        request_table.add_column("Result")
+
+    for index, request in enumerate(auth_requests):
+        row_data = [
+            str(index),
+            str(request.consumer_id),
+            ", ".join(map(str, request.provider_ids)),
+            ", ".join(map(str, request.service_definition_ids)),
+            ", ".join(map(str, request.interface_ids)),
+            str(request.rule_count),
+        ]
+        if results is not None:
+            result = results[index]
+            row_data.append(
+                "[green]Added[/green]"
+                if result.ok
+                else f"[red]Failed[/red] "
+                f'{result.response_data.get("errorMessage", "")} ({result.status})'
+            )
+        request_table.add_row(*row_data)
+
+    return request_table
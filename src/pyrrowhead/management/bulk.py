@@ -0,0 +1,481 @@
+import csv
+import json
+from pathlib import Path
+from itertools import groupby
+from typing import (
+    List,
+    Dict,
+    Tuple,
+    NamedTuple,
+    Any,
+    Optional,
+    Callable,
+    TypeVar,
+    Iterable,
+    Set,
+    FrozenSet,
+)
+
+import requests
+import yaml
+import yamlloader  # type: ignore
+from rich import box
+from rich.table import Table, Column
+
+from pyrrowhead.management.common import AccessPolicy
+from pyrrowhead.utils import PyrrowheadError
+
+T = TypeVar("T")
+
+MAX_REPORTED_ERRORS = 20
+DEFAULT_CHUNK_SIZE = 100
+
+
+class ServiceRegistration(NamedTuple):
+    service_definition: str
+    uri: str
+    interface: str
+    access_policy: AccessPolicy
+    system: Tuple[str, str, int]
+
+
+class OrchestrationRule(NamedTuple):
+    service_definition: str
+    interface: str
+    provider: Tuple[str, str, int]
+    consumer_id: Optional[int]
+    consumer: Tuple[str, str, int]
+    priority: int = 1
+    attribute: Optional[Dict] = None
+
+
+class StoreChunk(NamedTuple):
+    chunk_index: int
+    first_rule: int
+    rules: List[OrchestrationRule]
+
+
+class AuthorizationRule(NamedTuple):
+    consumer_id: int
+    provider_id: int
+    interface_id: int
+    service_definition_id: int
+
+
+class AuthorizationRequest(NamedTuple):
+    """
+    One intracloud authorization request.
+
+    The authorization system creates a rule for every combination of provider,
+    interface and service definition in the request, but rejects requests with both
+    more than one provider and more than one service definition.
+    """
+
+    consumer_id: int
+    provider_ids: List[int]
+    interface_ids: List[int]
+    service_definition_ids: List[int]
+
+    @property
+    def rule_count(self) -> int:
+        return (
+            len(self.provider_ids)
+            * len(self.interface_ids)
+            * len(self.service_definition_ids)
+        )
+
+    def to_message(self) -> Dict:
+        return {
+            "consumerId": self.consumer_id,
+            "providerIds": self.provider_ids,
+            "interfaceIds": self.interface_ids,
+            "serviceDefinitionIds": self.service_definition_ids,
+        }
+
+
+class BulkResult(NamedTuple):
+    item: Any
+    response_data: Dict
+    status: int
+
+    @property
+    def ok(self) -> bool:
+        return 0 < self.status < 400
+
+
+def load_manifest(manifest_path: Path, section: Optional[str] = None) -> List[Dict]:
+    """
+    Load the records of a YAML, CSV or NDJSON manifest file.
+
+    YAML manifests contain either a list of records or a mapping where ``section``
+    is the key of the list of records. CSV manifests have a header row with the
+    field names, and NDJSON manifests contain one json record per line.
+
+    Raises:
+        PyrrowheadError: If the file cannot be read as a manifest.
+    """
+    suffix = manifest_path.suffix.lower()
+    try:
+        with open(manifest_path, "r", newline="") as manifest_file:
+            if suffix in {".yaml", ".yml"}:
+                records = yaml.load(
+                    manifest_file, Loader=yamlloader.ordereddict.CSafeLoader
+                )
+                if isinstance(records, dict) and section is not None:
+                    records = records.get(section, [])
+            elif suffix == ".csv":
+                records = [dict(row) for row in csv.DictReader(manifest_file)]
+            elif suffix in {".ndjson", ".jsonl"}:
+                records = [json.loads(line) for line in manifest_file if line.strip()]
+            else:
+                raise PyrrowheadError(
+                    f"Unsupported manifest format '{suffix}', use .yaml, .yml, "
+                    f".csv, .ndjson or .jsonl."
+                )
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        raise PyrrowheadError(f"Could not read manifest {manifest_path}: {e}")
+
+    if not isinstance(records, list) or not all(
+        isinstance(record, dict) for record in records
+    ):
+        raise PyrrowheadError(
+            f"Malformed manifest {manifest_path}: Expected a list of records."
+        )
+
+    return records
+
+
+def get_field(record: Dict, field: str, default: Any = None) -> Any:
+    value = record.get(field)
+    if value is None or value == "":
+        if default is None:
+            raise ValueError(f"missing field '{field}'")
+        return default
+    return value
+
+
+def get_int_field(record: Dict, field: str, default: Any = None) -> int:
+    value = get_field(record, field, default)
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"field '{field}' must be an integer, got '{value}'")
+
+
+def validate_records(
+    records: List[Dict], validate: Callable[[Dict], T], record_type: str
+) -> List[T]:
+    """
+    Validate all records up front and raise one error describing every bad record.
+
+    Raises:
+        PyrrowheadError: If any of the records is invalid.
+    """
+    validated = []
+    errors = []
+    for index, record in enumerate(records):
+        try:
+            validated.append(validate(record))
+        except ValueError as e:
+            errors.append(f"{record_type} {index}: {e}")
+
+    if errors:
+        shown_errors = errors[:MAX_REPORTED_ERRORS]
+        if len(errors) > MAX_REPORTED_ERRORS:
+            shown_errors.append(f"... and {len(errors) - MAX_REPORTED_ERRORS} more")
+        raise PyrrowheadError(
+            f"Manifest contains {len(errors)} invalid {record_type}(s):\n  "
+            + "\n  ".join(shown_errors)
+        )
+
+    return validated
+
+
+def validate_service_registration(record: Dict) -> ServiceRegistration:
+    """
+    Create a service registration from a manifest record.
+
+    Records have the fields ``service_definition``, ``uri``, ``interface``,
+    ``system_name``, ``address``, ``port`` and optionally ``access_policy``, which
+    defaults to ``CERTIFICATE``.
+
+    Raises:
+        ValueError: If the record is invalid.
+    """
+    try:
+        access_policy = AccessPolicy(
+            get_field(record, "access_policy", AccessPolicy.CERTIFICATE)
+        )
+    except ValueError:
+        raise ValueError(
+            f"access_policy must be one of "
+            f'{", ".join(policy.value for policy in AccessPolicy)}'
+        )
+
+    return ServiceRegistration(
+        service_definition=get_field(record, "service_definition"),
+        uri=get_field(record, "uri"),
+        interface=get_field(record, "interface"),
+        access_policy=access_policy,
+        system=(
+            get_field(record, "system_name"),
+            get_field(record, "address"),
+            get_int_field(record, "port"),
+        ),
+    )
+
+
+def load_service_registrations(manifest_path: Path) -> List[ServiceRegistration]:
+    """
+    Load and validate the service registrations of a manifest.
+
+    Raises:
+        PyrrowheadError: If the manifest cannot be read or contains invalid records.
+    """
+    return validate_records(
+        load_manifest(manifest_path, "services"),
+        validate_service_registration,
+        "service",
+    )
+
+
+def validate_orchestration_rule(record: Dict) -> OrchestrationRule:
+    """
+    Create an orchestration store rule from a manifest record.
+
+    Records have the fields ``service_definition``, ``interface``,
+    ``provider_name``, ``provider_address``, ``provider_port``, and either
+    ``consumer_id`` or ``consumer_name``, optionally together with
+    ``consumer_address`` and ``consumer_port``. ``priority`` defaults to 1 and
+    ``attribute`` is an optional mapping of metadata.
+
+    Raises:
+        ValueError: If the record is invalid.
+    """
+    if record.get("consumer_id") not in {None, ""}:
+        consumer_id: Optional[int] = get_int_field(record, "consumer_id")
+        consumer = ("", "", -1)
+    elif record.get("consumer_name") not in {None, ""}:
+        consumer_id = None
+        consumer = (
+            get_field(record, "consumer_name"),
+            record.get("consumer_address") or "",
+            get_int_field(record, "consumer_port", -1),
+        )
+    else:
+        raise ValueError("one of the fields 'consumer_id' or 'consumer_name' is needed")
+
+    attribute = record.get("attribute") or None
+    if attribute is not None and not isinstance(attribute, dict):
+        raise ValueError("field 'attribute' must be a mapping")
+
+    return OrchestrationRule(
+        service_definition=get_field(record, "service_definition"),
+        interface=get_field(record, "interface"),
+        provider=(
+            get_field(record, "provider_name"),
+            get_field(record, "provider_address"),
+            get_int_field(record, "provider_port"),
+        ),
+        consumer_id=consumer_id,
+        consumer=consumer,
+        priority=get_int_field(record, "priority", 1),
+        attribute=attribute,
+    )
+
+
+def load_orchestration_rules(manifest_path: Path) -> List[OrchestrationRule]:
+    """
+    Load and validate the orchestration store rules of a manifest.
+
+    Raises:
+        PyrrowheadError: If the manifest cannot be read or contains invalid records.
+    """
+    return validate_records(
+        load_manifest(manifest_path, "orchestration"),
+        validate_orchestration_rule,
+        "orchestration rule",
+    )
+
+
+def chunk_rules(
+    rules: List[OrchestrationRule], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> List[StoreChunk]:
+    return [
+        StoreChunk(index, first_rule, rules[first_rule : first_rule + chunk_size])
+        for index, first_rule in enumerate(range(0, len(rules), chunk_size))
+    ]
+
+
+def validate_authorization_rule(record: Dict) -> AuthorizationRule:
+    """
+    Create an authorization rule from a manifest record.
+
+    Records have the fields ``consumer_id``, ``provider_id``, ``interface_id`` and
+    ``service_definition_id``.
+
+    Raises:
+        ValueError: If the record is invalid.
+    """
+    return AuthorizationRule(
+        *(get_int_field(record, field) for field in AuthorizationRule._fields)
+    )
+
+
+def load_authorization_rules(manifest_path: Path) -> List[AuthorizationRule]:
+    """
+    Load and validate the authorization rules of a manifest.
+
+    Raises:
+        PyrrowheadError: If the manifest cannot be read or contains invalid records.
+    """
+    return validate_records(
+        load_manifest(manifest_path, "authorization"),
+        validate_authorization_rule,
+        "authorization rule",
+    )
+
+
+def _compact_consumer_rules(
+    consumer_id: int,
+    interfaces: Dict[Tuple[int, int], Set[int]],
+    transpose: bool,
+) -> List[AuthorizationRequest]:
+    """
+    Compact the rules of one consumer, given the interface ids of every
+    (provider id, service definition id) pair.
+
+    Every provider first gets one request per distinct set of interfaces, covering
+    all service definitions with that set of interfaces. Requests left with a single
+    service definition are then merged across providers that have the same service
+    definition and interfaces. With ``transpose`` the roles of providers and service
+    definitions are swapped.
+    """
+    # (outer id, interfaces) -> inner ids, where outer is the provider by default
+    by_outer: Dict[Tuple[int, FrozenSet[int]], List[int]] = {}
+    for (provider_id, service_definition_id), pair_interfaces in interfaces.items():
+        outer, inner = (
+            (service_definition_id, provider_id)
+            if transpose
+            else (provider_id, service_definition_id)
+        )
+        by_outer.setdefault((outer, frozenset(pair_interfaces)), []).append(inner)
+
+    # (inner id, interfaces) -> outer ids, for the requests with a single inner id
+    by_inner: Dict[Tuple[int, FrozenSet[int]], List[int]] = {}
+    rectangles = []
+    for (outer, interface_set), inner_ids in by_outer.items():
+        if len(inner_ids) == 1:
+            by_inner.setdefault((inner_ids[0], interface_set), []).append(outer)
+        else:
+            rectangles.append(([outer], sorted(interface_set), sorted(inner_ids)))
+    for (inner, interface_set), outer_ids in by_inner.items():
+        rectangles.append((sorted(outer_ids), sorted(interface_set), [inner]))
+
+    return [
+        (
+            AuthorizationRequest(consumer_id, inner_ids, interface_ids, outer_ids)
+            if transpose
+            else AuthorizationRequest(consumer_id, outer_ids, interface_ids, inner_ids)
+        )
+        for outer_ids, interface_ids, inner_ids in sorted(rectangles)
+    ]
+
+
+def compact_authorization_rules(
+    rules: Iterable[AuthorizationRule],
+) -> List[AuthorizationRequest]:
+    """
+    Compact authorization rules into as few intracloud requests as possible.
+
+    The requests create exactly the given rules, duplicates removed, and never any
+    other rule. For each consumer, the rules are grouped both by provider and by
+    service definition, and the grouping needing the fewest requests is used.
+    """
+    requests_plan = []
+    unique_rules = sorted(set(rules))
+    for consumer_id, consumer_rules in groupby(
+        unique_rules, key=lambda rule: rule.consumer_id
+    ):
+        interfaces: Dict[Tuple[int, int], Set[int]] = {}
+        for rule in consumer_rules:
+            interfaces.setdefault(
+                (rule.provider_id, rule.service_definition_id), set()
+            ).add(rule.interface_id)
+
+        by_provider = _compact_consumer_rules(consumer_id, interfaces, False)
+        by_service_definition = _compact_consumer_rules(consumer_id, interfaces, True)
+        requests_plan.extend(
+            by_provider
+            if len(by_provider) <= len(by_service_definition)
+            else by_service_definition
+        )
+
+    return requests_plan
+
+
+def run_bulk_item(func: Callable[..., Tuple[Dict, int]], item: Any) -> BulkResult:
+    """Run one item of a bulk operation, turning request errors into a result."""
+    try:
+        response_data, status = func(item)
+    except (requests.RequestException, PyrrowheadError) as e:
+        return BulkResult(item, {"errorMessage": str(e)}, 0)
+
+    return BulkResult(item, response_data, status)
+
+
+def write_report(report_path: Path, results: Iterable[BulkResult]):
+    """Write the results of a bulk operation as NDJSON, one line per item."""
+    with open(report_path, "w") as report_file:
+        for index, result in enumerate(results):
+            if hasattr(result.item, "_asdict"):
+                item = result.item._asdict()
+            elif isinstance(result.item, dict):
+                item = result.item
+            else:
+                item = None
+            report_line = {
+                "index": index,
+                "ok": result.ok,
+                "status": result.status,
+                "item": item,
+                "response": result.response_data,
+            }
+            report_file.write(json.dumps(report_line) + "\n")
+
+
+def create_section_table(results: Dict[str, List[BulkResult]], title: str) -> Table:
+    """Table of the number of successful and failed requests per section."""
+    section_table = Table(
+        Column(header="Section", style="bright_white"),
+        Column(header="Requests", style="bright_white"),
+        Column(header="Succeeded", style="green"),
+        Column(header="Failed", style="red"),
+        title=title,
+        box=box.SIMPLE,
+    )
+    for section, section_results in results.items():
+        failed = sum(not result.ok for result in section_results)
+        section_table.add_row(
+            section,
+            str(len(section_results)),
+            str(len(section_results) - failed),
+            str(failed),
+        )
+
+    return section_table
+
+
+def section_errors(results: Dict[str, List[BulkResult]]) -> List[str]:
+    """Error messages of the failed results, at most ``MAX_REPORTED_ERRORS``."""
+    errors = [
+        f'{section}: {result.response_data.get("errorMessage", "")} ({result.status})'
+        for section, section_results in results.items()
+        for result in section_results
+        if not result.ok
+    ]
+    if len(errors) > MAX_REPORTED_ERRORS:
+        return errors[:MAX_REPORTED_ERRORS] + [
+            f"... and {len(errors) - MAX_REPORTED_ERRORS} more"
+        ]
+    return errors
@@ -0,0 +1,143 @@
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional, Iterator, Iterable, Any, Callable
+
+from pyrrowhead.constants import CACHE_SUBDIR
+from pyrrowhead.utils import get_pyrrowhead_path
+
+DEFAULT_CACHE_TTL = 30.0
+_INVALIDATED_MARKER = ".invalidated"
+
+
+class _CacheSettings:
+    def __init__(self):
+        self.ttl: float = DEFAULT_CACHE_TTL
+        self.fresh: bool = False
+
+
+_settings = _CacheSettings()
+
+
+def configure_cache(ttl: Optional[float] = None, fresh: Optional[bool] = None):
+    """
+    Change how the management calls use the snapshot cache.
+
+    Args:
+        ttl: Seconds a snapshot is used after it was fetched, 0 disables the cache.
+        fresh: If True, snapshots are always fetched from the core systems, the
+          fetched snapshots are still stored for later calls.
+    """
+    if ttl is not None:
+        _settings.ttl = ttl
+    if fresh is not None:
+        _settings.fresh = fresh
+
+
+class SnapshotCache:
+    """
+    On-disk cache of the list responses of one local cloud.
+
+    Every snapshot is stored in its own NDJSON file, one record per line, so that
+    cached records can be streamed like records fetched from the core systems.
+    Snapshots older than the TTL are ignored. :meth:`invalidate` discards all
+    snapshots of the cloud, and also prevents storing snapshots whose fetch started
+    before the invalidation.
+
+    Args:
+        directory: Directory of the snapshot files.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+
+    @classmethod
+    def for_cloud(cls, org_name: str, cloud_name: str) -> "SnapshotCache":
+        return cls(get_pyrrowhead_path() / CACHE_SUBDIR / org_name / cloud_name)
+
+    def _path(self, name: str) -> Path:
+        return self.directory / f"{name}.ndjson"
+
+    def _invalidated_at(self) -> float:
+        try:
+            return (self.directory / _INVALIDATED_MARKER).stat().st_mtime
+        except FileNotFoundError:
+            return 0.0
+
+    def get(self, name: str) -> Optional[Iterator[Any]]:
+        """
+        Return an iterator over the records of a snapshot, or None if the snapshot
+        is missing, expired, or the cache is disabled or bypassed.
+        """
+        if _settings.fresh or _settings.ttl <= 0:
+            return None
+        try:
+            snapshot_file = open(self._path(name), "r")
+        except FileNotFoundError:
+            return None
+        if time.time() - os.fstat(snapshot_file.fileno()).st_mtime > _settings.ttl:
+            snapshot_file.close()
+            return None
+
+        return self._read(snapshot_file)
+
+    @staticmethod
+    def _read(snapshot_file) -> Iterator[Any]:
+        with snapshot_file:
+            for line in snapshot_file:
+                yield json.loads(line)
+
+    def put(
+        self, name: str, records: Iterable[Any], fetched_at: float
+    ) -> Iterator[Any]:
+        """
+        Yield ``records`` while storing them as a snapshot.
+
+        The snapshot is only stored once all records have been consumed, and only if
+        the cache was not invalidated after ``fetched_at``.
+        """
+        if _settings.ttl <= 0:
+            yield from records
+            return
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        file_descriptor, temp_name = tempfile.mkstemp(
+            dir=self.directory, prefix=f".{name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(file_descriptor, "w") as temp_file:
+                for record in records:
+                    temp_file.write(json.dumps(record) + "\n")
+                    yield record
+            if fetched_at > self._invalidated_at():
+                # The age of a snapshot is counted from when its fetch started
+                os.utime(temp_name, (fetched_at, fetched_at))
+                os.replace(temp_name, self._path(name))
+        finally:
+            if os.path.exists(temp_name):
+                os.remove(temp_name)
+
+    def store(self, name: str, records: Iterable[Any], fetched_at: float):
+        """Store ``records`` as a snapshot, see :meth:`put`."""
+        for _ in self.put(name, records, fetched_at):
+            pass
+
+    def cached(self, name: str, fetch: Callable[[], Iterable[Any]]) -> Iterator[Any]:
+        """Yield the records of a snapshot, fetching and storing it when needed."""
+        snapshot = self.get(name)
+        if snapshot is not None:
+            return snapshot
+        fetched_at = time.time()
+        return self.put(name, fetch(), fetched_at)
+
+    def invalidate(self):
+        """Discard all snapshots."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        (self.directory / _INVALIDATED_MARKER).touch()
+        for snapshot_path in self.directory.glob("*.ndjson"):
+            try:
+                snapshot_path.unlink()
+            except FileNotFoundError:
+                pass
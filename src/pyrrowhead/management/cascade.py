@@ -0,0 +1,144 @@
+from functools import partial
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+from rich import box
+from rich.table import Table, Column
+
+from pyrrowhead.management.bulk import BulkResult, run_bulk_item
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead.management.utils import DEFAULT_CONCURRENCY, map_concurrently
+from pyrrowhead.utils import PyrrowheadError
+
+# Removal order, rules before the services and systems they refer to
+CASCADE_STEPS = ("authorization", "orchestration", "service", "system")
+
+
+class CascadePlan(NamedTuple):
+    authorization: List[Dict]
+    orchestration: List[Dict]
+    service: List[Dict]
+    system: List[Dict]
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self._asdict().values())
+
+
+def plan_cascade(client: ArrowheadClient, system_ids: Iterable[int]) -> CascadePlan:
+    """
+    Find the records that must be removed together with a set of systems.
+
+    Every dataset is listed once and each record is checked against the set of
+    system ids: services provided by the systems, orchestration store rules where
+    they are the consumer or local provider, and authorization rules where they are
+    the consumer or provider.
+
+    Raises:
+        PyrrowheadError: If a system is not registered, or a core system responds
+          with an error.
+    """
+    removed_ids = set(system_ids)
+    systems = [
+        system for system in client.list_systems() if system["id"] in removed_ids
+    ]
+    unknown_ids = removed_ids - {system["id"] for system in systems}
+    if unknown_ids:
+        raise PyrrowheadError(
+            f'No systems with id {", ".join(map(str, sorted(unknown_ids)))}'
+        )
+
+    return CascadePlan(
+        authorization=[
+            rule
+            for rule in client.list_authorization_rules()
+            if rule["consumerSystem"]["id"] in removed_ids
+            or rule["providerSystem"]["id"] in removed_ids
+        ],
+        orchestration=[
+            rule
+            for rule in client.list_orchestration_rules()
+            if rule["consumerSystem"]["id"] in removed_ids
+            # Foreign providers are systems of other clouds with their own ids
+            or (not rule.get("foreign") and rule["providerSystem"]["id"] in removed_ids)
+        ],
+        service=[
+            service
+            for service in client.list_services()
+            if service["provider"]["id"] in removed_ids
+        ],
+        system=systems,
+    )
+
+
+def _remove_record(remove: Callable[[int], Tuple[Dict, int]], record: Dict):
+    return remove(record["id"])
+
+
+def execute_cascade(
+    client: ArrowheadClient,
+    plan: CascadePlan,
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Dict[str, List[BulkResult]]:
+    """
+    Remove the records of a cascade plan.
+
+    The records of each step are removed concurrently, and the steps are run in the
+    order of :data:`CASCADE_STEPS`. If any removal of a step fails, the later steps
+    are not run, so that no system is removed while something still refers to it.
+
+    Returns:
+        The results of each step that was run.
+    """
+    removers = {
+        "authorization": client.remove_authorization_rule,
+        "orchestration": client.remove_orchestration_rule,
+        "service": client.delete_service,
+        "system": client.remove_system,
+    }
+    results: Dict[str, List[BulkResult]] = {}
+    for step in CASCADE_STEPS:
+        records = getattr(plan, step)
+        if not records:
+            continue
+        results[step] = list(
+            map_concurrently(
+                partial(run_bulk_item, partial(_remove_record, removers[step])),
+                records,
+                concurrency,
+            )
+        )
+        if not all(result.ok for result in results[step]):
+            break
+
+    return results
+
+
+def format_id_ranges(ids: Iterable[int]) -> str:
+    """Format ids as sorted, comma separated ids and id ranges, such as 4,10-20."""
+    ranges: List[List[int]] = []
+    for record_id in sorted(set(ids)):
+        if ranges and record_id == ranges[-1][1] + 1:
+            ranges[-1][1] = record_id
+        else:
+            ranges.append([record_id, record_id])
+    return ",".join(
+        str(start) if start == stop else f"{start}-{stop}" for start, stop in ranges
+    )
+
+
+def create_plan_table(plan: CascadePlan) -> Table:
+    plan_table = Table(
+        Column(header="Step", style="bright_white"),
+        Column(header="Remove", style="red"),
+        Column(header="Ids", style="bright_white"),
+        title="Cascade removal",
+        box=box.SIMPLE,
+    )
+    for step in CASCADE_STEPS:
+        records = getattr(plan, step)
+        plan_table.add_row(
+            step,
+            str(len(records)),
+            format_id_ranges(record["id"] for record in records),
+        )
+
+    return plan_table
@@ -2,3 +2,6 @@ from pyrrowhead.management.cli.service import sr_app  # noqa
 from pyrrowhead.management.cli.orchestration import orch_app  # noqa
 from pyrrowhead.management.cli.authorization import auth_app  # noqa
 from pyrrowhead.management.cli.system import sys_app  # noqa
+from pyrrowhead.management.cli.search import search_cli  # noqa
+from pyrrowhead.management.cli.apply import apply_cli  # noqa
+from pyrrowhead.management.cli.audit import audit_cli  # noqa
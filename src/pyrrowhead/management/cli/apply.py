@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import typer
+
+from pyrrowhead.management import bulk, common, reconcile
+from pyrrowhead.management.cache import configure_cache
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead import rich_console
+from pyrrowhead.utils import PyrrowheadError
+
+
+def apply_cli(
+    state_file: Path = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        metavar="STATE_FILE",
+        help="YAML or JSON file with the desired systems, services, orchestration "
+        "rules and authorization rules.",
+    ),
+    prune: bool = typer.Option(
+        False,
+        "--prune",
+        help="Also remove entries not in STATE_FILE, for the sections in STATE_FILE. "
+        "Core systems and their services are never removed.",
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Show the plan without applying it."
+    ),
+    yes: bool = typer.Option(
+        False, "--yes", "-y", help="Apply the plan without asking for confirmation."
+    ),
+    concurrency: int = common.OPT_CONCURRENCY,
+    chunk_size: int = typer.Option(
+        bulk.DEFAULT_CHUNK_SIZE,
+        "--chunk-size",
+        min=1,
+        help="Number of orchestration rules added per request.",
+    ),
+):
+    """
+    Make the active local cloud match a desired state file.
+
+    The current state is fetched once and compared to STATE_FILE, and only the
+    differences are applied. STATE_FILE has the sections systems, services,
+    orchestration and authorization. Systems have the fields system_name, address
+    and port, services and orchestration rules have the same fields as in the
+    import manifests, and authorization rules have the fields consumer_name,
+    provider_name, provider_address, provider_port, service_definition and
+    interface.
+    """
+    # The plan must be based on the actual state, never on cached responses
+    configure_cache(fresh=True)
+    client = ArrowheadClient()
+    try:
+        changes = reconcile.plan(client, state_file, prune)
+    except PyrrowheadError as e:
+        rich_console.print(e)
+        raise typer.Exit(-1)
+
+    if not changes:
+        rich_console.print("No changes, the local cloud matches the desired state.")
+        raise typer.Exit()
+
+    rich_console.print(reconcile.create_plan_table(changes))
+    if dry_run or not (yes or typer.confirm("Apply the plan?")):
+        raise typer.Exit()
+
+    results = reconcile.apply_changes(client, changes, concurrency, chunk_size)
+
+    rich_console.print(bulk.create_section_table(results, "Apply"))
+    for error in bulk.section_errors(results):
+        rich_console.print(error, style="red", highlight=False)
+    if not all(result.ok for section in results.values() for result in section):
+        raise typer.Exit(-1)
@@ -0,0 +1,70 @@
+from collections import Counter
+from contextlib import ExitStack
+from pathlib import Path
+from typing import List, Optional, TextIO
+
+import typer
+
+from pyrrowhead.management import audit, common
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead import rich_console
+from pyrrowhead.utils import PyrrowheadError
+
+
+def audit_cli(
+    limit: int = typer.Option(
+        100,
+        "--limit",
+        "-n",
+        min=0,
+        help="Maximum number of issues to show, all issues are counted.",
+    ),
+    report: Optional[Path] = typer.Option(
+        None,
+        "--report",
+        dir_okay=False,
+        metavar="REPORT_FILE",
+        help="Write every issue to REPORT_FILE as NDJSON.",
+    ),
+):
+    """
+    Check the active local cloud for inconsistent records.
+
+    Systems, services, orchestration store rules and authorization rules are
+    fetched once and joined to find references to unregistered systems, store rules
+    for services that are not registered or not authorized, and duplicate
+    registrations. Exits with an error if any issue is found.
+    """
+    # The audit must be based on the actual state, never on cached responses
+    common.use_fresh_data(True)
+    issues: List[audit.Issue] = []
+    issue_counts: Counter = Counter()
+    with ExitStack() as stack:
+        report_file: Optional[TextIO] = None
+        if report is not None:
+            try:
+                report_file = stack.enter_context(open(report, "w"))
+            except OSError as e:
+                rich_console.print(f"Could not write report {report}: {e}")
+                raise typer.Exit(-1)
+        try:
+            found_issues = audit.audit_cloud(ArrowheadClient())
+            if report_file is not None:
+                # Issues are written as they are found, only the shown ones are kept
+                found_issues = audit.report_issues(found_issues, report_file)
+            for issue in found_issues:
+                issue_counts[issue.check, issue.kind] += 1
+                if len(issues) < limit:
+                    issues.append(issue)
+        except PyrrowheadError as e:
+            rich_console.print(e)
+            raise typer.Exit(-1)
+
+    if not issue_counts:
+        rich_console.print("No issues found.")
+        raise typer.Exit()
+
+    if limit > 0:
+        rich_console.print(audit.create_issue_table(issues))
+    rich_console.print(audit.create_summary_table(issue_counts))
+    raise typer.Exit(-1)
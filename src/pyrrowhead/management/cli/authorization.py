@@ -1,9 +1,13 @@
-from typing import Optional
+from pathlib import Path
+from typing import Optional, List
 
 import typer
+from rich.text import Text
 
-from pyrrowhead.management import authorization
+from pyrrowhead.management import authorization, bulk, common, multicloud
+from pyrrowhead.management.client import ArrowheadClient
 from pyrrowhead import rich_console
+from pyrrowhead.utils import PyrrowheadError
 
 auth_app = typer.Typer(name="authorization")
 
@@ -17,13 +21,45 @@ def list_authorization_cli(
     provider_name: Optional[str] = typer.Option(None),
     consumer_id: Optional[int] = typer.Option(None),
     consumer_name: Optional[str] = typer.Option(None),
+    filter_expression: Optional[str] = common.OPT_FILTER,
+    fresh: bool = common.OPT_FRESH,
+    cloud_identifiers: Optional[List[str]] = common.OPT_CLOUDS,
+    all_clouds: bool = common.OPT_ALL_CLOUDS,
 ):
     """
-    Prints all orchestration rules, no filters or sorting options are implemented yet.
+    Prints intracloud authorization rules.
+
+    All given filters must match. Filter fields are id, definition, consumer,
+    consumer_id, provider, provider_id and interface.
+    With --cloud or --all-clouds, several local clouds are listed concurrently.
     """
-    response_data, status = authorization.list_authorization_rules()
+    common.use_fresh_data(fresh)
+    try:
+        record_filter = authorization.authorization_filter(
+            service_definition, consumer_id, consumer_name, provider_id, provider_name
+        )
+        if cloud_identifiers or all_clouds:
+            results = multicloud.fan_out(
+                lambda client: record_filter.apply(
+                    client.list_authorization_rules(filter_expression)
+                ),
+                multicloud.select_clouds(cloud_identifiers or [], all_clouds),
+            )
+            if not multicloud.print_cloud_results(
+                results, authorization.create_authorization_table
+            ):
+                raise typer.Exit(-1)
+            raise typer.Exit()
+        auth_table = authorization.create_authorization_table(
+            record_filter.apply(
+                authorization.list_authorization_rules(filter_expression)
+            )
+        )
+    except (ValueError, PyrrowheadError) as e:
+        rich_console.print(e)
+        raise typer.Exit(-1)
 
-    rich_console.print(authorization.create_authorization_table(response_data))
+    rich_console.print(auth_table)
 
 
 @auth_app.command(name="add")
@@ -41,9 +77,151 @@ def add_authorization_cli(
     )
 
 
-@auth_app.command(name="remove", hidden=True)
-def remove_authorization_cli():
-    """Not implemented."""
-    rich_console.print("Not implemented.")
-    raise typer.Exit(-1)
-    authorization.remove_authorization_rule()
+@auth_app.command(name="import")
+def import_authorization_rules_cli(
+    manifest: Path = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        metavar="MANIFEST",
+        help="YAML, CSV or NDJSON file with one record per authorization rule.",
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Show the requests without sending them."
+    ),
+    concurrency: int = common.OPT_CONCURRENCY,
+    report: Optional[Path] = typer.Option(
+        None,
+        dir_okay=False,
+        metavar="REPORT_FILE",
+        help="Write the result of every request to REPORT_FILE as NDJSON.",
+    ),
+):
+    """
+    Add all authorization rules in a manifest file.
+
+    Each record has the fields consumer_id, provider_id, interface_id and
+    service_definition_id. YAML manifests can also put the records under an
+    "authorization" key. The rules are grouped by consumer and compacted into as few
+    requests as possible, which are sent concurrently.
+    """
+    try:
+        rules = bulk.load_authorization_rules(manifest)
+    except PyrrowheadError as e:
+        rich_console.print(e)
+        raise typer.Exit(-1)
+
+    auth_requests = bulk.compact_authorization_rules(rules)
+    if dry_run:
+        rich_console.print(authorization.create_request_table(auth_requests))
+        raise typer.Exit()
+
+    results = list(ArrowheadClient().add_authorization_rules(rules, concurrency))
+    if report is not None:
+        bulk.write_report(report, results)
+
+    rich_console.print(authorization.create_request_table(auth_requests, results))
+    if not all(result.ok for result in results):
+        raise typer.Exit(-1)
+
+
+@auth_app.command(name="matrix")
+def authorization_matrix_cli(
+    consumer_id: Optional[int] = typer.Option(
+        None, help="Show the providers the consumer can reach."
+    ),
+    provider_id: Optional[int] = typer.Option(
+        None, help="Show the consumers that can reach the provider."
+    ),
+    service_definition: Optional[str] = typer.Option(
+        None, help="Only consider this service definition."
+    ),
+    missing: bool = typer.Option(
+        False,
+        "--missing",
+        show_default=False,
+        help="Show the service definitions the consumer can not reach instead.",
+    ),
+    export: Optional[Path] = typer.Option(
+        None,
+        dir_okay=False,
+        help="Write the matrix to a file, as numpy arrays if the file name ends "
+        "with .npz, otherwise as a CSV of consumer × provider counts for heat maps.",
+    ),
+    fresh: bool = common.OPT_FRESH,
+):
+    """
+    Consumer × provider × service definition reachability of the authorization rules.
+
+    Without options, the size and density of the matrix are shown. Requires numpy,
+    install it with pip install pyrrowhead[matrix].
+    """
+    try:
+        from pyrrowhead.management import reachability
+    except ImportError:
+        rich_console.print(
+            "The reachability matrix requires numpy, install it with "
+            "pip install pyrrowhead[matrix]"
+        )
+        raise typer.Exit(-1)
+
+    common.use_fresh_data(fresh)
+    try:
+        matrix = reachability.ReachabilityMatrix.from_rules(
+            authorization.list_authorization_rules()
+        )
+        if export is not None:
+            matrix.export(export)
+        if consumer_id is not None and missing:
+            rich_console.print(
+                f"Service definitions consumer {consumer_id} can not reach: "
+                f'{", ".join(matrix.missing_definitions(consumer_id)) or "none"}'
+            )
+        elif consumer_id is not None:
+            rich_console.print(
+                reachability.create_systems_table(
+                    f"Providers consumer {consumer_id} can reach",
+                    matrix.providers_for(consumer_id, service_definition),
+                    matrix.system_names,
+                )
+            )
+        if provider_id is not None:
+            rich_console.print(
+                reachability.create_systems_table(
+                    f"Consumers that can reach provider {provider_id}",
+                    matrix.consumers_of(provider_id, service_definition),
+                    matrix.system_names,
+                )
+            )
+        if consumer_id is None and provider_id is None:
+            rich_console.print(reachability.create_summary_table(matrix))
+    except (OSError, PyrrowheadError) as e:
+        rich_console.print(e)
+        raise typer.Exit(-1)
+
+
+@auth_app.command(name="remove")
+def remove_authorization_cli(
+    authorization_id: int = typer.Argument(
+        ..., metavar="AUTHORIZATION_ID", help="Id of authorization rule to remove"
+    ),
+):
+    """
+    Remove intracloud authorization rule by ID.
+    """
+    try:
+        response_data, status = authorization.remove_authorization_rule(
+            authorization_id
+        )
+    except (IOError, PyrrowheadError) as e:
+        rich_console.print(e)
+        raise typer.Exit(-1)
+
+    if status >= 400:
+        rich_console.print(
+            Text(
+                f"Authorization rule removal failed: "
+                f'{response_data.get("errorMessage", "")}'
+            )
+        )
+        raise typer.Exit(-1)
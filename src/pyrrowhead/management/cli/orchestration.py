@@ -1,11 +1,21 @@
-import json
-from typing import Tuple, Optional
+from pathlib import Path
+from typing import Tuple, Optional, List
 
 import typer
-from rich.syntax import Syntax
 
-from pyrrowhead.management import common, serviceregistry, orchestrator
+from pyrrowhead.management import (
+    common,
+    orchestrator,
+    authorization,
+    bulk,
+    multicloud,
+    simulator,
+    watch,
+)
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead.management.index import SYSTEM_AMBIGUOUS, SYSTEM_NOT_FOUND
 from pyrrowhead import rich_console
+from pyrrowhead.utils import PyrrowheadError
 
 orch_app = typer.Typer(name="orchestration")
 
@@ -37,12 +47,14 @@ def add_orchestration_rule_cli(
         help="Add authentication rule in together " "with the authentication rule",
     ),
 ):
+    client = ArrowheadClient()
+
     if consumer_id is not None:
         pass
     elif not all(consumer):
-        consumer_id = serviceregistry.get_system_id_from_name(*consumer)
+        consumer_id = client.get_system_id_from_name(*consumer)
     elif all(consumer):
-        consumer_id = serviceregistry.get_system_id_from_name(*consumer)
+        consumer_id = client.get_system_id_from_name(*consumer)
     else:
         rich_console.print(
             "No consumer information given, you must provide "
@@ -61,19 +73,107 @@ def add_orchestration_rule_cli(
         )
         raise typer.Exit()
 
-    response_data, status = orchestrator.add_orchestration_rule(
-        service_definition=service_definition,
-        service_interface=service_interface,
-        provider_system=provider,
-        consumer_id=consumer_id,
-        priority=priority,
-        add_auth_rule=add_auth_rule,
-    )
+    try:
+        response_data, status = client.add_orchestration_rule(
+            service_definition=service_definition,
+            service_interface=service_interface,
+            provider_system=provider,
+            consumer_id=consumer_id,
+            priority=priority,
+            add_auth_rule=add_auth_rule,
+        )
+    except PyrrowheadError as e:
+        rich_console.print(e)
+        raise typer.Exit()
 
     if status >= 400:
         print(response_data["errorMessage"], status)
 
 
+@orch_app.command(name="import")
+def import_orchestration_rules_cli(
+    manifest: Path = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        metavar="MANIFEST",
+        help="YAML, CSV or NDJSON file with one record per orchestration rule.",
+    ),
+    chunk_size: int = typer.Option(
+        bulk.DEFAULT_CHUNK_SIZE,
+        "--chunk-size",
+        min=1,
+        help="Number of rules added per request.",
+    ),
+    isolate_failures: bool = typer.Option(
+        True,
+        help="Retry the rules of a rejected chunk one by one to find the failing "
+        "rules and add the others.",
+    ),
+    add_auth_rules: bool = typer.Option(
+        False,
+        "--add-authorization",
+        "-A",
+        help="Also add the authorization rules of the added orchestration rules.",
+    ),
+    concurrency: int = common.OPT_CONCURRENCY,
+    report: Optional[Path] = typer.Option(
+        None,
+        dir_okay=False,
+        metavar="REPORT_FILE",
+        help="Write the result of every chunk to REPORT_FILE as NDJSON.",
+    ),
+):
+    """
+    Add all orchestration store rules in a manifest file.
+
+    Each record has the fields service_definition, interface, provider_name,
+    provider_address, provider_port, either consumer_id or consumer_name (optionally
+    with consumer_address and consumer_port), and optionally priority and attribute.
+    YAML manifests can also put the records under an "orchestration" key. All
+    records are validated and all consumers resolved before any rule is added.
+
+    With --add-authorization, the authorization rules are compacted and added after
+    the orchestration rules, for the orchestration rules that were added.
+    """
+    client = ArrowheadClient()
+    try:
+        rules = client.resolve_consumer_ids(bulk.load_orchestration_rules(manifest))
+        if add_auth_rules:
+            auth_rules = client.get_authorization_rules(rules)
+        results = list(
+            client.add_orchestration_rules(
+                rules, chunk_size, isolate_failures, concurrency=concurrency
+            )
+        )
+    except PyrrowheadError as e:
+        rich_console.print(e)
+        raise typer.Exit(-1)
+
+    if report is not None:
+        bulk.write_report(report, results)
+
+    rich_console.print(orchestrator.create_import_table(results))
+    if add_auth_rules:
+        added_auth_rules = [
+            auth_rules[result.item.first_rule + offset]
+            for result in results
+            if result.ok
+            for offset in range(len(result.item.rules))
+        ]
+        auth_results = list(
+            client.add_authorization_rules(added_auth_rules, concurrency)
+        )
+        rich_console.print(
+            authorization.create_request_table(
+                [result.item for result in auth_results], auth_results
+            )
+        )
+        results += auth_results
+    if not all(result.ok for result in results):
+        raise typer.Exit(-1)
+
+
 @orch_app.command(name="list")
 def list_orchestration_cli(
     service_definition: Optional[str] = typer.Option(
@@ -86,26 +186,165 @@ def list_orchestration_cli(
     sort_by: orchestrator.SortbyChoices = typer.Option("id"),
     raw_output: bool = common.OPT_RAW_OUTPUT,
     raw_indent: Optional[int] = common.OPT_RAW_INDENT,
+    filter_expression: Optional[str] = common.OPT_FILTER,
+    fresh: bool = common.OPT_FRESH,
+    watch_mode: bool = common.OPT_WATCH,
+    interval: float = common.OPT_WATCH_INTERVAL,
+    cloud_identifiers: Optional[List[str]] = common.OPT_CLOUDS,
+    all_clouds: bool = common.OPT_ALL_CLOUDS,
 ):
-    response_data, status = orchestrator.list_orchestration_rules()
+    """
+    List orchestration store rules.
 
-    if raw_output:
-        rich_console.print(Syntax(json.dumps(response_data, indent=raw_indent), "json"))
-        raise typer.Exit()
+    All given filters must match. Filter fields are id, definition, consumer,
+    consumer_id, provider, provider_id, interface and priority.
+    With --watch, the rules are polled and only the changes are shown.
+    With --cloud or --all-clouds, several local clouds are listed concurrently.
+    """
+    common.use_fresh_data(fresh or watch_mode)
+    try:
+        if cloud_identifiers or all_clouds:
+            if watch_mode:
+                raise PyrrowheadError(
+                    "--watch can not be combined with --cloud or --all-clouds."
+                )
+            results = multicloud.fan_out(
+                lambda client: client.list_orchestration_rules(filter_expression),
+                multicloud.select_clouds(cloud_identifiers or [], all_clouds),
+            )
+            if not multicloud.print_cloud_results(
+                results,
+                lambda rules: orchestrator.create_orchestration_table(
+                    rules,
+                    service_definition,
+                    consumer_id,
+                    consumer_name,
+                    provider_id,
+                    provider_name,
+                    sort_by,
+                ),
+                raw_output,
+                raw_indent,
+            ):
+                raise typer.Exit(-1)
+            raise typer.Exit()
+        if watch_mode:
+            record_filter = orchestrator.orchestration_filter(
+                service_definition,
+                consumer_id,
+                consumer_name,
+                provider_id,
+                provider_name,
+            )
+            watch.watch_records(
+                lambda: record_filter.apply(
+                    orchestrator.list_orchestration_rules(filter_expression)
+                ),
+                lambda rules: orchestrator.create_orchestration_table(
+                    rules, None, None, None, None, None, sort_by
+                ),
+                interval,
+            )
+            raise typer.Exit()
+        orchestration_rules = orchestrator.list_orchestration_rules(filter_expression)
+        if raw_output:
+            common.print_raw_records(orchestration_rules, raw_indent)
+            raise typer.Exit()
 
-    table = orchestrator.create_orchestration_table(
-        response_data,
-        service_definition,
-        consumer_id,
-        consumer_name,
-        provider_id,
-        provider_name,
-        sort_by,
-    )
+        table = orchestrator.create_orchestration_table(
+            orchestration_rules,
+            service_definition,
+            consumer_id,
+            consumer_name,
+            provider_id,
+            provider_name,
+            sort_by,
+        )
+    except (ValueError, PyrrowheadError) as e:
+        rich_console.print(e)
+        raise typer.Exit(-1)
 
     rich_console.print(table)
 
 
+@orch_app.command(name="simulate")
+def simulate_orchestration_cli(
+    service_definition: Optional[str] = typer.Argument(
+        None,
+        metavar="SERVICE_DEFINITION",
+        show_default=False,
+        help="Requested service definition, optional with --all.",
+    ),
+    consumer_id: Optional[int] = typer.Option(None),
+    consumer_name: Optional[str] = typer.Option(None),
+    interface: Optional[str] = typer.Option(
+        None, metavar="SERVICE_INTERFACE", help="Requested interface."
+    ),
+    batch: bool = typer.Option(
+        False,
+        "--all",
+        show_default=False,
+        help="Simulate the orchestration of every consumer and service definition "
+        "in the orchestration store.",
+    ),
+    fresh: bool = common.OPT_FRESH,
+):
+    """
+    Simulate store based orchestration without sending orchestration requests.
+
+    Shows every orchestration store rule of the consumer and SERVICE_DEFINITION in
+    priority order, and which providers the orchestrator would return or exclude
+    because the service is not registered or the consumer is not authorized.
+    With --all, every consumer in the orchestration store is simulated in one pass,
+    together with how many orchestrations each provider is the first choice of.
+    """
+    common.use_fresh_data(fresh)
+    try:
+        client = ArrowheadClient()
+        if batch:
+            orchestrations = list(
+                simulator.OrchestrationSimulator.from_client(client).orchestrate_all(
+                    service_definition, interface
+                )
+            )
+            rich_console.print(simulator.create_batch_table(orchestrations))
+            rich_console.print(
+                simulator.create_load_table(simulator.provider_load(orchestrations))
+            )
+            raise typer.Exit()
+
+        if service_definition is None:
+            raise PyrrowheadError(
+                "SERVICE_DEFINITION must be given, or --all to simulate every consumer."
+            )
+        if consumer_id is None:
+            if consumer_name is None:
+                raise PyrrowheadError(
+                    "One of --consumer-id or --consumer-name must be given."
+                )
+            consumer_id = client.system_index.lookup(consumer_name)
+            if consumer_id == SYSTEM_NOT_FOUND:
+                raise PyrrowheadError(f"No system named {consumer_name}.")
+            elif consumer_id == SYSTEM_AMBIGUOUS:
+                raise PyrrowheadError(
+                    f"Several systems are named {consumer_name}, use --consumer-id."
+                )
+        orchestration = simulator.OrchestrationSimulator.from_client(
+            client
+        ).orchestrate(consumer_id, service_definition, interface)
+    except PyrrowheadError as e:
+        rich_console.print(e)
+        raise typer.Exit(-1)
+
+    if not orchestration.candidates:
+        rich_console.print(
+            f"No orchestration store rules for consumer {consumer_id} and service "
+            f"definition {service_definition}."
+        )
+        raise typer.Exit(-1)
+    rich_console.print(simulator.create_candidate_table(orchestration))
+
+
 @orch_app.command(name="remove")
 def remove_orchestration_cli(orchestration_id: int):
     response_data, status = orchestrator.remove_orchestration_rule(orchestration_id)
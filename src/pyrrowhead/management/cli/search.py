@@ -0,0 +1,79 @@
+import heapq
+from typing import List, Optional, Tuple
+
+import typer
+from rich import box
+from rich.table import Table, Column
+
+from pyrrowhead.management import common, multicloud
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead.management.search import DEFAULT_SEARCH_LIMIT, SearchHit
+from pyrrowhead import rich_console
+from pyrrowhead.utils import PyrrowheadError
+
+
+def search_cli(
+    query: str = typer.Argument(..., metavar="QUERY", help="Text to search for."),
+    limit: int = typer.Option(
+        DEFAULT_SEARCH_LIMIT,
+        "--limit",
+        "-n",
+        min=1,
+        help="Maximum number of hits to show.",
+    ),
+    fresh: bool = common.OPT_FRESH,
+    cloud_identifiers: Optional[List[str]] = common.OPT_CLOUDS,
+    all_clouds: bool = common.OPT_ALL_CLOUDS,
+):
+    """
+    Fuzzy search service definitions, systems, addresses and rules of the active
+    local cloud.
+
+    Hits are ranked by similarity to QUERY, so misspelled or partial names still
+    match. With --cloud or --all-clouds, several local clouds are searched
+    concurrently and their hits ranked together.
+    """
+    common.use_fresh_data(fresh)
+    results: List[multicloud.CloudResult] = []
+    hits: List[Tuple[Optional[str], SearchHit]]
+    try:
+        if cloud_identifiers or all_clouds:
+            results = multicloud.fan_out(
+                lambda client: client.fuzzy_search(query, limit),
+                multicloud.select_clouds(cloud_identifiers or [], all_clouds),
+            )
+            hits = heapq.nlargest(
+                limit,
+                ((result.cloud, hit) for result in results for hit in result.records),
+                key=lambda cloud_hit: cloud_hit[1].score,
+            )
+        else:
+            hits = [(None, hit) for hit in ArrowheadClient().fuzzy_search(query, limit)]
+    except PyrrowheadError as e:
+        rich_console.print(e)
+        raise typer.Exit(-1)
+
+    columns = [
+        Column(header="Kind", style="bright_white"),
+        Column(header="Match", style="bright_blue"),
+        Column(header="Details", style="blue"),
+        Column(header="Score", style="green"),
+    ]
+    if results:
+        columns.insert(0, Column(header="Cloud", style="magenta"))
+    table = Table(*columns, title=f"Search results for '{query}'", box=box.SIMPLE)
+    for cloud, hit in hits:
+        table.add_row(
+            *([cloud] if results else []),
+            hit.document.kind,
+            hit.document.text,
+            hit.document.detail,
+            f"{hit.score:.2f}",
+        )
+
+    rich_console.print(table)
+    for result in results:
+        if result.error is not None:
+            rich_console.print(f"[red]{result.cloud}[/red]: {result.error}")
+    if not all(result.error is None for result in results):
+        raise typer.Exit(-1)
@@ -1,13 +1,17 @@
 import json
-from typing import Optional, Tuple
+import sys
+from pathlib import Path
+from typing import Optional, Tuple, List
 
 import typer
 from rich.syntax import Syntax
 from rich.text import Text
 
-from pyrrowhead.management import common, serviceregistry
+from pyrrowhead.management import common, serviceregistry, bulk, multicloud, watch
 from pyrrowhead.management.common import AccessPolicy
+from pyrrowhead.management.client import ArrowheadClient
 from pyrrowhead import rich_console
+from pyrrowhead.utils import PyrrowheadError
 
 sr_app = typer.Typer(
     name="services", help="Service related commands. See list for further information."
@@ -49,66 +53,176 @@ def services_list_cli(
     ),
     raw_output: bool = common.OPT_RAW_OUTPUT,
     indent: Optional[int] = common.OPT_RAW_INDENT,
+    filter_expression: Optional[str] = common.OPT_FILTER,
+    fresh: bool = common.OPT_FRESH,
+    watch_mode: bool = common.OPT_WATCH,
+    interval: float = common.OPT_WATCH_INTERVAL,
+    cloud_identifiers: Optional[List[str]] = common.OPT_CLOUDS,
+    all_clouds: bool = common.OPT_ALL_CLOUDS,
 ):
     """
     List services registered in the active local cloud, sorted by ID.
 
-    Services shown can be filtered by service definition or system. More information about the
-    services can be seen with the -usc flags. The raw json data is accessed by the -r flag.
+    Services shown can be filtered by service definition, system and filter expression, all given filters must match.
+    Filter fields are id, definition, provider, provider_id, interface, uri, access_policy and meta.KEY for metadata.
+    More information about the services can be seen with the -usc flags. The raw json data is accessed by the -r flag.
+    With --watch, the services are polled and only the changes are shown.
+    With --cloud or --all-clouds, several local clouds are listed concurrently.
     """  # noqa
-    exclusive_options = (service_definition, system_name, system_id)
-    if len(list(option for option in exclusive_options if option is not None)) > 1:
-        raise RuntimeError(
-            "Only one of the options <--service-definition, --system-name, --system-id>"
-            " may be used."
-        )
-
+    common.use_fresh_data(fresh or watch_mode)
     try:
-        list_data = serviceregistry.list_services(
+        if cloud_identifiers or all_clouds:
+            if watch_mode:
+                raise PyrrowheadError(
+                    "--watch can not be combined with --cloud or --all-clouds."
+                )
+            results = multicloud.fan_out(
+                lambda client: client.list_services(
+                    service_definition, system_name, system_id, filter_expression
+                ),
+                multicloud.select_clouds(cloud_identifiers or [], all_clouds),
+            )
+            if not multicloud.print_cloud_results(
+                results,
+                lambda services: serviceregistry.create_service_table(
+                    services, show_provider, show_access_policy, show_service_uri
+                ),
+                raw_output,
+                indent,
+            ):
+                raise typer.Exit(-1)
+            raise typer.Exit()
+        if watch_mode:
+            watch.watch_records(
+                lambda: serviceregistry.list_services(
+                    service_definition, system_name, system_id, filter_expression
+                ),
+                lambda services: serviceregistry.create_service_table(
+                    services, show_provider, show_access_policy, show_service_uri
+                ),
+                interval,
+            )
+            raise typer.Exit()
+        services = serviceregistry.list_services(
             service_definition,
             system_name,
             system_id,
+            filter_expression,
+        )
+        if raw_output:
+            common.print_raw_records(services, indent)
+            raise typer.Exit()
+
+        service_table = serviceregistry.create_service_table(
+            services, show_provider, show_access_policy, show_service_uri
         )
-    except RuntimeError as e:
+    except (ValueError, PyrrowheadError) as e:
         rich_console.print(e)
         raise typer.Exit(code=-1)
 
+    rich_console.print(service_table)
+
+
+@sr_app.command(name="search")
+def services_search_cli(
+    terms: List[str] = typer.Argument(
+        ...,
+        metavar="TERM...",
+        help="Search terms, all of which must match.",
+    ),
+    show_service_uri: bool = typer.Option(
+        False, "--show-service-uri", "-u", show_default=False, help="Show service uri"
+    ),
+    show_access_policy: bool = typer.Option(
+        False,
+        "--show-access-policy",
+        "-c",
+        show_default=False,
+        help="Show access policy",
+    ),
+    show_provider: bool = typer.Option(
+        None, "--show-provider", "-s", help="Show provider system"
+    ),
+    raw_output: bool = common.OPT_RAW_OUTPUT,
+    indent: Optional[int] = common.OPT_RAW_INDENT,
+    fresh: bool = common.OPT_FRESH,
+):
+    """
+    Search services by metadata, service definition, interface and provider.
+
+    Terms are definition=NAME, interface=NAME, provider=SYSTEM_NAME, KEY=VALUE to
+    match metadata, or KEY to match services with the metadata key. Use
+    meta.KEY=VALUE for metadata keys named definition, interface or provider.
+    """
+    common.use_fresh_data(fresh)
+    try:
+        services = ArrowheadClient().search_services(terms)
+    except (ValueError, PyrrowheadError) as e:
+        rich_console.print(e)
+        raise typer.Exit(-1)
+
     if raw_output:
-        rich_console.print(Syntax(json.dumps(list_data, indent=indent), "json"))
+        common.print_raw_records(services, indent)
         raise typer.Exit()
 
-    service_table = serviceregistry.create_service_table(
-        list_data, show_provider, show_access_policy, show_service_uri
+    rich_console.print(
+        serviceregistry.create_service_table(
+            services, show_provider, show_access_policy, show_service_uri
+        )
     )
 
-    rich_console.print(service_table)
-
 
 @sr_app.command(name="inspect")
 def inspect_service_cli(
-    service_id: int = typer.Argument(
-        ..., metavar="SERVICE_ID", help="ID of service to inspect."
+    service_ids: Optional[List[str]] = typer.Argument(
+        None,
+        metavar="SERVICE_ID...",
+        show_default=False,
+        help="IDs or ID ranges (e.g. 10-20) of services to inspect. "
+        "IDs are read from stdin if SERVICE_ID is '-', or if none are given and "
+        "stdin is not a terminal.",
     ),
     raw_output: Optional[bool] = common.OPT_RAW_OUTPUT,
     raw_indent: Optional[int] = common.OPT_RAW_INDENT,
+    concurrency: int = common.OPT_CONCURRENCY,
 ):
     """
-    Show information about service given by ID.
-    """
-    response_data, status = serviceregistry.inspect_service(service_id)
+    Show information about services given by ID.
 
-    if status >= 400:
-        rich_console.print(
-            f"Error occured when trying to inspect service with id {service_id} due to:"
-            f' {response_data["exceptionType"]}, {response_data["errorMessage"]}'
+    Multiple services are fetched concurrently and shown in the order they were given.
+    """
+    if service_ids == ["-"] or (not service_ids and not sys.stdin.isatty()):
+        service_ids = sys.stdin.read().split()
+    if not service_ids:
+        raise typer.BadParameter(
+            "At least one service id is required.", param_hint="SERVICE_ID"
         )
-        raise typer.Exit(-1)
 
-    if raw_output:
-        rich_console.print(Syntax(json.dumps(response_data, indent=raw_indent), "json"))
-        raise typer.Exit()
+    try:
+        parsed_ids = common.parse_id_ranges(service_ids)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="SERVICE_ID")
 
-    serviceregistry.render_service(response_data)
+    exit_code = 0
+    for service_id, response_data, status in ArrowheadClient().inspect_services(
+        parsed_ids, concurrency
+    ):
+        if not 0 < status < 400:
+            exception_type = response_data.get("exceptionType")
+            rich_console.print(
+                f"Error occured when trying to inspect service with id {service_id} "
+                f'due to: {f"{exception_type}, " if exception_type else ""}'
+                f'{response_data.get("errorMessage", "")}'
+            )
+            exit_code = -1
+        elif raw_output:
+            rich_console.print(
+                Syntax(json.dumps(response_data, indent=raw_indent), "json")
+            )
+        else:
+            serviceregistry.render_service(response_data)
+
+    raise typer.Exit(exit_code)
 
 
 @sr_app.command(name="add")
@@ -162,6 +276,46 @@ def add_service_cli(
     serviceregistry.render_service(response_data)
 
 
+@sr_app.command(name="add-batch")
+def add_services_batch_cli(
+    manifest: Path = typer.Argument(
+        ...,
+        exists=True,
+        dir_okay=False,
+        metavar="MANIFEST",
+        help="YAML, CSV or NDJSON file with one record per service.",
+    ),
+    concurrency: int = common.OPT_CONCURRENCY,
+    report: Optional[Path] = typer.Option(
+        None,
+        dir_okay=False,
+        metavar="REPORT_FILE",
+        help="Write the result of every registration to REPORT_FILE as NDJSON.",
+    ),
+):
+    """
+    Register all services in a manifest file.
+
+    Each record has the fields service_definition, uri, interface, system_name,
+    address, port, and optionally access_policy. YAML manifests can also put the
+    records under a "services" key. All records are validated before any service
+    is registered.
+    """
+    try:
+        registrations = bulk.load_service_registrations(manifest)
+    except PyrrowheadError as e:
+        rich_console.print(e)
+        raise typer.Exit(-1)
+
+    results = list(ArrowheadClient().add_services(registrations, concurrency))
+    if report is not None:
+        bulk.write_report(report, results)
+
+    rich_console.print(serviceregistry.create_registration_table(results))
+    if not all(result.ok for result in results):
+        raise typer.Exit(-1)
+
+
 @sr_app.command(name="remove")
 def remove_service_cli(
     id: int = typer.Argument(..., metavar="SERVICE_ID", help="Id of service to remove"),
@@ -1,12 +1,23 @@
 import json
 from pathlib import Path
-from typing import Optional
+from typing import Optional, List
 
 import typer
 from rich.syntax import Syntax
+from rich.text import Text
 
-from pyrrowhead.management import systemregistry
+from pyrrowhead.management import (
+    bulk,
+    cascade,
+    common,
+    graph,
+    multicloud,
+    systemregistry,
+    watch,
+)
+from pyrrowhead.management.client import ArrowheadClient
 from pyrrowhead import rich_console
+from pyrrowhead.utils import PyrrowheadError
 
 sys_app = typer.Typer(name="systems")
 
@@ -15,17 +26,52 @@ sys_app = typer.Typer(name="systems")
 def list_systems_cli(
     raw_output: bool = typer.Option(False, "--raw-output", "-r", show_default=False),
     indent: Optional[int] = typer.Option(None, "--raw-indent"),
+    filter_expression: Optional[str] = common.OPT_FILTER,
+    fresh: bool = common.OPT_FRESH,
+    watch_mode: bool = common.OPT_WATCH,
+    interval: float = common.OPT_WATCH_INTERVAL,
+    cloud_identifiers: Optional[List[str]] = common.OPT_CLOUDS,
+    all_clouds: bool = common.OPT_ALL_CLOUDS,
 ):
-    """List systems registered in the local cloud"""
-    response_data, status = systemregistry.list_systems()
+    """
+    List systems registered in the local cloud
 
-    if raw_output:
-        if status >= 400:
-            rich_console.print(f"Error code {status}.")
-        rich_console.print(Syntax(json.dumps(response_data, indent=indent), "json"))
-        raise typer.Exit()
+    Filter fields are id, name, address and port.
+    With --watch, the systems are polled and only the changes are shown.
+    With --cloud or --all-clouds, several local clouds are listed concurrently.
+    """
+    common.use_fresh_data(fresh or watch_mode)
+    try:
+        if cloud_identifiers or all_clouds:
+            if watch_mode:
+                raise PyrrowheadError(
+                    "--watch can not be combined with --cloud or --all-clouds."
+                )
+            results = multicloud.fan_out(
+                lambda client: client.list_systems(filter_expression),
+                multicloud.select_clouds(cloud_identifiers or [], all_clouds),
+            )
+            if not multicloud.print_cloud_results(
+                results, systemregistry.create_system_table, raw_output, indent
+            ):
+                raise typer.Exit(-1)
+            raise typer.Exit()
+        if watch_mode:
+            watch.watch_records(
+                lambda: systemregistry.list_systems(filter_expression),
+                systemregistry.create_system_table,
+                interval,
+            )
+            raise typer.Exit()
+        systems = systemregistry.list_systems(filter_expression)
+        if raw_output:
+            common.print_raw_records(systems, indent)
+            raise typer.Exit()
 
-    table = systemregistry.create_system_table(response_data)
+        table = systemregistry.create_system_table(systems)
+    except (ValueError, PyrrowheadError) as e:
+        rich_console.print(e)
+        raise typer.Exit(-1)
 
     rich_console.print(table)
 
@@ -46,6 +92,130 @@ def add_system_cli(
 
 
 @sys_app.command(name="remove")
-def remove_system_cli(system_id: int):
-    """Remove system by id."""
-    response_data, status = systemregistry.remove_system(system_id)
+def remove_system_cli(
+    system_ids: List[str] = typer.Argument(
+        ...,
+        metavar="SYSTEM_ID...",
+        help="IDs or ID ranges (e.g. 10-20) of systems to remove.",
+    ),
+    cascade_removal: bool = typer.Option(
+        False,
+        "--cascade",
+        help="Also remove the services, orchestration store rules and "
+        "authorization rules of the systems.",
+    ),
+    dry_run: bool = typer.Option(
+        False, "--dry-run", help="Show what would be removed without removing it."
+    ),
+    yes: bool = typer.Option(
+        False,
+        "--yes",
+        "-y",
+        help="Remove without asking for confirmation, only asked with --cascade.",
+    ),
+    concurrency: int = common.OPT_CONCURRENCY,
+):
+    """
+    Remove systems by id.
+
+    With --cascade, the services, orchestration store rules and authorization rules
+    referring to the systems are found in one listing of each, shown, and removed
+    concurrently before the systems, rules first.
+    """
+    try:
+        parsed_ids = common.parse_id_ranges(system_ids)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="SYSTEM_ID")
+
+    if not cascade_removal:
+        if dry_run:
+            rich_console.print(
+                f"Would remove systems {cascade.format_id_ranges(parsed_ids)}."
+            )
+            raise typer.Exit()
+        exit_code = 0
+        for system_id in parsed_ids:
+            response_data, status = systemregistry.remove_system(system_id)
+            if status >= 400:
+                rich_console.print(
+                    Text(
+                        f"Removal of system {system_id} failed: "
+                        f'{response_data.get("errorMessage", "")}'
+                    )
+                )
+                exit_code = -1
+        raise typer.Exit(exit_code)
+
+    # The plan must be based on the actual state, never on cached responses
+    common.use_fresh_data(True)
+    client = ArrowheadClient()
+    try:
+        plan = cascade.plan_cascade(client, parsed_ids)
+    except PyrrowheadError as e:
+        rich_console.print(e)
+        raise typer.Exit(-1)
+
+    rich_console.print(cascade.create_plan_table(plan))
+    if dry_run or not (
+        yes or typer.confirm(f"Remove {len(plan)} systems, services and rules?")
+    ):
+        raise typer.Exit()
+
+    results = cascade.execute_cascade(client, plan, concurrency)
+
+    rich_console.print(bulk.create_section_table(results, "Cascade removal"))
+    for error in bulk.section_errors(results):
+        rich_console.print(error, style="red", highlight=False)
+    if len(results.get("system", [])) != len(plan.system) or not all(
+        result.ok for step_results in results.values() for result in step_results
+    ):
+        raise typer.Exit(-1)
+
+
+@sys_app.command(name="graph")
+def system_graph_cli(
+    impact: Optional[List[int]] = typer.Option(
+        None,
+        "--impact",
+        show_default=False,
+        metavar="SYSTEM_ID",
+        help="Show the systems that directly or transitively depend on SYSTEM_ID, "
+        "can be given multiple times.",
+    ),
+    limit: int = typer.Option(
+        10, "--limit", "-n", min=1, help="Maximum number of hot spots to show."
+    ),
+    fresh: bool = common.OPT_FRESH,
+):
+    """
+    Analyse which systems depend on which, from the orchestration store and
+    authorization rules.
+
+    Shows the systems with the most consumers and the groups of systems that depend
+    on each other. With --impact, shows what is affected if the given systems are
+    removed.
+    """
+    common.use_fresh_data(fresh)
+    try:
+        dependency_graph = graph.DependencyGraph.from_client(ArrowheadClient())
+    except PyrrowheadError as e:
+        rich_console.print(e)
+        raise typer.Exit(-1)
+
+    if impact:
+        dependents = dependency_graph.impact(impact)
+        rich_console.print(
+            graph.create_impact_table(dependency_graph, impact, dependents)
+        )
+        rich_console.print(
+            f"{len(dependents)} systems depend on "
+            f'{", ".join(map(dependency_graph.system_label, impact))}'
+        )
+        return
+
+    rich_console.print(
+        f"{len(dependency_graph)} systems with "
+        f"{dependency_graph.edge_count} dependencies"
+    )
+    rich_console.print(graph.create_hot_spot_table(dependency_graph, limit))
+    rich_console.print(graph.create_component_table(dependency_graph))
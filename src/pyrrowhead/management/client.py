@@ -0,0 +1,871 @@
+import json
+import time
+from functools import partial
+from itertools import chain
+from pathlib import Path
+from typing import Optional, Tuple, Dict, Iterator, Iterable, Union, List, Any, Set
+from urllib.parse import quote
+
+import requests
+import yaml
+import yamlloader  # type: ignore
+
+from pyrrowhead.constants import CLOUD_CONFIG_FILE_NAME
+from pyrrowhead.management.bulk import (
+    ServiceRegistration,
+    OrchestrationRule,
+    StoreChunk,
+    AuthorizationRule,
+    AuthorizationRequest,
+    BulkResult,
+    run_bulk_item,
+    chunk_rules,
+    compact_authorization_rules,
+    DEFAULT_CHUNK_SIZE,
+)
+from pyrrowhead.management.cache import SnapshotCache
+from pyrrowhead.management import search
+from pyrrowhead.management.filters import (
+    RecordFilter,
+    equality_filter,
+    SERVICE_FIELDS,
+    SYSTEM_FIELDS,
+    ORCHESTRATION_FIELDS,
+    AUTHORIZATION_FIELDS,
+)
+from pyrrowhead.management.common import AccessPolicy
+from pyrrowhead.management.index import (
+    SystemIndex,
+    ServiceIndex,
+    ServiceSearchIndex,
+    SystemKey,
+    SYSTEM_NOT_FOUND,
+    SYSTEM_AMBIGUOUS,
+)
+from pyrrowhead.management.utils import (
+    get_service,
+    post_service,
+    delete_service,
+    get_paged_records,
+    map_concurrently,
+    DEFAULT_CONCURRENCY,
+)
+from pyrrowhead.utils import get_active_cloud_directory, PyrrowheadError
+
+# Names the core systems register with, lower case and without separators
+CORE_SYSTEM_NAMES = frozenset(
+    {
+        "serviceregistry",
+        "orchestrator",
+        "authorization",
+        "gateway",
+        "gatekeeper",
+        "eventhandler",
+        "systemregistry",
+        "deviceregistry",
+        "certificateauthority",
+        "onboardingcontroller",
+        "choreographer",
+        "datamanager",
+        "qosmonitor",
+        "translator",
+    }
+)
+
+
+def is_core_system_name(system_name: str) -> bool:
+    return system_name.lower().replace("_", "").replace("-", "") in CORE_SYSTEM_NAMES
+
+
+def _decode_response(response: requests.Response, error_message: str) -> Any:
+    try:
+        return response.json()
+    except json.JSONDecodeError:
+        return {"errorMessage": error_message}
+
+
+class ArrowheadClient:
+    """
+    Client for the management interfaces of the core systems of a local cloud.
+
+    The cloud directory, core system addresses and scheme are resolved once when the
+    client is created, after which the client can be used for any number of
+    operations. Connections and sysop certificates are shared through the session
+    pool in :mod:`pyrrowhead.management.utils`.
+
+    List responses are served from the snapshot cache of the cloud in
+    :mod:`pyrrowhead.management.cache` while they are fresh, and every add or remove
+    call made by the client invalidates that cache.
+
+    Lookups of systems by name and of service ids use a
+    :class:`~pyrrowhead.management.index.SystemIndex` and a
+    :class:`~pyrrowhead.management.index.ServiceIndex`, each built the first time it
+    is needed and rebuilt after the client changes the registry.
+
+    Args:
+        cloud_directory: Directory of the local cloud to manage, the active local
+          cloud is used if not given.
+    """
+
+    _system_index: Optional[SystemIndex] = None
+    _service_index: Optional[ServiceIndex] = None
+    _service_search_index: Optional[ServiceSearchIndex] = None
+
+    def __init__(self, cloud_directory: Optional[Path] = None):
+        if cloud_directory is None:
+            cloud_directory = get_active_cloud_directory()
+        self.cloud_directory = Path(cloud_directory)
+
+        with open(self.cloud_directory / CLOUD_CONFIG_FILE_NAME, "r") as config_file:
+            cloud_config = yaml.load(
+                config_file, Loader=yamlloader.ordereddict.CSafeLoader
+            )["cloud"]
+
+        self.secure: bool = cloud_config["ssl_enabled"]
+        self.scheme = "https" if self.secure else "http"
+        self.core_systems: Dict[str, str] = {
+            core_name: f'{self.scheme}://{core_system["address"]}:{core_system["port"]}'
+            for core_name, core_system in cloud_config["core_systems"].items()
+        }
+        self.core_system_addresses: Set[Tuple[str, int]] = {
+            (core_system["address"], core_system["port"])
+            for core_system in cloud_config["core_systems"].values()
+        }
+        self.cache = SnapshotCache.for_cloud(
+            cloud_config["org_name"], cloud_config["cloud_name"]
+        )
+
+    def is_core_system(self, system: SystemKey) -> bool:
+        """
+        Check if a system is a core system, either of this cloud by its address and
+        port, or of any cloud by its name.
+        """
+        system_name, address, port = system
+        return (address, port) in self.core_system_addresses or is_core_system_name(
+            system_name
+        )
+
+    def url(self, core_system: str, path: str) -> str:
+        try:
+            return f"{self.core_systems[core_system]}/{path}"
+        except KeyError:
+            raise PyrrowheadError(
+                f"Core system {core_system} is not part of the local cloud."
+            )
+
+    def get(self, core_system: str, path: str, **kwargs) -> requests.Response:
+        return get_service(self.url(core_system, path), self.cloud_directory, **kwargs)
+
+    def post(
+        self, core_system: str, path: str, json: Union[Dict, List]
+    ) -> requests.Response:
+        try:
+            return post_service(
+                self.url(core_system, path), self.cloud_directory, json=json
+            )
+        finally:
+            self.invalidate()
+
+    def delete(self, core_system: str, path: str) -> requests.Response:
+        try:
+            return delete_service(self.url(core_system, path), self.cloud_directory)
+        finally:
+            self.invalidate()
+
+    def invalidate(self):
+        """Discard the cached snapshots and indexes of the cloud."""
+        self.cache.invalidate()
+        self._system_index = None
+        self._service_index = None
+        self._service_search_index = None
+
+    def records(self, core_system: str, path: str) -> Iterator[Dict]:
+        return self.cache.cached(
+            path.strip("/").replace("/", "_"),
+            lambda: get_paged_records(
+                self.url(core_system, path), self.cloud_directory
+            ),
+        )
+
+    # SERVICE REGISTRY
+    def inspect_service(self, service_id: int) -> Tuple[Dict, int]:
+        response = self.get("service_registry", f"serviceregistry/mgmt/{service_id}")
+
+        return (
+            _decode_response(response, f"Could not inspect service {service_id}."),
+            response.status_code,
+        )
+
+    def _inspect_service_item(self, service_id: int) -> Tuple[Dict, int]:
+        try:
+            return self.inspect_service(service_id)
+        except (PyrrowheadError, requests.RequestException, ValueError) as e:
+            return {"errorMessage": str(e)}, 0
+
+    def inspect_services(
+        self,
+        service_ids: Iterable[int],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Iterator[Tuple[int, Dict, int]]:
+        """
+        Inspect many services concurrently.
+
+        Yields:
+            Tuples of service id, response data and status code, in the order of
+            ``service_ids``. Services that could not be inspected because of a
+            request error have status code 0 and the error in ``errorMessage``.
+        """
+        service_ids = list(service_ids)
+        responses = map_concurrently(
+            self._inspect_service_item, service_ids, concurrency
+        )
+        for service_id, (response_data, status) in zip(service_ids, responses):
+            yield service_id, response_data, status
+
+    def add_service(
+        self,
+        service_definition: str,
+        uri: str,
+        interface: str,
+        access_policy: AccessPolicy,
+        system: Tuple[str, str, int],
+    ) -> Tuple[Dict, int]:
+        system_name, address, port = system
+
+        registry_request = {
+            "serviceDefinition": service_definition,
+            "serviceUri": uri,
+            "interfaces": [interface],
+            "secure": access_policy,
+            "providerSystem": {
+                "systemName": system_name,
+                "address": address,
+                "port": port,
+            },
+        }
+
+        response = self.post(
+            "service_registry", "serviceregistry/mgmt/", json=registry_request
+        )
+
+        return response.json(), response.status_code
+
+    def add_services(
+        self,
+        registrations: Iterable[ServiceRegistration],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Iterator[BulkResult]:
+        """
+        Register many services, with at most ``concurrency`` concurrent requests.
+
+        Yields:
+            The result of each registration, in the order of ``registrations``.
+        """
+        return map_concurrently(
+            partial(
+                run_bulk_item, lambda registration: self.add_service(*registration)
+            ),
+            registrations,
+            concurrency,
+        )
+
+    def register_service(self, registry_request: Dict) -> Tuple[Dict, int]:
+        """Register a service described by a complete service registry request."""
+        response = self.post(
+            "service_registry", "serviceregistry/mgmt/", json=registry_request
+        )
+
+        return (
+            _decode_response(response, "Could not decode service registry response"),
+            response.status_code,
+        )
+
+    def register_services(
+        self,
+        registry_requests: Iterable[Dict],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Iterator[BulkResult]:
+        """
+        Register many services described by complete service registry requests,
+        with at most ``concurrency`` concurrent requests.
+
+        Yields:
+            The result of each registration, in the order of ``registry_requests``.
+        """
+        return map_concurrently(
+            partial(run_bulk_item, self.register_service),
+            registry_requests,
+            concurrency,
+        )
+
+    def list_services(
+        self,
+        service_definition: Optional[str] = None,
+        system_name: Optional[str] = None,
+        system_id: Optional[int] = None,
+        filter_expression: Optional[str] = None,
+    ) -> Iterator[Dict]:
+        """
+        Yield the services in the service registry, fetched page by page.
+
+        When the service definition is given, or required by ``filter_expression``,
+        only the services with that definition are fetched.
+
+        Args:
+            service_definition: Only yield services with this service definition.
+            system_name: Only yield services provided by this system.
+            system_id: Only yield services provided by the system with this id.
+            filter_expression: Only yield services matching the expression, see
+              :func:`~pyrrowhead.management.filters.parse_filter`.
+
+        Raises:
+            ValueError: If the filter expression is invalid.
+            PyrrowheadError: If the service registry responds with an error.
+        """
+        record_filter = equality_filter(
+            SERVICE_FIELDS,
+            definition=service_definition,
+            provider=system_name,
+            provider_id=system_id,
+        ) & RecordFilter.parse(filter_expression, SERVICE_FIELDS)
+
+        pushed_down_definition = record_filter.equality_value("definition")
+        if pushed_down_definition is not None:
+            services = self._services_by_definition(pushed_down_definition)
+        else:
+            services = self.records("service_registry", "serviceregistry/mgmt/")
+
+        return record_filter.apply(services)
+
+    def _services_by_definition(self, service_definition: str) -> Iterator[Dict]:
+        found_services = False
+        try:
+            for service in self.records(
+                "service_registry",
+                f"serviceregistry/mgmt/servicedef/{quote(service_definition, safe='')}",
+            ):
+                found_services = True
+                yield service
+        except PyrrowheadError:
+            # The service registry responds with an error for unknown service
+            # definitions, fall back on filtering all services in that case.
+            if found_services:
+                raise
+            yield from self.records("service_registry", "serviceregistry/mgmt/")
+
+    def search_services(self, terms: Iterable[str]) -> List[Dict]:
+        """
+        Find the services matching all search terms, using an inverted index built
+        from one listing of the services.
+
+        See :func:`~pyrrowhead.management.index.parse_search_term` for the terms.
+
+        Raises:
+            ValueError: If a search term is invalid.
+            PyrrowheadError: If the service registry responds with an error.
+        """
+        if self._service_search_index is None:
+            self._service_search_index = ServiceSearchIndex(self.list_services())
+        return self._service_search_index.search(terms)
+
+    def delete_service(self, service_id: int) -> Tuple[Dict, int]:
+        response = self.delete("service_registry", f"serviceregistry/mgmt/{service_id}")
+
+        return (
+            _decode_response(response, "Could not decode service registry response"),
+            response.status_code,
+        )
+
+    def grouped_services(self) -> Tuple[Dict, int]:
+        snapshot = self.cache.get("serviceregistry_mgmt_grouped")
+        if snapshot is not None:
+            return list(snapshot)[0], 200
+
+        fetched_at = time.time()
+        response = self.get("service_registry", "serviceregistry/mgmt/grouped")
+        response_data = response.json()
+        if response.status_code < 400:
+            self.cache.store(
+                "serviceregistry_mgmt_grouped", [response_data], fetched_at
+            )
+
+        return response_data, response.status_code
+
+    @property
+    def service_index(self) -> ServiceIndex:
+        """
+        Raises:
+            PyrrowheadError: If the service registry responds with an error.
+        """
+        if self._service_index is None:
+            response_data, status = self.grouped_services()
+            if status >= 400:
+                raise PyrrowheadError(
+                    f'{response_data.get("errorMessage", "")} (status code {status})'
+                )
+            self._service_index = ServiceIndex(response_data)
+        return self._service_index
+
+    def get_system_id_from_name(
+        self, system_name: str, address: str = "", port: int = -1
+    ) -> int:
+        """
+        Returns:
+            The system id, -1 if there is no such system, or -2 if several systems
+            have the name and no address and port are given.
+        """
+        return self.system_index.lookup(system_name, address, port)
+
+    def get_system_ids(self, systems: Iterable[Union[str, SystemKey]]) -> List[int]:
+        """
+        Resolve many system names, or (name, address, port) tuples, at once.
+
+        Returns:
+            The ids, in the order of ``systems``, with the same special values as
+            :meth:`get_system_id_from_name`.
+        """
+        return self.system_index.lookup_many(systems)
+
+    def fuzzy_search(
+        self, query: str, limit: int = search.DEFAULT_SEARCH_LIMIT
+    ) -> List[search.SearchHit]:
+        """
+        Rank service definitions, systems, addresses and orchestration and
+        authorization rules by their similarity to ``query``.
+
+        The trigram index is stored in the snapshot cache, so it is built once and
+        reused by later calls and commands until the cache expires or is invalidated.
+
+        Raises:
+            PyrrowheadError: If a core system responds with an error.
+        """
+        (index_data,) = self.cache.cached(
+            "search_index", lambda: [self._build_fuzzy_index().to_dict()]
+        )
+        return search.FuzzyIndex.from_dict(index_data).search(query, limit)
+
+    def _build_fuzzy_index(self) -> search.FuzzyIndex:
+        return search.FuzzyIndex(
+            chain(
+                search.service_documents(self.list_services()),
+                search.system_documents(self.list_systems()),
+                search.rule_documents(
+                    "orchestration rule", self.list_orchestration_rules()
+                ),
+                search.rule_documents(
+                    "authorization rule", self.list_authorization_rules()
+                ),
+            )
+        )
+
+    # SYSTEM REGISTRY
+    @property
+    def system_index(self) -> SystemIndex:
+        if self._system_index is None:
+            self._system_index = SystemIndex(self.list_systems())
+        return self._system_index
+
+    def list_systems(self, filter_expression: Optional[str] = None) -> Iterator[Dict]:
+        """
+        Yield the systems in the service registry, fetched page by page.
+
+        Raises:
+            ValueError: If the filter expression is invalid.
+            PyrrowheadError: If the service registry responds with an error.
+        """
+        return RecordFilter.parse(filter_expression, SYSTEM_FIELDS).apply(
+            self.records("service_registry", "serviceregistry/mgmt/systems")
+        )
+
+    def add_system(
+        self,
+        system_name: str,
+        system_address: str,
+        system_port: int,
+        certificate_file: Optional[Path] = None,
+    ) -> Dict:
+        system_record = {
+            "systemName": system_name,
+            "address": system_address,
+            "port": system_port,
+        }
+
+        response_data = self.post(
+            "service_registry", "serviceregistry/mgmt/systems", json=system_record
+        ).json()
+
+        return response_data
+
+    def post_system(self, system_record: Dict) -> Tuple[Dict, int]:
+        response = self.post(
+            "service_registry", "serviceregistry/mgmt/systems", json=system_record
+        )
+
+        return (
+            _decode_response(response, "Could not decode service registry response"),
+            response.status_code,
+        )
+
+    def add_systems(
+        self,
+        system_records: Iterable[Dict],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Iterator[BulkResult]:
+        """
+        Register many systems, with at most ``concurrency`` concurrent requests.
+
+        Yields:
+            The result of each registration, in the order of ``system_records``.
+        """
+        return map_concurrently(
+            partial(run_bulk_item, self.post_system), system_records, concurrency
+        )
+
+    def remove_system(self, system_id: int) -> Tuple[Dict, int]:
+        response = self.delete(
+            "service_registry", f"serviceregistry/mgmt/systems/{system_id}"
+        )
+
+        return (
+            _decode_response(response, "Could not decode service registry response"),
+            response.status_code,
+        )
+
+    # ORCHESTRATOR
+    def list_orchestration_rules(
+        self, filter_expression: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """
+        Yield the orchestration store rules, fetched page by page.
+
+        Raises:
+            ValueError: If the filter expression is invalid.
+            PyrrowheadError: If the orchestrator responds with an error.
+        """
+        return RecordFilter.parse(filter_expression, ORCHESTRATION_FIELDS).apply(
+            self.records("orchestrator", "orchestrator/mgmt/store")
+        )
+
+    def get_ids_from_service_definition(
+        self,
+        service_definition: str,
+        interface_name: str,
+        provider_name: str,
+        address: str,
+        port: int,
+    ) -> Tuple[int, int, int]:
+        """
+        Args:
+            service_definition:
+            interface_name:
+            provider_name:
+            address:
+            port:
+
+        Returns:
+            Tuple of service definition id, interface id, and provider id
+
+        Raises:
+            PyrrowheadError: If no matching service is registered.
+        """
+        return self.service_index.lookup(
+            service_definition, interface_name, provider_name, address, port
+        )
+
+    def get_authorization_rules(
+        self, rules: Iterable[OrchestrationRule]
+    ) -> List[AuthorizationRule]:
+        """
+        Create the authorization rules that let the consumers of orchestration rules
+        use the services of their providers.
+
+        The consumer ids of the rules must be resolved, see
+        :meth:`resolve_consumer_ids`.
+
+        Raises:
+            PyrrowheadError: If the service of any rule is not registered, listing
+              all such rules.
+        """
+        authorization_rules = []
+        errors = []
+        for index, rule in enumerate(rules):
+            try:
+                (
+                    service_definition_id,
+                    interface_id,
+                    provider_id,
+                ) = self.service_index.lookup(
+                    rule.service_definition, rule.interface, *rule.provider
+                )
+            except PyrrowheadError as e:
+                errors.append(f"orchestration rule {index}: {e}")
+                continue
+            authorization_rules.append(
+                AuthorizationRule(
+                    rule.consumer_id,  # type: ignore
+                    provider_id,
+                    interface_id,
+                    service_definition_id,
+                )
+            )
+
+        if errors:
+            raise PyrrowheadError(
+                f"Could not find the service of {len(errors)} orchestration "
+                f"rule(s):\n  " + "\n  ".join(errors)
+            )
+
+        return authorization_rules
+
+    def add_orchestration_rule(
+        self,
+        service_definition: str,
+        service_interface: str,
+        provider_system: Tuple[str, str, int],
+        consumer_id: Optional[int] = None,
+        priority: int = 1,
+        metadata: Optional[int] = None,
+        add_auth_rule: Optional[bool] = None,
+    ) -> Tuple[Dict, int]:
+        orchestration_input = [
+            {
+                "serviceDefinitionName": service_definition,
+                "serviceInterfaceName": service_interface,
+                "consumerSystemId": consumer_id,
+                "providerSystem": dict(
+                    zip(("systemName", "address", "port"), provider_system)
+                ),
+                "priority": priority,
+                "attribute": metadata,
+            }
+        ]
+
+        response = self.post(
+            "orchestrator", "orchestrator/mgmt/store", json=orchestration_input
+        )
+
+        if add_auth_rule:
+            (
+                service_definition_id,
+                interface_id,
+                provider_id,
+            ) = self.get_ids_from_service_definition(
+                service_definition, service_interface, *provider_system
+            )
+            self.add_authorization_rule(
+                consumer_id,  # type: ignore
+                provider_id,
+                interface_id,
+                service_definition_id,
+                # TODO: mypy complains here, remove ignore and fix later
+            )
+
+        return (
+            _decode_response(response, "Error decoding json."),
+            response.status_code,
+        )
+
+    def resolve_consumer_ids(
+        self, rules: Iterable[OrchestrationRule]
+    ) -> List[OrchestrationRule]:
+        """
+        Fill in the consumer id of every rule that only names its consumer system.
+
+        All consumers are resolved with the system index, so the systems are
+        fetched at most once for all rules.
+
+        Raises:
+            PyrrowheadError: If any consumer is unknown or ambiguous, listing all such
+              rules.
+        """
+        rules = list(rules)
+        consumer_ids = self.get_system_ids(
+            rule.consumer for rule in rules if rule.consumer_id is None
+        )
+
+        resolved_rules = []
+        errors = []
+        unresolved_consumer_ids = iter(consumer_ids)
+        for index, rule in enumerate(rules):
+            if rule.consumer_id is not None:
+                resolved_rules.append(rule)
+                continue
+            consumer_id = next(unresolved_consumer_ids)
+            if consumer_id == SYSTEM_NOT_FOUND:
+                errors.append(
+                    f"orchestration rule {index}: no consumer {rule.consumer[0]}"
+                )
+            elif consumer_id == SYSTEM_AMBIGUOUS:
+                errors.append(
+                    f"orchestration rule {index}: consumer {rule.consumer[0]} is "
+                    f"ambiguous, provide its address and port"
+                )
+            else:
+                resolved_rules.append(rule._replace(consumer_id=consumer_id))
+
+        if errors:
+            raise PyrrowheadError(
+                f"Could not resolve the consumer of {len(errors)} orchestration "
+                f"rule(s):\n  " + "\n  ".join(errors)
+            )
+
+        return resolved_rules
+
+    def add_orchestration_rule_chunk(self, chunk: StoreChunk) -> Tuple[Dict, int]:
+        orchestration_input = [
+            {
+                "serviceDefinitionName": rule.service_definition,
+                "serviceInterfaceName": rule.interface,
+                "consumerSystemId": rule.consumer_id,
+                "providerSystem": dict(
+                    zip(("systemName", "address", "port"), rule.provider)
+                ),
+                "priority": rule.priority,
+                "attribute": rule.attribute,
+            }
+            for rule in chunk.rules
+        ]
+
+        response = self.post(
+            "orchestrator", "orchestrator/mgmt/store", json=orchestration_input
+        )
+
+        return (
+            _decode_response(response, "Error decoding json."),
+            response.status_code,
+        )
+
+    def add_orchestration_rules(
+        self,
+        rules: Iterable[OrchestrationRule],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        isolate_failures: bool = True,
+        concurrency: int = 1,
+    ) -> Iterator[BulkResult]:
+        """
+        Add many orchestration store rules, ``chunk_size`` rules per request.
+
+        All consumer ids are resolved before anything is posted. The orchestrator
+        stores a chunk in a single transaction, so when a chunk is rejected none of
+        its rules are stored. With ``isolate_failures`` the rules of a rejected chunk
+        are then posted one by one, to add the valid rules and pinpoint the failing
+        ones. Up to ``concurrency`` chunks are posted at the same time.
+
+        Yields:
+            One result per chunk, and for rejected chunks with ``isolate_failures``,
+            one result per rule of that chunk instead. The item of every result is a
+            :class:`StoreChunk` with the chunk index and the index of its first rule.
+
+        Raises:
+            PyrrowheadError: If the consumer of any rule cannot be resolved.
+        """
+        resolved_rules = self.resolve_consumer_ids(rules)
+
+        for chunk_results in map_concurrently(
+            partial(self._add_store_chunk, isolate_failures=isolate_failures),
+            chunk_rules(resolved_rules, chunk_size),
+            concurrency,
+        ):
+            yield from chunk_results
+
+    def _add_store_chunk(
+        self, chunk: StoreChunk, isolate_failures: bool
+    ) -> List[BulkResult]:
+        result = run_bulk_item(self.add_orchestration_rule_chunk, chunk)
+        if result.ok or not isolate_failures or len(chunk.rules) == 1:
+            return [result]
+        return [
+            run_bulk_item(
+                self.add_orchestration_rule_chunk,
+                StoreChunk(chunk.chunk_index, chunk.first_rule + offset, [rule]),
+            )
+            for offset, rule in enumerate(chunk.rules)
+        ]
+
+    def remove_orchestration_rule(self, orchestration_id: int) -> Tuple[Dict, int]:
+        response = self.delete(
+            "orchestrator", f"orchestrator/mgmt/store/{orchestration_id}"
+        )
+
+        return (
+            _decode_response(
+                response,
+                f"Could not decode orchestration response with status code "
+                f"{response.status_code}",
+            ),
+            response.status_code,
+        )
+
+    # AUTHORIZATION
+    def list_authorization_rules(
+        self, filter_expression: Optional[str] = None
+    ) -> Iterator[Dict]:
+        """
+        Yield the intracloud authorization rules, fetched page by page.
+
+        Raises:
+            ValueError: If the filter expression is invalid.
+            PyrrowheadError: If the authorization system responds with an error.
+        """
+        return RecordFilter.parse(filter_expression, AUTHORIZATION_FIELDS).apply(
+            self.records("authorization", "authorization/mgmt/intracloud")
+        )
+
+    def add_authorization_rule(
+        self,
+        consumer_id: int,
+        provider_id: int,
+        interface_id: int,
+        service_definition_id: int,
+    ) -> Tuple[Dict, int]:
+        return self.post_authorization_request(
+            AuthorizationRequest(
+                consumer_id, [provider_id], [interface_id], [service_definition_id]
+            )
+        )
+
+    def post_authorization_request(
+        self, request: AuthorizationRequest
+    ) -> Tuple[Dict, int]:
+        response = self.post(
+            "authorization",
+            "authorization/mgmt/intracloud/",
+            json=request.to_message(),
+        )
+
+        return (
+            _decode_response(response, "Could not decode authorization response"),
+            response.status_code,
+        )
+
+    def add_authorization_rules(
+        self,
+        rules: Iterable[AuthorizationRule],
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ) -> Iterator[BulkResult]:
+        """
+        Add many authorization rules using as few requests as possible.
+
+        The rules are compacted with
+        :func:`~pyrrowhead.management.bulk.compact_authorization_rules`, and the
+        resulting requests are sent with at most ``concurrency`` concurrent requests.
+
+        Yields:
+            The result of each request, with the :class:`AuthorizationRequest` as
+            item, in the order of the compacted plan.
+        """
+        return map_concurrently(
+            partial(run_bulk_item, self.post_authorization_request),
+            compact_authorization_rules(rules),
+            concurrency,
+        )
+
+    def remove_authorization_rule(self, authorization_id: int) -> Tuple[Dict, int]:
+        response = self.delete(
+            "authorization", f"authorization/mgmt/intracloud/{authorization_id}"
+        )
+
+        return (
+            _decode_response(response, "Could not decode authorization response"),
+            response.status_code,
+        )
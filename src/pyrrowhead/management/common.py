@@ -1,7 +1,15 @@
+import json
 from enum import Enum
 from pathlib import Path
+from typing import Iterable, Dict, Optional, List
 
 import typer
+from rich.syntax import Syntax
+
+from pyrrowhead import rich_console
+from pyrrowhead.management.utils import DEFAULT_CONCURRENCY
+from pyrrowhead.management.cache import configure_cache
+from pyrrowhead.management.watch import DEFAULT_WATCH_INTERVAL, MAX_WATCH_INTERVAL
 
 
 class AccessPolicy(str, Enum):
@@ -53,3 +61,99 @@ OPT_RAW_INDENT = typer.Option(
     metavar="NUM_SPACES",
     help="Print json with NUM_SPACES " "spaces of indentation.",
 )
+
+OPT_CONCURRENCY = typer.Option(
+    DEFAULT_CONCURRENCY,
+    "--concurrency",
+    "-j",
+    min=1,
+    metavar="NUM_REQUESTS",
+    help="Maximum number of concurrent requests to the core systems.",
+)
+
+OPT_FRESH = typer.Option(
+    False,
+    "--fresh",
+    show_default=False,
+    help="Fetch from the core systems instead of using the snapshot cache.",
+)
+
+OPT_FILTER = typer.Option(
+    None,
+    "--filter",
+    "-f",
+    metavar="EXPRESSION",
+    help="Only show records matching EXPRESSION, clauses like FIELD=VALUE, "
+    "FIELD!=VALUE, FIELD~GLOB or FIELD!~GLOB joined by 'and', "
+    "e.g. 'provider=sensor and interface~HTTP-SECURE-*'.",
+)
+
+OPT_WATCH = typer.Option(
+    False,
+    "--watch",
+    "-w",
+    show_default=False,
+    help="Keep polling and print only the added, changed and removed records, "
+    "stop with ctrl+c.",
+)
+
+OPT_WATCH_INTERVAL = typer.Option(
+    DEFAULT_WATCH_INTERVAL,
+    "--interval",
+    min=0.1,
+    metavar="SECONDS",
+    help=f"Seconds between polls in watch mode, backing off to at most "
+    f"{MAX_WATCH_INTERVAL:.0f} seconds while nothing changes.",
+)
+
+OPT_CLOUDS = typer.Option(
+    None,
+    "--cloud",
+    show_default=False,
+    metavar="CLOUD_IDENTIFIER",
+    help="Query the local cloud CLOUD_IDENTIFIER instead of the active cloud, can be "
+    "given multiple times to query several clouds concurrently.",
+)
+
+OPT_ALL_CLOUDS = typer.Option(
+    False,
+    "--all-clouds",
+    show_default=False,
+    help="Query all local clouds concurrently instead of the active cloud.",
+)
+
+
+def use_fresh_data(fresh: bool):
+    """Bypass the snapshot cache for the rest of the command if ``fresh`` is set."""
+    if fresh:
+        configure_cache(fresh=True)
+
+
+def parse_id_ranges(values: Iterable[str]) -> List[int]:
+    """
+    Parse ids and inclusive id ranges, such as ``"4"`` and ``"10-20"``.
+
+    Values may also be separated by commas or whitespace, as in ``"4,10-20"``.
+
+    Raises:
+        ValueError: If a value is not an id or an id range.
+    """
+    ids: List[int] = []
+    for value in values:
+        for part in value.replace(",", " ").split():
+            start, sep, stop = part.partition("-")
+            if not sep:
+                ids.append(int(part))
+            elif int(start) <= int(stop):
+                ids.extend(range(int(start), int(stop) + 1))
+            else:
+                raise ValueError(f"Invalid id range {part}")
+    return ids
+
+
+def print_raw_records(records: Iterable[Dict], indent: Optional[int] = None):
+    """Print records in the json format of the core system list endpoints."""
+    data = list(records)
+    rich_console.print(
+        Syntax(json.dumps({"data": data, "count": len(data)}, indent=indent), "json")
+    )
@@ -0,0 +1,211 @@
+import re
+import shlex
+from fnmatch import translate
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+FieldAccessor = Callable[[Dict], List[str]]
+
+_CLAUSE_PATTERN = re.compile(r"^([\w.-]+)\s*(!=|!~|=|~)\s*(.*)$", re.DOTALL)
+
+
+class Clause(NamedTuple):
+    field: str
+    operator: str
+    value: str
+
+
+def _field(*path: str) -> FieldAccessor:
+    def accessor(record: Dict) -> List[str]:
+        value = record
+        for key in path:
+            value = value[key]
+        return [str(value)]
+
+    return accessor
+
+
+def _interfaces(interfaces_key: str) -> FieldAccessor:
+    def accessor(record: Dict) -> List[str]:
+        return [interface["interfaceName"] for interface in record[interfaces_key]]
+
+    return accessor
+
+
+def _metadata(key: str) -> FieldAccessor:
+    def accessor(record: Dict) -> List[str]:
+        metadata = record.get("metadata") or {}
+        return [str(metadata[key])] if key in metadata else []
+
+    return accessor
+
+
+SERVICE_FIELDS: Dict[str, FieldAccessor] = {
+    "id": _field("id"),
+    "definition": _field("serviceDefinition", "serviceDefinition"),
+    "provider": _field("provider", "systemName"),
+    "provider_id": _field("provider", "id"),
+    "interface": _interfaces("interfaces"),
+    "uri": _field("serviceUri"),
+    "access_policy": _field("secure"),
+}
+SYSTEM_FIELDS: Dict[str, FieldAccessor] = {
+    "id": _field("id"),
+    "name": _field("systemName"),
+    "address": _field("address"),
+    "port": _field("port"),
+}
+ORCHESTRATION_FIELDS: Dict[str, FieldAccessor] = {
+    "id": _field("id"),
+    "definition": _field("serviceDefinition", "serviceDefinition"),
+    "consumer": _field("consumerSystem", "systemName"),
+    "consumer_id": _field("consumerSystem", "id"),
+    "provider": _field("providerSystem", "systemName"),
+    "provider_id": _field("providerSystem", "id"),
+    "interface": _field("serviceInterface", "interfaceName"),
+    "priority": _field("priority"),
+}
+AUTHORIZATION_FIELDS: Dict[str, FieldAccessor] = {
+    "id": _field("id"),
+    "definition": _field("serviceDefinition", "serviceDefinition"),
+    "consumer": _field("consumerSystem", "systemName"),
+    "consumer_id": _field("consumerSystem", "id"),
+    "provider": _field("providerSystem", "systemName"),
+    "provider_id": _field("providerSystem", "id"),
+    "interface": _interfaces("interfaces"),
+}
+
+
+def parse_filter(expression: str) -> List[Clause]:
+    """
+    Parse a filter expression into its clauses.
+
+    An expression is one or more clauses joined by ``and``. A clause is a field,
+    an operator and a value, where the operator is ``=`` (equal), ``!=`` (not
+    equal), ``~`` (matches a glob pattern such as ``HTTP-SECURE-*``) or ``!~``
+    (does not match). Values containing spaces can be quoted.
+
+    Raises:
+        ValueError: If the expression is malformed.
+    """
+    try:
+        tokens = shlex.split(expression)
+    except ValueError as e:
+        raise ValueError(f"Malformed filter expression '{expression}': {e}")
+
+    clause_tokens: List[List[str]] = [[]]
+    for token in tokens:
+        if token.lower() == "and":
+            clause_tokens.append([])
+        else:
+            clause_tokens[-1].append(token)
+
+    clauses = []
+    for tokens in clause_tokens:
+        match = _CLAUSE_PATTERN.match(" ".join(tokens))
+        if match is None:
+            raise ValueError(
+                f"Malformed filter expression '{expression}', clauses must look "
+                f"like FIELD=VALUE, FIELD!=VALUE, FIELD~PATTERN or FIELD!~PATTERN."
+            )
+        clauses.append(Clause(*match.groups()))
+
+    return clauses
+
+
+def _compile_clause(
+    clause: Clause, fields: Dict[str, FieldAccessor]
+) -> Callable[[Dict], bool]:
+    if clause.field in fields:
+        accessor = fields[clause.field]
+    elif clause.field.startswith("meta.") and fields is SERVICE_FIELDS:
+        accessor = _metadata(clause.field[len("meta.") :])
+    else:
+        raise ValueError(
+            f"Unknown filter field '{clause.field}', "
+            f'available fields are {", ".join(fields)}'
+        )
+
+    value = clause.value
+    if clause.operator in {"~", "!~"}:
+        pattern = re.compile(translate(value))
+
+        def matches(record: Dict) -> bool:
+            return any(pattern.match(field_value) for field_value in accessor(record))
+
+    else:
+
+        def matches(record: Dict) -> bool:
+            return value in accessor(record)
+
+    if clause.operator.startswith("!"):
+        return lambda record: not matches(record)
+    return matches
+
+
+class RecordFilter:
+    """
+    Conjunction of filter clauses, compiled once into predicates.
+
+    Args:
+        clauses: The clauses, see :func:`parse_filter`.
+        fields: The fields of the record type, such as :data:`SERVICE_FIELDS`.
+
+    Raises:
+        ValueError: If a clause refers to an unknown field.
+    """
+
+    def __init__(self, clauses: Iterable[Clause], fields: Dict[str, FieldAccessor]):
+        self.clauses = list(clauses)
+        self.fields = fields
+        self._predicates = [_compile_clause(clause, fields) for clause in self.clauses]
+
+    @classmethod
+    def parse(
+        cls, expression: Optional[str], fields: Dict[str, FieldAccessor]
+    ) -> "RecordFilter":
+        """Compile a filter expression, an empty or missing expression matches all."""
+        return cls(parse_filter(expression) if expression else [], fields)
+
+    def __call__(self, record: Dict) -> bool:
+        return all(predicate(record) for predicate in self._predicates)
+
+    def __and__(self, other: "RecordFilter") -> "RecordFilter":
+        return RecordFilter(self.clauses + other.clauses, self.fields)
+
+    def __bool__(self) -> bool:
+        return bool(self.clauses)
+
+    def equality_value(self, field: str) -> Optional[str]:
+        """
+        Return the value the field must equal, if any clause requires that.
+
+        Used to push clauses down to the core systems.
+        """
+        for clause in self.clauses:
+            if clause.field == field and clause.operator == "=":
+                return clause.value
+        return None
+
+    def apply(self, records: Iterable[Dict]) -> Iterator[Dict]:
+        """Lazily yield the records matching the filter."""
+        if not self._predicates:
+            return iter(records)
+        return filter(self, records)
+
+
+def equality_filter(
+    fields: Dict[str, FieldAccessor], **values: Optional[object]
+) -> RecordFilter:
+    """
+    Filter requiring every field given as a keyword argument to equal its value.
+
+    Keyword arguments that are None are ignored.
+    """
+    return RecordFilter(
+        (
+            Clause(field, "=", str(value))
+            for field, value in values.items()
+            if value is not None
+        ),
+        fields,
+    )
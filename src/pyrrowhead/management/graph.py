@@ -0,0 +1,248 @@
+import heapq
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from rich import box
+from rich.table import Table, Column
+
+from pyrrowhead.management.client import ArrowheadClient
+
+ORCHESTRATION = "orchestration"
+AUTHORIZATION = "authorization"
+MAX_SHOWN_MEMBERS = 10
+
+
+class Dependent(NamedTuple):
+    system_id: int
+    distance: int
+
+
+class DependencyGraph:
+    """
+    Directed graph of which consumer systems depend on which provider systems.
+
+    A consumer depends on a provider if an orchestration store rule or an
+    authorization rule connects them. Rules with foreign providers are left out,
+    since the provider is not a system of the local cloud. The graph is stored as
+    adjacency lists in both directions, so all queries take time linear in the
+    number of systems and dependencies they visit.
+    """
+
+    def __init__(self):
+        self.systems: Dict[int, Dict] = {}
+        # consumer -> providers, and provider -> consumers
+        self.providers: Dict[int, Set[int]] = {}
+        self.consumers: Dict[int, Set[int]] = {}
+        # (consumer, provider) -> service definitions, and the kinds of rules
+        self.service_definitions: Dict[Tuple[int, int], Set[str]] = {}
+        self.sources: Dict[Tuple[int, int], Set[str]] = {}
+
+    @classmethod
+    def from_rules(
+        cls,
+        orchestration_rules: Iterable[Dict] = (),
+        authorization_rules: Iterable[Dict] = (),
+    ) -> "DependencyGraph":
+        graph = cls()
+        for rule in orchestration_rules:
+            if not rule.get("foreign"):
+                graph.add_rule(rule, ORCHESTRATION)
+        for rule in authorization_rules:
+            graph.add_rule(rule, AUTHORIZATION)
+        return graph
+
+    @classmethod
+    def from_client(cls, client: ArrowheadClient) -> "DependencyGraph":
+        """
+        Raises:
+            PyrrowheadError: If a core system responds with an error.
+        """
+        return cls.from_rules(
+            client.list_orchestration_rules(), client.list_authorization_rules()
+        )
+
+    def add_rule(self, rule: Dict, source: str):
+        consumer = rule["consumerSystem"]
+        provider = rule["providerSystem"]
+        for system in (consumer, provider):
+            if system["id"] not in self.systems:
+                self.systems[system["id"]] = system
+                self.providers[system["id"]] = set()
+                self.consumers[system["id"]] = set()
+        self.providers[consumer["id"]].add(provider["id"])
+        self.consumers[provider["id"]].add(consumer["id"])
+        edge = (consumer["id"], provider["id"])
+        self.service_definitions.setdefault(edge, set()).add(
+            rule["serviceDefinition"]["serviceDefinition"]
+        )
+        self.sources.setdefault(edge, set()).add(source)
+
+    def __len__(self) -> int:
+        return len(self.systems)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.service_definitions)
+
+    def impact(self, system_ids: Iterable[int]) -> List[Dependent]:
+        """
+        Find every system that directly or transitively depends on the given
+        systems, by breadth first search over the consumers.
+
+        Returns:
+            The dependent systems, with the number of dependencies between them and
+            the nearest of the given systems, nearest first.
+        """
+        distances: Dict[int, int] = {
+            system_id: 0 for system_id in system_ids if system_id in self.systems
+        }
+        queue = deque(distances)
+        dependents = []
+        while queue:
+            system_id = queue.popleft()
+            for consumer_id in self.consumers[system_id]:
+                if consumer_id not in distances:
+                    distances[consumer_id] = distances[system_id] + 1
+                    dependents.append(Dependent(consumer_id, distances[consumer_id]))
+                    queue.append(consumer_id)
+
+        return dependents
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """
+        Find the groups of systems that all transitively depend on each other.
+
+        Uses Tarjan's algorithm with an explicit stack, so deep dependency chains do
+        not hit the recursion limit.
+
+        Returns:
+            The groups with more than one system, or a system depending on itself,
+            each sorted by id, largest group first.
+        """
+        index: Dict[int, int] = {}
+        lowlink: Dict[int, int] = {}
+        on_stack: Set[int] = set()
+        stack: List[int] = []
+        components: List[List[int]] = []
+
+        for root in self.systems:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.providers[root]))]
+            while work:
+                system_id, providers = work[-1]
+                for provider_id in providers:
+                    if provider_id not in index:
+                        index[provider_id] = lowlink[provider_id] = len(index)
+                        stack.append(provider_id)
+                        on_stack.add(provider_id)
+                        work.append((provider_id, iter(self.providers[provider_id])))
+                        break
+                    if provider_id in on_stack:
+                        lowlink[system_id] = min(lowlink[system_id], index[provider_id])
+                else:
+                    work.pop()
+                    if work:
+                        parent_id = work[-1][0]
+                        lowlink[parent_id] = min(lowlink[parent_id], lowlink[system_id])
+                    if lowlink[system_id] == index[system_id]:
+                        component = []
+                        while True:
+                            member_id = stack.pop()
+                            on_stack.discard(member_id)
+                            component.append(member_id)
+                            if member_id == system_id:
+                                break
+                        if len(component) > 1 or system_id in self.providers[system_id]:
+                            components.append(sorted(component))
+
+        return sorted(components, key=lambda component: (-len(component), component))
+
+    def hot_spots(self, limit: int = 10) -> List[Tuple[int, int]]:
+        """
+        Return the ``limit`` systems with the most direct consumers, as pairs of
+        system id and number of consumers, most consumers first.
+        """
+        return heapq.nlargest(
+            limit,
+            (
+                (system_id, len(consumers))
+                for system_id, consumers in self.consumers.items()
+                if consumers
+            ),
+            key=lambda hot_spot: (hot_spot[1], -hot_spot[0]),
+        )
+
+    def system_label(self, system_id: int) -> str:
+        system = self.systems.get(system_id)
+        name = system["systemName"] if system else "unknown"
+        return f"{name} (id: {system_id})"
+
+
+def create_impact_table(
+    graph: DependencyGraph, removed_ids: Iterable[int], dependents: List[Dependent]
+) -> Table:
+    table = Table(
+        Column(header="id", style="red"),
+        Column(header="System name", style="blue"),
+        Column(header="Distance", style="bright_white"),
+        Column(header="Depends on", style="bright_blue"),
+        title="Affected systems",
+        box=box.SIMPLE,
+    )
+    distances = {system_id: 0 for system_id in removed_ids}
+    distances.update(dependents)
+    for dependent in dependents:
+        # The providers one step closer to the removed systems
+        nearer_providers = sorted(
+            provider_id
+            for provider_id in graph.providers[dependent.system_id]
+            if distances.get(provider_id) == dependent.distance - 1
+        )
+        table.add_row(
+            str(dependent.system_id),
+            graph.systems[dependent.system_id]["systemName"],
+            str(dependent.distance),
+            ", ".join(map(graph.system_label, nearer_providers)),
+        )
+
+    return table
+
+
+def create_hot_spot_table(graph: DependencyGraph, limit: int) -> Table:
+    table = Table(
+        Column(header="id", style="red"),
+        Column(header="System name", style="blue"),
+        Column(header="Consumers", style="bright_white"),
+        Column(header="Affected by removal", style="bright_white"),
+        title="Hot spots",
+        box=box.SIMPLE,
+    )
+    for system_id, consumer_count in graph.hot_spots(limit):
+        table.add_row(
+            str(system_id),
+            graph.systems[system_id]["systemName"],
+            str(consumer_count),
+            str(len(graph.impact([system_id]))),
+        )
+
+    return table
+
+
+def create_component_table(graph: DependencyGraph) -> Table:
+    table = Table(
+        Column(header="Systems", style="bright_white"),
+        Column(header="Members", style="blue"),
+        title="Dependency cycles",
+        box=box.SIMPLE,
+    )
+    for component in graph.strongly_connected_components():
+        members = ", ".join(map(graph.system_label, component[:MAX_SHOWN_MEMBERS]))
+        if len(component) > MAX_SHOWN_MEMBERS:
+            members += f" and {len(component) - MAX_SHOWN_MEMBERS} more"
+        table.add_row(str(len(component)), members)
+
+    return table
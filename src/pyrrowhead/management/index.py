@@ -0,0 +1,227 @@
+from typing import Dict, Iterable, List, Tuple, Union, Set, Iterator
+
+from pyrrowhead.utils import PyrrowheadError
+
+SYSTEM_NOT_FOUND = -1
+SYSTEM_AMBIGUOUS = -2
+
+SystemKey = Tuple[str, str, int]
+
+
+class SystemIndex:
+    """
+    Index of registered systems by name and by name, address and port.
+
+    The index is built from one listing of the systems, after which every lookup
+    takes constant time.
+
+    Args:
+        systems: System records as returned by the service registry.
+    """
+
+    def __init__(self, systems: Iterable[Dict]):
+        self.by_name: Dict[str, List[Dict]] = {}
+        self.by_key: Dict[SystemKey, Dict] = {}
+        for system in systems:
+            self.by_name.setdefault(system["systemName"], []).append(system)
+            key = (system["systemName"], system["address"], system["port"])
+            self.by_key[key] = system
+
+    def __len__(self) -> int:
+        return len(self.by_key)
+
+    def lookup(self, system_name: str, address: str = "", port: int = -1) -> int:
+        """
+        Find the id of a system.
+
+        If address and port are not given, the system name alone must identify the
+        system.
+
+        Returns:
+            The system id, ``SYSTEM_NOT_FOUND`` (-1) if there is no such system, or
+            ``SYSTEM_AMBIGUOUS`` (-2) if several systems have the name.
+        """
+        if len(address) > 0 and port >= 0:
+            system = self.by_key.get((system_name, address, port))
+            return SYSTEM_NOT_FOUND if system is None else system["id"]
+
+        candidate_systems = self.by_name.get(system_name, [])
+        if len(candidate_systems) == 0:
+            return SYSTEM_NOT_FOUND
+        elif len(candidate_systems) > 1:
+            return SYSTEM_AMBIGUOUS
+
+        return candidate_systems[0]["id"]
+
+    def lookup_many(self, systems: Iterable[Union[str, SystemKey]]) -> List[int]:
+        """
+        Find the ids of many systems, given either as names or as (name, address,
+        port) tuples, with the same return values as :meth:`lookup`.
+        """
+        return [
+            self.lookup(system) if isinstance(system, str) else self.lookup(*system)
+            for system in systems
+        ]
+
+
+class ServiceIndex:
+    """
+    Index of the registered services, used to find the ids needed by
+    authorization rules.
+
+    The index is built from one grouped services response, after which every lookup
+    takes constant time.
+
+    Args:
+        grouped_services: Response data of the grouped services endpoint of the
+          service registry.
+    """
+
+    def __init__(self, grouped_services: Dict):
+        # service definition -> provider -> (definition id, provider id, interfaces)
+        self.services: Dict[str, Dict[SystemKey, Tuple[int, int, Dict[str, int]]]] = {}
+        # Ids of the service definitions and interfaces of any provider
+        self.definition_ids: Dict[str, int] = {}
+        self.interface_ids: Dict[str, int] = {}
+        for service_definition_entry in grouped_services.get(
+            "servicesGroupedByServiceDefinition", []
+        ):
+            service_definition = service_definition_entry["serviceDefinition"]
+            providers = self.services.setdefault(service_definition, {})
+            for service in service_definition_entry["providerServices"]:
+                provider = service["provider"]
+                key = (provider["systemName"], provider["address"], provider["port"])
+                definition_id = service["serviceDefinition"]["id"]
+                interfaces = {
+                    interface["interfaceName"]: interface["id"]
+                    for interface in service["interfaces"]
+                }
+                self.definition_ids[service_definition] = definition_id
+                self.interface_ids.update(interfaces)
+                if key in providers:
+                    interfaces = {**providers[key][2], **interfaces}
+                providers[key] = (definition_id, provider["id"], interfaces)
+
+    def lookup(
+        self,
+        service_definition: str,
+        interface_name: str,
+        provider_name: str,
+        address: str,
+        port: int,
+    ) -> Tuple[int, int, int]:
+        """
+        Returns:
+            Tuple of service definition id, interface id, and provider id
+
+        Raises:
+            PyrrowheadError: If no matching service is registered.
+        """
+        providers = self.services.get(service_definition)
+        if providers is None:
+            raise PyrrowheadError(
+                f"Could not find any services with service definition "
+                f"{service_definition}."
+            )
+        try:
+            service_definition_id, provider_id, interfaces = providers[
+                (provider_name, address, port)
+            ]
+        except KeyError:
+            raise PyrrowheadError(
+                f"Could not find provider {provider_name}@{address}:{port} "
+                f"for any service with service definition "
+                f"{service_definition}."
+            )
+        try:
+            interface_id = interfaces[interface_name]
+        except KeyError:
+            raise PyrrowheadError(
+                f"Could not find interface {interface_name} for service "
+                f"{service_definition} in provider {provider_name}@{address}:{port}, "
+                f'available interfaces are {", ".join(interfaces)}'
+            )
+
+        return service_definition_id, interface_id, provider_id
+
+
+SEARCH_FIELDS = {"definition", "interface", "provider"}
+
+
+def parse_search_term(term: str) -> Tuple[str, ...]:
+    """
+    Parse a service search term into an index key.
+
+    ``definition=NAME``, ``interface=NAME`` and ``provider=NAME`` match the service
+    definition, an interface and the provider system name. Any other ``KEY=VALUE``
+    matches metadata, as does ``meta.KEY=VALUE`` for metadata keys named like the
+    fields above, and a bare ``KEY`` or ``meta.KEY`` matches services having the
+    metadata key.
+
+    Raises:
+        ValueError: If the term is empty.
+    """
+    field, sep, value = term.partition("=")
+    if not field:
+        raise ValueError(f"Invalid search term '{term}'")
+    if field in SEARCH_FIELDS and sep:
+        return (field, value)
+    if field.startswith("meta."):
+        field = field[len("meta.") :]
+    return ("meta", field, value) if sep else ("key", field)
+
+
+class ServiceSearchIndex:
+    """
+    Inverted index over service definitions, interfaces, provider names and
+    metadata of the registered services.
+
+    Each index key maps to the set of positions of the services having it, so a
+    conjunctive query is answered by intersecting the sets of its terms, smallest
+    first, without looking at any service that does not match.
+
+    Args:
+        services: Service records as returned by the service registry.
+    """
+
+    def __init__(self, services: Iterable[Dict]):
+        self.services: List[Dict] = []
+        self.postings: Dict[Tuple[str, ...], Set[int]] = {}
+        for position, service in enumerate(services):
+            self.services.append(service)
+            for key in self._index_keys(service):
+                self.postings.setdefault(key, set()).add(position)
+
+    @staticmethod
+    def _index_keys(service: Dict) -> Iterator[Tuple[str, ...]]:
+        yield ("definition", service["serviceDefinition"]["serviceDefinition"])
+        yield ("provider", service["provider"]["systemName"])
+        for interface in service["interfaces"]:
+            yield ("interface", interface["interfaceName"])
+        for key, value in (service.get("metadata") or {}).items():
+            yield ("key", key)
+            yield ("meta", key, str(value))
+
+    def search(self, terms: Iterable[str]) -> List[Dict]:
+        """
+        Find the services matching all search terms, see :func:`parse_search_term`.
+
+        Returns:
+            The matching services, sorted by id.
+
+        Raises:
+            ValueError: If a search term is invalid.
+        """
+        postings = sorted(
+            (self.postings.get(parse_search_term(term), set()) for term in terms),
+            key=len,
+        )
+        if not postings:
+            return []
+
+        positions = postings[0].intersection(*postings[1:])
+
+        return sorted(
+            (self.services[position] for position in positions),
+            key=lambda service: service["id"],
+        )
@@ -0,0 +1,150 @@
+import json
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from rich.syntax import Syntax
+from rich.table import Table, Column
+
+from pyrrowhead import rich_console
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead.management.utils import map_concurrently
+from pyrrowhead.utils import PyrrowheadError, get_config
+
+
+class CloudResult(NamedTuple):
+    cloud: str
+    records: List
+    error: Optional[str] = None
+
+
+def select_clouds(
+    cloud_identifiers: Sequence[str], all_clouds: bool = False
+) -> Dict[str, Path]:
+    """
+    Return the directories of the given local clouds, or of all local clouds.
+
+    Args:
+        cloud_identifiers: Identifiers of the form ``CLOUD_NAME.ORG_NAME``.
+        all_clouds: If True, all local clouds in the pyrrowhead config are selected.
+
+    Raises:
+        PyrrowheadError: If a cloud identifier is not a local cloud, or there are
+          no local clouds.
+    """
+    local_clouds = get_config()["local-clouds"]
+    if all_clouds:
+        if not local_clouds:
+            raise PyrrowheadError("There are no local clouds.")
+        return {
+            identifier: Path(local_clouds[identifier]) for identifier in local_clouds
+        }
+
+    unknown = [
+        identifier for identifier in cloud_identifiers if identifier not in local_clouds
+    ]
+    if unknown:
+        raise PyrrowheadError(f'Unknown local cloud: {", ".join(unknown)}')
+    return {
+        identifier: Path(local_clouds[identifier])
+        for identifier in dict.fromkeys(cloud_identifiers)
+    }
+
+
+def fan_out(
+    query: Callable[[ArrowheadClient], Iterable],
+    clouds: Dict[str, Path],
+    concurrency: Optional[int] = None,
+) -> List[CloudResult]:
+    """
+    Run a query against the core systems of several local clouds concurrently.
+
+    ``query`` is called with a client of each cloud, and the records it returns are
+    collected into one result per cloud, in the order of ``clouds``. A cloud that
+    can not be queried gets a result with an error message instead of failing the
+    other clouds.
+
+    Raises:
+        ValueError: If the query raises it, such as for an invalid filter expression,
+          since that fails in every cloud.
+    """
+
+    def query_cloud(cloud: str) -> CloudResult:
+        try:
+            return CloudResult(cloud, list(query(ArrowheadClient(clouds[cloud]))))
+        except (PyrrowheadError, OSError, KeyError) as e:
+            return CloudResult(cloud, [], str(e) or repr(e))
+
+    return list(
+        map_concurrently(query_cloud, clouds, concurrency or max(1, len(clouds)))
+    )
+
+
+def merge_tables(tables: Dict[str, Table]) -> Table:
+    """
+    Merge tables with the same columns into one table with a cloud column first.
+
+    The title and box of the merged table are taken from the first table.
+    """
+    first_table = next(iter(tables.values()))
+    merged_table = Table(
+        Column(header="Cloud", style="magenta"),
+        title=first_table.title,
+        box=first_table.box,
+    )
+    for column in first_table.columns:
+        merged_table.add_column(header=column.header, style=column.style)
+
+    for cloud, table in tables.items():
+        for row in zip(*(column.cells for column in table.columns)):
+            merged_table.add_row(cloud, *row)
+
+    return merged_table
+
+
+def create_multicloud_table(
+    results: Iterable[CloudResult], create_table: Callable[[List], Table]
+) -> Table:
+    """Create a table of the records of every cloud, using the single cloud table."""
+    return merge_tables(
+        {result.cloud: create_table(result.records) for result in results}
+    )
+
+
+def print_cloud_results(
+    results: List[CloudResult],
+    create_table: Callable[[List], Table],
+    raw_output: bool = False,
+    indent: Optional[int] = None,
+) -> bool:
+    """
+    Print the records of every cloud as one table, or as json keyed by cloud, and
+    then the errors of the clouds that could not be queried.
+
+    Returns:
+        True if every cloud was queried successfully.
+    """
+    if raw_output:
+        rich_console.print(
+            Syntax(
+                json.dumps(
+                    {
+                        result.cloud: {
+                            "data": result.records,
+                            "count": len(result.records),
+                        }
+                        for result in results
+                        if result.error is None
+                    },
+                    indent=indent,
+                ),
+                "json",
+            )
+        )
+    else:
+        rich_console.print(create_multicloud_table(results, create_table))
+
+    for result in results:
+        if result.error is not None:
+            rich_console.print(f"[red]{result.cloud}[/red]: {result.error}")
+
+    return all(result.error is None for result in results)
@@ -1,18 +1,15 @@
-import json
 from enum import Enum
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, Iterator, Iterable
 
-import typer
 from rich import box
 from rich.table import Table, Column
 
-from pyrrowhead import rich_console
-from pyrrowhead.management.serviceregistry import grouped_services
-from pyrrowhead.management.utils import get_service, post_service, delete_service
-from pyrrowhead.management.authorization import add_authorization_rule
-from pyrrowhead.utils import (
-    get_core_system_address_and_port,
-    get_active_cloud_directory,
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead.management.bulk import BulkResult
+from pyrrowhead.management.filters import (
+    RecordFilter,
+    equality_filter,
+    ORCHESTRATION_FIELDS,
 )
 
 
@@ -42,47 +39,9 @@ def get_ids_from_service_definition(
     Returns:
         Tuple of service definition id, interface id, and provider id
     """
-    response_data, status = grouped_services()
-
-    services_by_definition = response_data.get("servicesGroupedByServiceDefinition")
-    for service_definition_entry in services_by_definition:
-        if service_definition_entry["serviceDefinition"] == service_definition:
-            for service in service_definition_entry["providerServices"]:
-                if (
-                    service["provider"]["systemName"] == provider_name
-                    and service["provider"]["address"] == address
-                    and service["provider"]["port"] == port
-                ):
-                    correct_service = service
-                    break
-            else:
-                rich_console.print(
-                    f"Could not find provider {provider_name}@{address}:{port} for "
-                    f"any service with service definition {service_definition}."
-                )
-                raise typer.Exit()
-            break
-    else:
-        rich_console.print(
-            f"Could not find any services with service definition {service_definition}."
-        )
-        raise typer.Exit()
-    service_definition_id = correct_service["serviceDefinition"]["id"]
-    provider_id = correct_service["provider"]["id"]
-    interfaces = correct_service["interfaces"]
-    for interface in interfaces:
-        if interface["interfaceName"] == interface_name:
-            interface_id = interface["id"]
-            break
-    else:
-        rich_console.print(
-            f"Could not find interface {interface_name} for service "
-            f"{service_definition} in provider {provider_name}@{address}:{port}, "
-            f"available interfaces are "
-            f'{", ".join(interface["interfaceName"] for interface in interfaces)}'
-        )
-        raise typer.Exit()
-    return service_definition_id, interface_id, provider_id
+    return ArrowheadClient().get_ids_from_service_definition(
+        service_definition, interface_name, provider_name, address, port
+    )
 
 
 def table_sort(rule, choice):
@@ -100,31 +59,25 @@ def table_sort(rule, choice):
         raise RuntimeError(f"Invalid sorting choice: {choice}")
 
 
-def table_condition(
-    orch_rule: Dict,
+def orchestration_filter(
     service_definition: Optional[str],
     consumer_id: Optional[int],
     consumer_name: Optional[str],
     provider_id: Optional[int],
     provider_name: Optional[str],
-):
-    if service_definition is not None:
-        return orch_rule["serviceDefinition"]["serviceDefinition"] == service_definition
-    elif consumer_id is not None:
-        breakpoint()
-        return orch_rule["consumerSystem"]["id"] == consumer_id
-    elif consumer_name is not None:
-        return orch_rule["consumerSystem"]["systemName"] == consumer_name
-    elif provider_id is not None:
-        return orch_rule["providerSystem"]["id"] == provider_id
-    elif provider_name is not None:
-        return orch_rule["providerSystem"]["systemName"] == provider_name
-    else:
-        return True
+) -> RecordFilter:
+    return equality_filter(
+        ORCHESTRATION_FIELDS,
+        definition=service_definition,
+        consumer_id=consumer_id,
+        consumer=consumer_name,
+        provider_id=provider_id,
+        provider=provider_name,
+    )
 
 
 def create_orchestration_table(
-    response_data: Dict,
+    orchestration_rules: Iterable[Dict],
     service_definition: Optional[str],
     consumer_id: Optional[int],
     consumer_name: Optional[str],
@@ -146,18 +99,14 @@ def create_orchestration_table(
         box=box.HORIZONTALS,
     )
 
-    for orch_rule in sorted(
-        response_data["data"], key=lambda x: table_sort(x, sort_by)
-    ):
-        if not table_condition(
-            orch_rule,
-            service_definition,
-            consumer_id,
-            consumer_name,
-            provider_id,
-            provider_name,
-        ):
-            continue
+    record_filter = orchestration_filter(
+        service_definition, consumer_id, consumer_name, provider_id, provider_name
+    )
+    # Filter while streaming so that only the matching rules are held and sorted
+    matching_rules = sorted(
+        record_filter.apply(orchestration_rules), key=lambda x: table_sort(x, sort_by)
+    )
+    for orch_rule in matching_rules:
         table.add_row(
             str(orch_rule["id"]),
             f'{orch_rule["consumerSystem"]["systemName"]}',
@@ -174,18 +123,69 @@ def create_orchestration_table(
     return table
 
 
-def list_orchestration_rules():
-    active_cloud_directory = get_active_cloud_directory()
-    address, port, secure, scheme = get_core_system_address_and_port(
-        "orchestrator",
-        active_cloud_directory,
-    )
-    scheme = "https" if secure else "http"
-    response = get_service(
-        f"{scheme}://{address}:{port}/orchestrator/mgmt/store",
-        active_cloud_directory,
+def _merge_added_chunks(results: Iterable[BulkResult]) -> Iterator[BulkResult]:
+    """Merge consecutive successful results of the same chunk into one result."""
+    merged: Optional[BulkResult] = None
+    for result in results:
+        if (
+            merged is not None
+            and result.ok
+            and result.item.chunk_index == merged.item.chunk_index
+        ):
+            merged_chunk = merged.item._replace(
+                rules=merged.item.rules + result.item.rules
+            )
+            merged = merged._replace(item=merged_chunk)
+            continue
+        if merged is not None:
+            yield merged
+            merged = None
+        if result.ok:
+            merged = result
+        else:
+            yield result
+    if merged is not None:
+        yield merged
+
+
+def create_import_table(results: Iterable[BulkResult]) -> Table:
+    import_table = Table(
+        Column(header="Chunk", style="bright_white"),
+        Column(header="Rules", style="bright_white"),
+        Column(header="Result"),
+        title="Orchestration rule import",
+        box=box.SIMPLE,
     )
-    return response.json(), response.status_code
+
+    for result in _merge_added_chunks(results):
+        chunk = result.item
+        last_rule = chunk.first_rule + len(chunk.rules) - 1
+        rules = (
+            str(chunk.first_rule)
+            if len(chunk.rules) == 1
+            else f"{chunk.first_rule}-{last_rule}"
+        )
+        if result.ok:
+            outcome = f"[green]Added[/green] ({len(chunk.rules)} rules)"
+        else:
+            outcome = (
+                f"[red]Failed[/red] "
+                f'{result.response_data.get("errorMessage", "")} ({result.status})'
+            )
+        import_table.add_row(str(chunk.chunk_index), rules, outcome)
+
+    return import_table
+
+
+def list_orchestration_rules(filter_expression: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Yield the orchestration store rules, fetched page by page.
+
+    Raises:
+        ValueError: If the filter expression is invalid.
+        PyrrowheadError: If the orchestrator responds with an error.
+    """
+    return ArrowheadClient().list_orchestration_rules(filter_expression)
 
 
 def add_orchestration_rule(
@@ -197,77 +197,16 @@ def add_orchestration_rule(
     metadata: Optional[int] = None,
     add_auth_rule: Optional[bool] = None,
 ):
-    active_cloud_directory = get_active_cloud_directory()
-    address, port, secure, scheme = get_core_system_address_and_port(
-        "orchestrator",
-        active_cloud_directory,
-    )
-    # cloud_name = active_cloud_directory.name
-    # org_name = active_cloud_directory.parents[0].name
-
-    orchestration_input = [
-        {
-            "serviceDefinitionName": service_definition,
-            "serviceInterfaceName": service_interface,
-            "consumerSystemId": consumer_id,
-            "providerSystem": dict(
-                zip(("systemName", "address", "port"), provider_system)
-            ),
-            # "cloud": {"operator": org_name, "name": OPT_CLOUD_NAME, "secure": secure},
-            "priority": priority,
-            "attribute": metadata,
-        }
-    ]
-
-    import pprint
-
-    pprint.pprint(orchestration_input)
-    response = post_service(
-        f"{scheme}://{address}:{port}/orchestrator/mgmt/store",
-        active_cloud_directory,
-        json=orchestration_input,
+    return ArrowheadClient().add_orchestration_rule(
+        service_definition=service_definition,
+        service_interface=service_interface,
+        provider_system=provider_system,
+        consumer_id=consumer_id,
+        priority=priority,
+        metadata=metadata,
+        add_auth_rule=add_auth_rule,
     )
 
-    if add_auth_rule:
-        (
-            service_definition_id,
-            interface_id,
-            provider_id,
-        ) = get_ids_from_service_definition(
-            service_definition, service_interface, *provider_system
-        )
-        add_authorization_rule(
-            consumer_id,  # type: ignore
-            provider_id,
-            interface_id,
-            service_definition_id
-            # TODO: mypy complains here, remove ignore and fix later
-        )
-
-    try:
-        response_data = response.json()
-    except json.JSONDecodeError:
-        response_data = {"errorMessage": "Error decoding json."}
-
-    return response_data, response.status_code
-
 
 def remove_orchestration_rule(orchestration_id):
-    active_cloud_directory = get_active_cloud_directory()
-    address, port, secure, scheme = get_core_system_address_and_port(
-        "orchestrator",
-        active_cloud_directory,
-    )
-    response = delete_service(
-        f"{scheme}://{address}:{port}/orchestrator/mgmt/store/{orchestration_id}",
-        active_cloud_directory,
-    )
-
-    try:
-        response_data = response.json()
-    except json.JSONDecodeError:
-        response_data = {
-            "errorMessage": "Could not decode orchestration "
-            "response with status code {response.status_code"
-        }
-    return response_data, response.status_code
+    return ArrowheadClient().remove_orchestration_rule(orchestration_id)
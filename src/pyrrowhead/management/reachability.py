@@ -0,0 +1,219 @@
+import csv
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from rich import box
+from rich.table import Table, Column
+
+from pyrrowhead.utils import PyrrowheadError
+
+
+class ReachabilityMatrix:
+    """
+    Consumer × provider × service definition reachability of the intracloud
+    authorization rules.
+
+    The matrix is sparse, and stored in coordinate format as one array of consumer,
+    provider and service definition indices per reachable triple. Rules are encoded
+    into the arrays in a single pass, after which every query is a vectorized
+    operation over the arrays instead of a loop over the rules. Interfaces are not
+    part of the matrix, a consumer reaches a provider and service definition if it
+    is authorized for any interface.
+
+    Requires numpy, which is installed with ``pip install pyrrowhead[matrix]``.
+
+    Args:
+        consumer_ids: System id of each consumer index.
+        provider_ids: System id of each provider index.
+        definitions: Service definition of each service definition index.
+        coordinates: Array of shape (3, number of reachable triples) with the
+          consumer, provider and service definition indices of each triple.
+        system_names: System names by system id.
+    """
+
+    def __init__(
+        self,
+        consumer_ids: np.ndarray,
+        provider_ids: np.ndarray,
+        definitions: np.ndarray,
+        coordinates: np.ndarray,
+        system_names: Dict[int, str],
+    ):
+        self.consumer_ids = consumer_ids
+        self.provider_ids = provider_ids
+        self.definitions = definitions
+        self.coordinates = coordinates
+        self.system_names = system_names
+
+    @classmethod
+    def from_rules(cls, authorization_rules: Iterable[Dict]) -> "ReachabilityMatrix":
+        consumers: Dict[int, int] = {}
+        providers: Dict[int, int] = {}
+        definitions: Dict[str, int] = {}
+        system_names: Dict[int, str] = {}
+        codes: List[int] = []
+        for rule in authorization_rules:
+            consumer = rule["consumerSystem"]
+            provider = rule["providerSystem"]
+            system_names[consumer["id"]] = consumer["systemName"]
+            system_names[provider["id"]] = provider["systemName"]
+            codes.append(consumers.setdefault(consumer["id"], len(consumers)))
+            codes.append(providers.setdefault(provider["id"], len(providers)))
+            codes.append(
+                definitions.setdefault(
+                    rule["serviceDefinition"]["serviceDefinition"], len(definitions)
+                )
+            )
+
+        coordinates = np.array(codes, dtype=np.int64).reshape(-1, 3).T
+        if coordinates.shape[1] > 0:
+            # Rules differing only in interface give the same triple, keep it once
+            coordinates = np.unique(coordinates, axis=1)
+        return cls(
+            np.fromiter(consumers, dtype=np.int64, count=len(consumers)),
+            np.fromiter(providers, dtype=np.int64, count=len(providers)),
+            np.array(list(definitions), dtype=object),
+            coordinates,
+            system_names,
+        )
+
+    @property
+    def shape(self):
+        return len(self.consumer_ids), len(self.provider_ids), len(self.definitions)
+
+    def __len__(self) -> int:
+        """Number of reachable consumer, provider and service definition triples."""
+        return self.coordinates.shape[1]
+
+    def dense(self) -> np.ndarray:
+        """The matrix as a boolean array of shape :attr:`shape`."""
+        matrix = np.zeros(self.shape, dtype=bool)
+        matrix[tuple(self.coordinates)] = True
+        return matrix
+
+    def _index(self, ids: np.ndarray, system_id: int, role: str) -> int:
+        (positions,) = np.nonzero(ids == system_id)
+        if len(positions) == 0:
+            raise PyrrowheadError(
+                f"System {system_id} is not the {role} of any authorization rule."
+            )
+        return int(positions[0])
+
+    def _definition_mask(self, service_definition: Optional[str]) -> np.ndarray:
+        if service_definition is None:
+            return np.ones(len(self), dtype=bool)
+        (positions,) = np.nonzero(self.definitions == service_definition)
+        if len(positions) == 0:
+            return np.zeros(len(self), dtype=bool)
+        return self.coordinates[2] == positions[0]
+
+    def consumers_of(
+        self, provider_id: int, service_definition: Optional[str] = None
+    ) -> List[int]:
+        """Ids of the consumers that can reach a provider, sorted."""
+        provider = self._index(self.provider_ids, provider_id, "provider")
+        mask = (self.coordinates[1] == provider) & self._definition_mask(
+            service_definition
+        )
+        return sorted(self.consumer_ids[np.unique(self.coordinates[0][mask])].tolist())
+
+    def providers_for(
+        self, consumer_id: int, service_definition: Optional[str] = None
+    ) -> List[int]:
+        """Ids of the providers a consumer can reach, sorted."""
+        consumer = self._index(self.consumer_ids, consumer_id, "consumer")
+        mask = (self.coordinates[0] == consumer) & self._definition_mask(
+            service_definition
+        )
+        return sorted(self.provider_ids[np.unique(self.coordinates[1][mask])].tolist())
+
+    def missing_definitions(self, consumer_id: int) -> List[str]:
+        """Service definitions the consumer can not reach at any provider, sorted."""
+        consumer = self._index(self.consumer_ids, consumer_id, "consumer")
+        reached = self.coordinates[2][self.coordinates[0] == consumer]
+        missing = np.setdiff1d(np.arange(len(self.definitions)), reached)
+        return sorted(self.definitions[missing].tolist())
+
+    def pair_counts(self) -> np.ndarray:
+        """
+        Number of reachable service definitions of every consumer and provider, as an
+        integer array of shape (consumers, providers) for heat maps.
+        """
+        n_consumers, n_providers, _ = self.shape
+        flat_pairs = self.coordinates[0] * n_providers + self.coordinates[1]
+        return np.bincount(flat_pairs, minlength=n_consumers * n_providers).reshape(
+            n_consumers, n_providers
+        )
+
+    def export(self, path: Path):
+        """
+        Export the matrix.
+
+        ``.npz`` files get the sparse matrix arrays, any other file gets the
+        consumer × provider counts of :meth:`pair_counts` as CSV, with consumers as
+        rows and providers as columns.
+        """
+        path = Path(path)
+        if path.suffix == ".npz":
+            np.savez_compressed(
+                path,
+                consumer_ids=self.consumer_ids,
+                provider_ids=self.provider_ids,
+                definitions=self.definitions.astype(str),
+                coordinates=self.coordinates,
+            )
+            return
+
+        counts = self.pair_counts()
+        with open(path, "w", newline="") as csv_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(
+                [""]
+                + [
+                    f"{self.system_names[provider_id]} ({provider_id})"
+                    for provider_id in self.provider_ids.tolist()
+                ]
+            )
+            for consumer_id, row in zip(self.consumer_ids.tolist(), counts.tolist()):
+                writer.writerow(
+                    [f"{self.system_names[consumer_id]} ({consumer_id})"] + row
+                )
+
+
+def create_systems_table(
+    title: str, system_ids: Iterable[int], system_names: Dict[int, str]
+) -> Table:
+    table = Table(
+        Column(header="id", style="red"),
+        Column(header="System name", style="blue"),
+        title=title,
+        box=box.SIMPLE,
+    )
+    for system_id in system_ids:
+        table.add_row(str(system_id), system_names[system_id])
+
+    return table
+
+
+def create_summary_table(matrix: ReachabilityMatrix) -> Table:
+    n_consumers, n_providers, n_definitions = matrix.shape
+    size = n_consumers * n_providers * n_definitions
+    table = Table(
+        Column(header="Consumers", style="bright_blue"),
+        Column(header="Providers", style="blue"),
+        Column(header="Service definitions", style="green"),
+        Column(header="Reachable", style="bright_white"),
+        Column(header="Density", style="bright_white"),
+        title="Authorization reachability",
+        box=box.SIMPLE,
+    )
+    table.add_row(
+        str(n_consumers),
+        str(n_providers),
+        str(n_definitions),
+        str(len(matrix)),
+        f"{100 * len(matrix) / size:.3g}%" if size else "-",
+    )
+
+    return table
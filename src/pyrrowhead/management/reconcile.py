@@ -0,0 +1,656 @@
+import json
+from functools import partial
+from pathlib import Path
+from typing import Collection, Dict, List, NamedTuple, Optional, Tuple, Callable, Set
+
+import yaml
+import yamlloader  # type: ignore
+from rich import box
+from rich.table import Table, Column
+
+from pyrrowhead.management.bulk import (
+    AuthorizationRule,
+    BulkResult,
+    OrchestrationRule,
+    ServiceRegistration,
+    DEFAULT_CHUNK_SIZE,
+    get_field,
+    get_int_field,
+    run_bulk_item,
+    validate_orchestration_rule,
+    validate_records,
+    validate_service_registration,
+)
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead.management.index import SystemKey
+from pyrrowhead.management.utils import DEFAULT_CONCURRENCY, map_concurrently
+from pyrrowhead.utils import PyrrowheadError
+
+KINDS = ("system", "service", "orchestration", "authorization")
+# Desired state file section of each kind
+SECTIONS = {
+    "system": "systems",
+    "service": "services",
+    "orchestration": "orchestration",
+    "authorization": "authorization",
+}
+
+ADD = "add"
+UPDATE = "update"
+REMOVE = "remove"
+
+# kind -> identity -> content, every identity and content is a hashable tuple
+State = Dict[str, Dict[Tuple, Tuple]]
+
+
+class AuthorizationGrant(NamedTuple):
+    consumer: Tuple[str, str, int]
+    provider: SystemKey
+    service_definition: str
+    interface: str
+
+
+class DesiredState(NamedTuple):
+    systems: List[SystemKey]
+    services: List[ServiceRegistration]
+    orchestration_rules: List[OrchestrationRule]
+    authorization_grants: List[AuthorizationGrant]
+    # The kinds with a section in the file
+    kinds: Set[str]
+
+
+class Change(NamedTuple):
+    action: str
+    kind: str
+    identity: Tuple
+    content: Optional[Tuple]
+    current_content: Optional[Tuple]
+    record_id: Optional[int]
+
+
+def validate_system(record: Dict) -> SystemKey:
+    """
+    Create a system from a desired state record with the fields ``system_name``,
+    ``address`` and ``port``.
+
+    Raises:
+        ValueError: If the record is invalid.
+    """
+    return (
+        get_field(record, "system_name"),
+        get_field(record, "address"),
+        get_int_field(record, "port"),
+    )
+
+
+def validate_authorization_grant(record: Dict) -> AuthorizationGrant:
+    """
+    Create an authorization grant from a desired state record.
+
+    Records have the fields ``consumer_name``, ``provider_name``,
+    ``provider_address``, ``provider_port``, ``service_definition`` and
+    ``interface``, and optionally ``consumer_address`` and ``consumer_port``.
+
+    Raises:
+        ValueError: If the record is invalid.
+    """
+    return AuthorizationGrant(
+        consumer=(
+            get_field(record, "consumer_name"),
+            record.get("consumer_address") or "",
+            get_int_field(record, "consumer_port", -1),
+        ),
+        provider=(
+            get_field(record, "provider_name"),
+            get_field(record, "provider_address"),
+            get_int_field(record, "provider_port"),
+        ),
+        service_definition=get_field(record, "service_definition"),
+        interface=get_field(record, "interface"),
+    )
+
+
+def load_desired_state(state_path: Path) -> DesiredState:
+    """
+    Load and validate a desired state file.
+
+    The file is a YAML or JSON mapping with the optional sections ``systems``,
+    ``services``, ``orchestration`` and ``authorization``. Services and
+    orchestration rules have the same fields as in the import manifests, and
+    authorization rules are given by names, see
+    :func:`validate_authorization_grant`.
+
+    Raises:
+        PyrrowheadError: If the file cannot be read or contains invalid records.
+    """
+    try:
+        with open(state_path, "r") as state_file:
+            # Large generated files are parsed much faster as JSON
+            if state_path.suffix.lower() == ".json":
+                sections = json.load(state_file)
+            else:
+                sections = yaml.load(
+                    state_file, Loader=yamlloader.ordereddict.CSafeLoader
+                )
+    except (OSError, ValueError, yaml.YAMLError) as e:
+        raise PyrrowheadError(f"Could not read desired state {state_path}: {e}")
+
+    if sections is None:
+        sections = {}
+    if not isinstance(sections, dict) or not all(
+        isinstance(records, list)
+        and all(isinstance(record, dict) for record in records)
+        for records in sections.values()
+    ):
+        raise PyrrowheadError(
+            f"Malformed desired state {state_path}: Expected a mapping of sections "
+            f"to lists of records."
+        )
+
+    return DesiredState(
+        validate_records(sections.get("systems", []), validate_system, "system"),
+        validate_records(
+            sections.get("services", []), validate_service_registration, "service"
+        ),
+        validate_records(
+            sections.get("orchestration", []),
+            validate_orchestration_rule,
+            "orchestration rule",
+        ),
+        validate_records(
+            sections.get("authorization", []),
+            validate_authorization_grant,
+            "authorization rule",
+        ),
+        {kind for kind in KINDS if SECTIONS[kind] in sections},
+    )
+
+
+def _attribute_content(attribute: Optional[Dict]) -> str:
+    return json.dumps(attribute or {}, sort_keys=True)
+
+
+def current_state(client: ArrowheadClient) -> Tuple[State, Dict[str, Dict[Tuple, int]]]:
+    """
+    Fetch the current state of the cloud, with one listing per kind.
+
+    Returns:
+        The current state, and the record id of every identity.
+    """
+    state: State = {kind: {} for kind in KINDS}
+    record_ids: Dict[str, Dict[Tuple, int]] = {kind: {} for kind in KINDS}
+
+    def add(kind: str, identity: Tuple, content: Tuple, record_id: int):
+        state[kind][identity] = content
+        record_ids[kind][identity] = record_id
+
+    def system_key(system: Dict) -> SystemKey:
+        return system["systemName"], system["address"], system["port"]
+
+    for system in client.list_systems():
+        add("system", system_key(system), (), system["id"])
+    for service in client.list_services():
+        add(
+            "service",
+            (
+                service["serviceDefinition"]["serviceDefinition"],
+                system_key(service["provider"]),
+                service["serviceUri"],
+            ),
+            (
+                frozenset(
+                    interface["interfaceName"] for interface in service["interfaces"]
+                ),
+                service["secure"],
+            ),
+            service["id"],
+        )
+    for rule in client.list_orchestration_rules():
+        if rule.get("foreign"):
+            continue
+        add(
+            "orchestration",
+            (
+                rule["serviceDefinition"]["serviceDefinition"],
+                rule["serviceInterface"]["interfaceName"],
+                system_key(rule["consumerSystem"]),
+                system_key(rule["providerSystem"]),
+            ),
+            (rule["priority"], _attribute_content(rule.get("attribute"))),
+            rule["id"],
+        )
+    for rule in client.list_authorization_rules():
+        add(
+            "authorization",
+            (
+                system_key(rule["consumerSystem"]),
+                system_key(rule["providerSystem"]),
+                rule["serviceDefinition"]["serviceDefinition"],
+            ),
+            (
+                frozenset(
+                    interface["interfaceName"] for interface in rule["interfaces"]
+                ),
+            ),
+            rule["id"],
+        )
+
+    return state, record_ids
+
+
+def _consumer_resolver(
+    desired: DesiredState, current: State, current_ids: Dict[Tuple, int]
+) -> Callable[[Tuple[str, str, int], Optional[int]], SystemKey]:
+    """
+    Resolve consumers given by id or by name alone to complete system keys, among
+    the current and desired systems.
+    """
+    systems_by_id = {system_id: key for key, system_id in current_ids.items()}
+    systems_by_name: Dict[str, Set[SystemKey]] = {}
+    for key in list(current["system"]) + desired.systems:
+        systems_by_name.setdefault(key[0], set()).add(key)
+
+    def resolve(consumer: Tuple[str, str, int], consumer_id: Optional[int]):
+        if consumer_id is not None:
+            if consumer_id not in systems_by_id:
+                raise ValueError(f"no system with id {consumer_id}")
+            return systems_by_id[consumer_id]
+        name, address, port = consumer
+        if address and port >= 0:
+            return consumer
+        candidates = [
+            key
+            for key in systems_by_name.get(name, set())
+            if (not address or key[1] == address) and (port < 0 or key[2] == port)
+        ]
+        if len(candidates) != 1:
+            raise ValueError(
+                f"consumer {name} is "
+                f'{"ambiguous" if candidates else "unknown"}, '
+                f"provide its address and port"
+            )
+        return candidates[0]
+
+    return resolve
+
+
+def desired_state(
+    desired: DesiredState, current: State, current_ids: Dict[str, Dict[Tuple, int]]
+) -> State:
+    """
+    Turn a desired state into the form of :func:`current_state`.
+
+    Raises:
+        PyrrowheadError: If a consumer cannot be resolved, or if the desired state
+          gives different values for the same entry.
+    """
+    state: State = {kind: {} for kind in KINDS}
+    resolve = _consumer_resolver(desired, current, current_ids["system"])
+    errors = []
+
+    for system in desired.systems:
+        state["system"][system] = ()
+
+    for registration in desired.services:
+        identity: Tuple = (
+            registration.service_definition,
+            registration.system,
+            registration.uri,
+        )
+        interfaces, access_policy = state["service"].get(
+            identity, (frozenset(), registration.access_policy.value)
+        )
+        if access_policy != registration.access_policy.value:
+            errors.append(
+                f"service {registration.service_definition} of "
+                f"{registration.system[0]} at {registration.uri} has different "
+                f"access policies"
+            )
+        state["service"][identity] = (
+            interfaces | {registration.interface},
+            access_policy,
+        )
+
+    for index, rule in enumerate(desired.orchestration_rules):
+        try:
+            consumer = resolve(rule.consumer, rule.consumer_id)
+        except ValueError as e:
+            errors.append(f"orchestration rule {index}: {e}")
+            continue
+        state["orchestration"][
+            (rule.service_definition, rule.interface, consumer, rule.provider)
+        ] = (rule.priority, _attribute_content(rule.attribute))
+
+    for index, grant in enumerate(desired.authorization_grants):
+        try:
+            consumer = resolve(grant.consumer, None)
+        except ValueError as e:
+            errors.append(f"authorization rule {index}: {e}")
+            continue
+        identity = (consumer, grant.provider, grant.service_definition)
+        (interfaces,) = state["authorization"].get(identity, (frozenset(),))
+        state["authorization"][identity] = (interfaces | {grant.interface},)
+
+    if errors:
+        raise PyrrowheadError(
+            f"Desired state contains {len(errors)} invalid entries:\n  "
+            + "\n  ".join(errors)
+        )
+
+    return state
+
+
+def plan_changes(
+    desired: State,
+    current: State,
+    current_ids: Dict[str, Dict[Tuple, int]],
+    prune: bool = False,
+    pruned_kinds: Collection[str] = KINDS,
+    core_systems: Collection[SystemKey] = (),
+) -> List[Change]:
+    """
+    Find the changes that turn the current state into the desired state.
+
+    Entries are compared by the hashes of their identities and contents. Entries
+    that are only desired are added, and entries whose content differs are updated
+    by removing and adding them. Entries of ``pruned_kinds`` that are only current
+    are removed if ``prune`` is given, except for the ``core_systems`` and the
+    services they provide.
+    """
+    changes = []
+    for kind in KINDS:
+        desired_entries, current_entries = desired[kind], current[kind]
+        for identity in desired_entries.keys() - current_entries.keys():
+            changes.append(
+                Change(ADD, kind, identity, desired_entries[identity], None, None)
+            )
+        for identity in desired_entries.keys() & current_entries.keys():
+            if desired_entries[identity] != current_entries[identity]:
+                changes.append(
+                    Change(
+                        UPDATE,
+                        kind,
+                        identity,
+                        desired_entries[identity],
+                        current_entries[identity],
+                        current_ids[kind][identity],
+                    )
+                )
+        if not prune or kind not in pruned_kinds:
+            continue
+        for identity in current_entries.keys() - desired_entries.keys():
+            if (kind == "system" and identity in core_systems) or (
+                kind == "service" and identity[1] in core_systems
+            ):
+                continue
+            changes.append(
+                Change(
+                    REMOVE,
+                    kind,
+                    identity,
+                    None,
+                    current_entries[identity],
+                    current_ids[kind][identity],
+                )
+            )
+
+    return sorted(
+        changes,
+        key=lambda change: (KINDS.index(change.kind), change.action, _describe(change)),
+    )
+
+
+def _system_name(key: SystemKey) -> str:
+    name, address, port = key
+    return f"{name}@{address}:{port}"
+
+
+def _describe(change: Change) -> str:
+    if change.kind == "system":
+        return _system_name(change.identity)
+    elif change.kind == "service":
+        service_definition, provider, uri = change.identity
+        return f"{service_definition} by {_system_name(provider)} at {uri}"
+    elif change.kind == "orchestration":
+        service_definition, interface, consumer, provider = change.identity
+        return (
+            f"{_system_name(consumer)} -> {_system_name(provider)}: "
+            f"{service_definition} ({interface})"
+        )
+    consumer, provider, service_definition = change.identity
+    return f"{_system_name(consumer)} -> {_system_name(provider)}: {service_definition}"
+
+
+def _describe_content(kind: str, content: Optional[Tuple]) -> str:
+    if content is None or kind == "system":
+        return ""
+    elif kind == "service":
+        interfaces, access_policy = content
+        return f'{", ".join(sorted(interfaces))}, {access_policy}'
+    elif kind == "orchestration":
+        priority, attribute = content
+        return f"priority {priority}" + (f", {attribute}" if attribute != "{}" else "")
+    (interfaces,) = content
+    return ", ".join(sorted(interfaces))
+
+
+def create_plan_table(changes: List[Change]) -> Table:
+    plan_table = Table(
+        Column(header="", style="bright_white"),
+        Column(header="Kind", style="bright_white"),
+        Column(header="Entry", style="blue"),
+        Column(header="Details", style="green"),
+        title="Plan",
+        caption=", ".join(
+            f"{sum(change.action == action for change in changes)} to {action}"
+            for action in (ADD, UPDATE, REMOVE)
+        ),
+        box=box.SIMPLE,
+    )
+    symbols = {ADD: "[green]+[/green]", UPDATE: "[yellow]~[/yellow]", REMOVE: "[red]-"}
+    for change in changes:
+        details = _describe_content(change.kind, change.content)
+        if change.action == UPDATE:
+            details = (
+                f"{_describe_content(change.kind, change.current_content)} -> "
+                f"{details}"
+            )
+        elif change.action == REMOVE:
+            details = _describe_content(change.kind, change.current_content)
+        plan_table.add_row(
+            symbols[change.action], change.kind, _describe(change), details
+        )
+
+    return plan_table
+
+
+def _failed(change: Change, message: str) -> BulkResult:
+    return BulkResult(change, {"errorMessage": message}, 0)
+
+
+def _add_authorization_grants(
+    client: ArrowheadClient, changes: List[Change], concurrency: int
+) -> List[BulkResult]:
+    results = []
+    rules: List[AuthorizationRule] = []
+    for change in changes:
+        consumer, provider, service_definition = change.identity
+        (interfaces,) = change.content  # type: ignore
+        consumer_id, provider_id = client.get_system_ids([consumer, provider])
+        service_index = client.service_index
+        unknown_interfaces = interfaces - service_index.interface_ids.keys()
+        if consumer_id < 0 or provider_id < 0:
+            results.append(_failed(change, "Consumer or provider is not registered."))
+        elif service_definition not in service_index.definition_ids:
+            results.append(
+                _failed(
+                    change,
+                    f"No registered service has service definition "
+                    f"{service_definition}.",
+                )
+            )
+        elif unknown_interfaces:
+            results.append(
+                _failed(
+                    change,
+                    f"No registered service has interface "
+                    f'{", ".join(sorted(unknown_interfaces))}.',
+                )
+            )
+        else:
+            rules.extend(
+                AuthorizationRule(
+                    consumer_id,
+                    provider_id,
+                    service_index.interface_ids[interface],
+                    service_index.definition_ids[service_definition],
+                )
+                for interface in sorted(interfaces)
+            )
+
+    results.extend(client.add_authorization_rules(rules, concurrency))
+    return results
+
+
+def _remove_entry(
+    remove: Callable[[int], Tuple[Dict, int]], change: Change
+) -> Tuple[Dict, int]:
+    return remove(change.record_id)  # type: ignore
+
+
+def apply_changes(
+    client: ArrowheadClient,
+    changes: List[Change],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, List[BulkResult]]:
+    """
+    Apply planned changes to the cloud.
+
+    Removed and updated entries are first removed concurrently, rules before the
+    services and systems they refer to. Added and updated entries are then added
+    the other way around, systems and services with concurrent requests,
+    orchestration rules in chunks and authorization rules compacted into as few
+    requests as possible. Nothing is sent for an empty plan.
+
+    Returns:
+        The results of each step that had changes.
+    """
+    removers = {
+        "system": client.remove_system,
+        "service": client.delete_service,
+        "orchestration": client.remove_orchestration_rule,
+        "authorization": client.remove_authorization_rule,
+    }
+    results: Dict[str, List[BulkResult]] = {}
+
+    for kind in reversed(KINDS):
+        removed = [
+            change
+            for change in changes
+            if change.kind == kind and change.action in {UPDATE, REMOVE}
+        ]
+        if removed:
+            results[f"remove {kind}"] = list(
+                map_concurrently(
+                    partial(run_bulk_item, partial(_remove_entry, removers[kind])),
+                    removed,
+                    concurrency,
+                )
+            )
+
+    added: Dict[str, List[Change]] = {kind: [] for kind in KINDS}
+    for change in changes:
+        if change.action in {ADD, UPDATE}:
+            added[change.kind].append(change)
+
+    if added["system"]:
+        results["add system"] = list(
+            client.add_systems(
+                (
+                    {"systemName": name, "address": address, "port": port}
+                    for name, address, port in (
+                        change.identity for change in added["system"]
+                    )
+                ),
+                concurrency,
+            )
+        )
+    if added["service"]:
+        registry_requests = []
+        for change in added["service"]:
+            service_definition, (name, address, port), uri = change.identity
+            interfaces, access_policy = change.content  # type: ignore
+            registry_requests.append(
+                {
+                    "serviceDefinition": service_definition,
+                    "serviceUri": uri,
+                    "interfaces": sorted(interfaces),
+                    "secure": access_policy,
+                    "providerSystem": {
+                        "systemName": name,
+                        "address": address,
+                        "port": port,
+                    },
+                }
+            )
+        results["add service"] = list(
+            client.register_services(registry_requests, concurrency)
+        )
+    if added["orchestration"]:
+        orchestration_rules = []
+        for change in added["orchestration"]:
+            service_definition, interface, consumer, provider = change.identity
+            priority, attribute = change.content  # type: ignore
+            orchestration_rules.append(
+                OrchestrationRule(
+                    service_definition,
+                    interface,
+                    provider,
+                    None,
+                    consumer,
+                    priority,
+                    json.loads(attribute) or None,
+                )
+            )
+        try:
+            results["add orchestration"] = list(
+                client.add_orchestration_rules(
+                    orchestration_rules, chunk_size, concurrency=concurrency
+                )
+            )
+        except PyrrowheadError as e:
+            results["add orchestration"] = [
+                _failed(change, str(e)) for change in added["orchestration"]
+            ]
+    if added["authorization"]:
+        results["add authorization"] = _add_authorization_grants(
+            client, added["authorization"], concurrency
+        )
+
+    return results
+
+
+def plan(
+    client: ArrowheadClient, state_path: Path, prune: bool = False
+) -> List[Change]:
+    """
+    Load a desired state file and plan the changes that make the cloud match it.
+
+    Only the kinds with a section in the file are pruned, and core systems and
+    their services are never pruned.
+
+    Raises:
+        PyrrowheadError: If the desired state is invalid, or if the core systems
+          respond with an error.
+    """
+    desired = load_desired_state(state_path)
+    current, current_ids = current_state(client)
+    return plan_changes(
+        desired_state(desired, current, current_ids),
+        current,
+        current_ids,
+        prune,
+        desired.kinds,
+        {system for system in current["system"] if client.is_core_system(system)},
+    )
@@ -0,0 +1,124 @@
+import heapq
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple
+
+DEFAULT_SEARCH_LIMIT = 10
+
+
+class SearchDocument(NamedTuple):
+    kind: str
+    text: str
+    detail: str
+
+
+class SearchHit(NamedTuple):
+    score: float
+    document: SearchDocument
+
+
+def trigrams(text: str) -> Set[str]:
+    """Return the trigrams of the lowercased words of ``text``, padded with spaces."""
+    return {
+        padded[i : i + 3]
+        for word in text.lower().split()
+        for padded in (f"  {word} ",)
+        for i in range(len(padded) - 2)
+    }
+
+
+def service_documents(services: Iterable[Dict]) -> Iterator[SearchDocument]:
+    seen: Set[str] = set()
+    for service in services:
+        service_definition = service["serviceDefinition"]["serviceDefinition"]
+        if service_definition not in seen:
+            seen.add(service_definition)
+            yield SearchDocument(
+                "service definition",
+                service_definition,
+                f'id: {service["serviceDefinition"]["id"]}',
+            )
+
+
+def system_documents(systems: Iterable[Dict]) -> Iterator[SearchDocument]:
+    for system in systems:
+        address = f'{system["address"]}:{system["port"]}'
+        yield SearchDocument("system", system["systemName"], address)
+        yield SearchDocument(
+            "address", address, f'{system["systemName"]} (id: {system["id"]})'
+        )
+
+
+def rule_documents(kind: str, rules: Iterable[Dict]) -> Iterator[SearchDocument]:
+    for rule in rules:
+        consumer_name = rule["consumerSystem"]["systemName"]
+        provider_name = rule["providerSystem"]["systemName"]
+        yield SearchDocument(
+            kind,
+            f"{consumer_name} -> {provider_name}",
+            f'{rule["serviceDefinition"]["serviceDefinition"]} (id: {rule["id"]})',
+        )
+
+
+class FuzzyIndex:
+    """
+    Trigram index for ranked fuzzy search.
+
+    Documents are ranked by the similarity of their trigrams to the trigrams of the
+    query, the number of shared trigrams divided by the number of trigrams in
+    either. Only documents sharing at least one trigram with the query are scored,
+    found through the posting lists of the query trigrams.
+
+    Args:
+        documents: The searchable documents.
+    """
+
+    def __init__(self, documents: Iterable[SearchDocument]):
+        self.documents: List[SearchDocument] = []
+        self.trigram_counts: List[int] = []
+        self.postings: Dict[str, List[int]] = {}
+        for position, document in enumerate(documents):
+            document_trigrams = trigrams(document.text)
+            self.documents.append(document)
+            self.trigram_counts.append(len(document_trigrams))
+            for trigram in document_trigrams:
+                self.postings.setdefault(trigram, []).append(position)
+
+    def search(self, query: str, limit: int = DEFAULT_SEARCH_LIMIT) -> List[SearchHit]:
+        """Return the ``limit`` documents most similar to ``query``, best first."""
+        query_trigrams = trigrams(query)
+        shared: Dict[int, int] = {}
+        for trigram in query_trigrams:
+            for position in self.postings.get(trigram, ()):
+                shared[position] = shared.get(position, 0) + 1
+
+        query_text = query.lower()
+        scored: List[Tuple[float, int]] = []
+        for position, shared_count in shared.items():
+            score = shared_count / (
+                len(query_trigrams) + self.trigram_counts[position] - shared_count
+            )
+            # Exact substrings rank above other partial matches
+            if query_text in self.documents[position].text.lower():
+                score += 1.0
+            scored.append((score, position))
+
+        return [
+            SearchHit(score, self.documents[position])
+            for score, position in heapq.nlargest(
+                limit, scored, key=lambda hit: (hit[0], -hit[1])
+            )
+        ]
+
+    def to_dict(self) -> Dict:
+        return {
+            "documents": self.documents,
+            "trigram_counts": self.trigram_counts,
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "FuzzyIndex":
+        index = cls([])
+        index.documents = [SearchDocument(*document) for document in data["documents"]]
+        index.trigram_counts = data["trigram_counts"]
+        index.postings = data["postings"]
+        return index
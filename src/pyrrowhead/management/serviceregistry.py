@@ -1,4 +1,4 @@
-from typing import Optional, Tuple, Dict
+from typing import Optional, Tuple, Dict, Iterator, Iterable
 
 from rich import box
 from rich.console import Group
@@ -7,30 +7,12 @@ from rich.table import Table, Column
 
 from pyrrowhead import rich_console
 from pyrrowhead.management.common import AccessPolicy
-from pyrrowhead.management.utils import (
-    get_service,
-    post_service,
-    delete_service as del_service,
-)
-from pyrrowhead.utils import (
-    get_core_system_address_and_port,
-    get_active_cloud_directory,
-)
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead.management.bulk import BulkResult
 
 
 def inspect_service(service_id: int):
-    active_cloud_directory = get_active_cloud_directory()
-    address, port, secure, scheme = get_core_system_address_and_port(
-        "service_registry",
-        active_cloud_directory,
-    )
-
-    response = get_service(
-        f"{scheme}://{address}:{port}/serviceregistry/mgmt/{service_id}",
-        active_cloud_directory,
-    )
-
-    return response.json(), response.status_code
+    return ArrowheadClient().inspect_service(service_id)
 
 
 def add_service(
@@ -40,107 +22,35 @@ def add_service(
     access_policy: AccessPolicy,
     system: Tuple[str, str, int],
 ):
-    active_cloud_directory = get_active_cloud_directory()
-    sr_address, sr_port, secure, scheme = get_core_system_address_and_port(
-        "service_registry",
-        active_cloud_directory,
-    )
-
-    system_name, address, port = system
-
-    registry_request = {
-        "serviceDefinition": service_definition,
-        "serviceUri": uri,
-        "interfaces": [interface],
-        "secure": access_policy,
-        "providerSystem": {
-            "systemName": system_name,
-            "address": address,
-            "port": port,
-        },
-    }
-
-    response = post_service(
-        f"{scheme}://{sr_address}:{sr_port}/serviceregistry/mgmt/",
-        active_cloud_directory,
-        json=registry_request,
+    return ArrowheadClient().add_service(
+        service_definition, uri, interface, access_policy, system
     )
 
-    return response.json(), response.status_code
-
-
-def list_filter(
-    orch_rule: Dict,
-    service_definition: Optional[str],
-    system_name: Optional[str],
-    system_id: Optional[int],
-):
-    if service_definition is not None:
-        return orch_rule["serviceDefinition"]["serviceDefinition"] == service_definition
-    elif system_name is not None:
-        return orch_rule["provider"]["systemName"] == system_name
-    elif system_id is not None:
-        return orch_rule["provider"]["id"] == system_id
-
-    return True
-
 
 def list_services(
     service_definition: Optional[str],
     system_name: Optional[str],
     system_id: Optional[int],
-) -> Dict:
-    active_cloud_directory = get_active_cloud_directory()
-    address, port, secure, scheme = get_core_system_address_and_port(
-        "service_registry",
-        active_cloud_directory,
+    filter_expression: Optional[str] = None,
+) -> Iterator[Dict]:
+    """
+    Yield the services in the service registry, fetched page by page.
+
+    Raises:
+        ValueError: If the filter expression is invalid.
+        PyrrowheadError: If the service registry responds with an error.
+    """
+    return ArrowheadClient().list_services(
+        service_definition, system_name, system_id, filter_expression
     )
 
-    endpoint = f"{scheme}://{address}:{port}/serviceregistry/mgmt/"
-
-    response_data = get_service(
-        endpoint,
-        active_cloud_directory,
-    ).json()
-
-    if any((system_name, system_id)):
-        response_data = {
-            "data": [
-                service
-                for service in response_data["data"]
-                if (
-                    system_name == service["provider"]["systemName"]
-                    or system_id == service["provider"]["id"]
-                )
-            ]
-        }
-
-    response_data["data"] = [
-        orch_rule
-        for orch_rule in response_data["data"]
-        if list_filter(orch_rule, service_definition, system_name, system_id)
-    ]
-
-    return response_data
-
 
 def delete_service(service_id: int):
-    active_cloud_directory = get_active_cloud_directory()
-    address, port, secure, scheme = get_core_system_address_and_port(
-        "service_registry",
-        active_cloud_directory,
-    )
-
-    response = del_service(
-        f"https://{address}:{port}/serviceregistry/mgmt/{id}",
-        active_cloud_directory,
-    )
-
-    return response.json(), response.status_code
+    return ArrowheadClient().delete_service(service_id)
 
 
 def create_service_table(
-    response_data: Dict, show_system, show_access_policy, show_service_uri
+    services: Iterable[Dict], show_system, show_access_policy, show_service_uri
 ) -> Table:
     service_table = Table(
         Column(header="id", style="red"),
@@ -163,7 +73,7 @@ def create_service_table(
             style="blue",
         )
 
-    for service in response_data["data"]:
+    for service in services:
         row_data = [
             str(service["id"]),
             f'{service["serviceDefinition"]["serviceDefinition"]}  '
@@ -185,51 +95,41 @@ def create_service_table(
     return service_table
 
 
-def grouped_services():
-    active_cloud_directory = get_active_cloud_directory()
-    address, port, secure, scheme = get_core_system_address_and_port(
-        "service_registry",
-        active_cloud_directory,
-    )
-    response = get_service(
-        f"{scheme}://{address}:{port}/serviceregistry/mgmt/grouped",
-        active_cloud_directory,
+def create_registration_table(results: Iterable[BulkResult]) -> Table:
+    registration_table = Table(
+        Column(header="#", style="bright_white"),
+        Column(header="Service definition", style="bright_blue"),
+        Column(header="System", style="blue"),
+        Column(header="Result"),
+        title="Service registrations",
+        box=box.SIMPLE,
     )
-    return response.json(), response.status_code
-
 
-def get_system_id_from_name(system_name: str, address: str = "", port: int = -1) -> int:
-    active_cloud_directory = get_active_cloud_directory()
-    sr_address, sr_port, secure, scheme = get_core_system_address_and_port(
-        "service_registry",
-        active_cloud_directory,
-    )
+    for index, result in enumerate(results):
+        system_name, address, port = result.item.system
+        if result.ok:
+            outcome = f'[green]Registered[/green] (id: {result.response_data["id"]})'
+        else:
+            outcome = (
+                f"[red]Failed[/red] "
+                f'{result.response_data.get("errorMessage", "")} ({result.status})'
+            )
+        registration_table.add_row(
+            str(index),
+            result.item.service_definition,
+            f"{system_name}@{address}:{port}",
+            outcome,
+        )
 
-    scheme = "https" if secure else "http"
-    response_data = get_service(
-        f"{scheme}://{sr_address}:{sr_port}/serviceregistry/mgmt/systems",
-        active_cloud_directory,
-    ).json()
+    return registration_table
 
-    candidate_systems = [
-        system
-        for system in response_data["data"]
-        if system["systemName"] == system_name
-    ]
 
-    if len(address) > 0 and port >= 0:
-        candidate_systems = [
-            system
-            for system in candidate_systems
-            if system["address"] == address and system["port"] == port
-        ]
+def grouped_services():
+    return ArrowheadClient().grouped_services()
 
-    if len(candidate_systems) == 0:
-        return -1
-    elif len(candidate_systems) > 1:
-        return -2
 
-    return candidate_systems[0]["id"]
+def get_system_id_from_name(system_name: str, address: str = "", port: int = -1) -> int:
+    return ArrowheadClient().get_system_id_from_name(system_name, address, port)
 
 
 def render_service(response_data):
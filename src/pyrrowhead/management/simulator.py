@@ -0,0 +1,277 @@
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from rich import box
+from rich.table import Table, Column
+
+from pyrrowhead.management.client import ArrowheadClient
+
+NOT_REGISTERED = "Provider does not register the service with this interface"
+NOT_AUTHORIZED = "Consumer is not authorized to use the service"
+WRONG_INTERFACE = "Rule is for another interface"
+
+
+class Candidate(NamedTuple):
+    rule: Dict
+    service_id: Optional[int]
+    excluded: Optional[str] = None
+
+    @property
+    def foreign(self) -> bool:
+        return bool(self.rule.get("foreign"))
+
+
+class Orchestration(NamedTuple):
+    consumer: Dict
+    service_definition: str
+    candidates: List[Candidate]
+
+    @property
+    def providers(self) -> List[Candidate]:
+        """The candidates the orchestrator would return, best first."""
+        return [candidate for candidate in self.candidates if not candidate.excluded]
+
+
+class OrchestrationSimulator:
+    """
+    Evaluates store based orchestration locally, without orchestration requests.
+
+    The orchestration store, service registry and authorization rules are indexed
+    once, after which a consumer and service definition is evaluated by looking up
+    its store rules and checking each rule in constant time. Like the orchestrator,
+    rules are tried in priority order, lowest priority value first, and a provider
+    is only returned if it registers the service with the rule interface and the
+    consumer is authorized to use it. Rules with foreign providers are resolved by
+    inter-cloud orchestration, and are returned without checks.
+
+    Args:
+        orchestration_rules: Orchestration store rules.
+        services: Registered services.
+        authorization_rules: Intracloud authorization rules.
+    """
+
+    def __init__(
+        self,
+        orchestration_rules: Iterable[Dict],
+        services: Iterable[Dict],
+        authorization_rules: Iterable[Dict],
+    ):
+        # (consumer id, service definition) -> rules in priority order
+        self.store: Dict[Tuple[int, str], List[Dict]] = {}
+        for rule in orchestration_rules:
+            key = (
+                rule["consumerSystem"]["id"],
+                rule["serviceDefinition"]["serviceDefinition"],
+            )
+            self.store.setdefault(key, []).append(rule)
+        for rules in self.store.values():
+            rules.sort(key=lambda rule: (rule["priority"], rule["id"]))
+
+        # (service definition, provider id, interface) -> service id
+        self.registered: Dict[Tuple[str, int, str], int] = {
+            (
+                service["serviceDefinition"]["serviceDefinition"],
+                service["provider"]["id"],
+                interface["interfaceName"],
+            ): service["id"]
+            for service in services
+            for interface in service["interfaces"]
+        }
+
+        # (consumer id, provider id, service definition, interface)
+        self.authorized: Set[Tuple[int, int, str, str]] = {
+            (
+                rule["consumerSystem"]["id"],
+                rule["providerSystem"]["id"],
+                rule["serviceDefinition"]["serviceDefinition"],
+                interface["interfaceName"],
+            )
+            for rule in authorization_rules
+            for interface in rule["interfaces"]
+        }
+
+    @classmethod
+    def from_client(cls, client: ArrowheadClient) -> "OrchestrationSimulator":
+        """
+        Raises:
+            PyrrowheadError: If a core system responds with an error.
+        """
+        return cls(
+            client.list_orchestration_rules(),
+            client.list_services(),
+            client.list_authorization_rules(),
+        )
+
+    def _evaluate(self, rule: Dict, interface: Optional[str]) -> Candidate:
+        if rule.get("foreign"):
+            return Candidate(rule, None)
+        rule_interface = rule["serviceInterface"]["interfaceName"]
+        if interface is not None and rule_interface != interface:
+            return Candidate(rule, None, WRONG_INTERFACE)
+
+        consumer_id = rule["consumerSystem"]["id"]
+        provider_id = rule["providerSystem"]["id"]
+        service_definition = rule["serviceDefinition"]["serviceDefinition"]
+        service_id = self.registered.get(
+            (service_definition, provider_id, rule_interface)
+        )
+        if service_id is None:
+            return Candidate(rule, None, NOT_REGISTERED)
+        if (
+            consumer_id,
+            provider_id,
+            service_definition,
+            rule_interface,
+        ) not in self.authorized:
+            return Candidate(rule, service_id, NOT_AUTHORIZED)
+        return Candidate(rule, service_id)
+
+    def orchestrate(
+        self,
+        consumer_id: int,
+        service_definition: str,
+        interface: Optional[str] = None,
+    ) -> Orchestration:
+        """
+        Evaluate the store rules of a consumer and service definition.
+
+        Args:
+            consumer_id: Id of the consumer system.
+            service_definition: Requested service definition.
+            interface: Requested interface, any interface if not given.
+
+        Returns:
+            The orchestration, with every store rule as a candidate in priority
+            order, and the reason for excluding the candidates the orchestrator
+            would not return.
+        """
+        rules = self.store.get((consumer_id, service_definition), [])
+        consumer = (
+            rules[0]["consumerSystem"]
+            if rules
+            else {"id": consumer_id, "systemName": "", "address": "", "port": 0}
+        )
+        return Orchestration(
+            consumer,
+            service_definition,
+            [self._evaluate(rule, interface) for rule in rules],
+        )
+
+    def orchestrate_all(
+        self,
+        service_definition: Optional[str] = None,
+        interface: Optional[str] = None,
+    ) -> Iterator[Orchestration]:
+        """
+        Evaluate every consumer and service definition in the orchestration store in
+        one pass, ordered by consumer id and service definition.
+        """
+        for consumer_id, definition in sorted(self.store):
+            if service_definition is None or definition == service_definition:
+                yield self.orchestrate(consumer_id, definition, interface)
+
+
+def provider_load(orchestrations: Iterable[Orchestration]) -> Counter:
+    """Count how many orchestrations each provider is the first choice of."""
+    return Counter(
+        (
+            orchestration.providers[0].rule["providerSystem"]["systemName"],
+            orchestration.providers[0].rule["providerSystem"]["id"],
+        )
+        for orchestration in orchestrations
+        if orchestration.providers
+    )
+
+
+def create_candidate_table(orchestration: Orchestration) -> Table:
+    consumer = orchestration.consumer
+    table = Table(
+        Column(header="Rank", style="bright_white"),
+        Column(header="Rule id", style="red"),
+        Column(header="Priority", style="bright_white"),
+        Column(header="Provider (id)", style="blue"),
+        Column(style="blue"),
+        Column(header="Interface", style="bright_yellow"),
+        Column(header="Service id", style="green"),
+        Column(header="Result"),
+        title=f"Orchestration of {orchestration.service_definition} for "
+        f'{consumer["systemName"]} (id: {consumer["id"]})',
+        box=box.SIMPLE,
+    )
+
+    rank = 0
+    for candidate in orchestration.candidates:
+        if candidate.excluded:
+            rank_text = "-"
+            result = f"[red]Excluded[/red] {candidate.excluded}"
+        else:
+            rank += 1
+            rank_text = str(rank)
+            result = (
+                "[yellow]Foreign[/yellow] resolved by inter-cloud orchestration"
+                if candidate.foreign
+                else "[green]Returned[/green]"
+            )
+        rule = candidate.rule
+        table.add_row(
+            rank_text,
+            str(rule["id"]),
+            str(rule["priority"]),
+            rule["providerSystem"]["systemName"],
+            f'(id: {rule["providerSystem"]["id"]})',
+            rule["serviceInterface"]["interfaceName"],
+            "" if candidate.service_id is None else str(candidate.service_id),
+            result,
+        )
+
+    return table
+
+
+def create_batch_table(orchestrations: Iterable[Orchestration]) -> Table:
+    table = Table(
+        Column(header="Consumer (id)", style="bright_blue"),
+        Column(style="bright_blue"),
+        Column(header="Service definition", style="green"),
+        Column(header="First provider (id)", style="blue"),
+        Column(style="blue"),
+        Column(header="Returned", style="bright_white"),
+        Column(header="Excluded", style="bright_white"),
+        title="Simulated orchestrations",
+        box=box.SIMPLE,
+    )
+
+    for orchestration in orchestrations:
+        providers = orchestration.providers
+        if providers:
+            first_provider = providers[0].rule["providerSystem"]
+            provider_cells = [
+                first_provider["systemName"],
+                f'(id: {first_provider["id"]})',
+            ]
+        else:
+            provider_cells = ["[red]none[/red]", ""]
+        excluded = len(orchestration.candidates) - len(providers)
+        table.add_row(
+            orchestration.consumer["systemName"],
+            f'(id: {orchestration.consumer["id"]})',
+            orchestration.service_definition,
+            *provider_cells,
+            str(len(providers)),
+            f"[red]{excluded}[/red]" if excluded else "0",
+        )
+
+    return table
+
+
+def create_load_table(load: Counter) -> Table:
+    table = Table(
+        Column(header="Provider (id)", style="blue"),
+        Column(style="blue"),
+        Column(header="First choice of", style="bright_white"),
+        title="Provider load",
+        box=box.SIMPLE,
+    )
+    for (provider_name, provider_id), count in load.most_common():
+        table.add_row(provider_name, f"(id: {provider_id})", str(count))
+
+    return table
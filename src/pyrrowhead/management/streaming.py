@@ -0,0 +1,106 @@
+import codecs
+import json
+from typing import Iterable, Iterator, Any
+
+_WHITESPACE = " \t\n\r"
+
+
+class _ChunkBuffer:
+    """Text buffer that is refilled from an iterable of utf-8 encoded chunks."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.exhausted = False
+
+    def fill(self) -> bool:
+        """Read another chunk into the buffer, returns False if there are no more."""
+        if self.exhausted:
+            return False
+        # Drop the consumed part of the buffer before growing it
+        self.text = self.text[self.pos :]
+        self.pos = 0
+        for chunk in self._chunks:
+            if chunk:
+                self.text += self._decoder.decode(chunk)
+                return True
+        self.text += self._decoder.decode(b"", final=True)
+        self.exhausted = True
+        return False
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                raise json.JSONDecodeError(
+                    "Unexpected end of data", self.text, self.pos
+                )
+
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expected '{char}'", self.text, self.pos)
+        self.pos += 1
+
+    def decode_value(self, decoder: json.JSONDecoder) -> Any:
+        """Decode the next complete json value, reading more chunks when needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.text, self.pos)
+                # A value ending exactly at the end of the buffer, such as a number,
+                # might continue in the next chunk.
+                if end < len(self.text) or self.exhausted:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.exhausted:
+                    raise
+            self.fill()
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str = "data") -> Iterator[Any]:
+    """
+    Incrementally parse a json object and yield the elements of its ``key`` array.
+
+    Only one element at a time is decoded into Python objects, so memory use is
+    bounded by the largest element rather than the size of the whole document.
+    Other members of the object are decoded and discarded.
+
+    Args:
+        chunks: The json document as utf-8 encoded chunks, for example
+          ``response.iter_content(chunk_size)`` of a streamed response.
+        key: Name of the top level member containing the array to stream.
+
+    Raises:
+        json.JSONDecodeError: If the document is malformed.
+    """
+    decoder = json.JSONDecoder()
+    buffer = _ChunkBuffer(chunks)
+
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+    while True:
+        member_name = buffer.decode_value(decoder)
+        buffer.expect(":")
+        if member_name == key and buffer.peek() == "[":
+            buffer.pos += 1
+            if buffer.peek() != "]":
+                while True:
+                    yield buffer.decode_value(decoder)
+                    if buffer.peek() == "]":
+                        break
+                    buffer.expect(",")
+            buffer.pos += 1
+        else:
+            buffer.decode_value(decoder)
+
+        if buffer.peek() == "}":
+            return
+        buffer.expect(",")
@@ -1,26 +1,21 @@
-from typing import Optional
+from typing import Optional, Iterator, Iterable, Dict
 from pathlib import Path
 
 from rich import box
 from rich.table import Table, Column
 
-from ..management.utils import get_service, post_service, delete_service
-from ..utils import get_core_system_address_and_port, get_active_cloud_directory
+from pyrrowhead.management.client import ArrowheadClient
 
 
-def list_systems():
-    active_cloud_directory = get_active_cloud_directory()
-    address, port, secure, scheme = get_core_system_address_and_port(
-        "service_registry",
-        active_cloud_directory,
-    )
-    scheme = "https" if secure else "http"
-    response = get_service(
-        f"{scheme}://{address}:{port}/serviceregistry/mgmt/systems",
-        active_cloud_directory,
-    )
-    response_data, status = response.json(), response.status_code
-    return response_data, status
+def list_systems(filter_expression: Optional[str] = None) -> Iterator[Dict]:
+    """
+    Yield the systems in the service registry, fetched page by page.
+
+    Raises:
+        ValueError: If the filter expression is invalid.
+        PyrrowheadError: If the service registry responds with an error.
+    """
+    return ArrowheadClient().list_systems(filter_expression)
 
 
 def add_system(
@@ -29,45 +24,16 @@ def add_system(
     system_port: int,
     certificate_file: Optional[Path] = None,
 ):
-    active_cloud_directory = get_active_cloud_directory()
-    address, port, secure, scheme = get_core_system_address_and_port(
-        "service_registry",
-        active_cloud_directory,
+    return ArrowheadClient().add_system(
+        system_name, system_address, system_port, certificate_file
     )
 
-    system_record = {
-        "systemName": system_name,
-        "address": system_address,
-        "port": system_port,
-    }
-
-    response_data = post_service(
-        f"{scheme}://{address}:{port}/serviceregistry/mgmt/systems",
-        active_cloud_directory,
-        json=system_record,
-    ).json()
-
-    return response_data
-
 
 def remove_system(system_id: int):
-    active_cloud_directory = get_active_cloud_directory()
-    address, port, secure, scheme = get_core_system_address_and_port(
-        "service_registry",
-        active_cloud_directory,
-    )
-
-    response = delete_service(
-        f"{scheme}://{address}:{port}/serviceregistry/mgmt/systems/{system_id}",
-        active_cloud_directory,
-    )
-
-    return response.json(), response.status_code
-
+    return ArrowheadClient().remove_system(system_id)
 
-def create_system_table(response):
-    system_data = response
 
+def create_system_table(systems: Iterable[Dict]):
     system_table = Table(
         Column(header="id", style="red"),
         Column(header="System name", style="blue"),
@@ -77,7 +43,7 @@ def create_system_table(response):
         box=box.SIMPLE,
     )
 
-    for system in system_data["data"]:
+    for system in systems:
         system_table.add_row(
             str(system["id"]),
             system["systemName"],
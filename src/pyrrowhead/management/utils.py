@@ -1,7 +1,44 @@
+import atexit
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Union, List, Dict, Optional
+from threading import Lock
+from typing import (
+    Union,
+    List,
+    Dict,
+    Optional,
+    Tuple,
+    Iterator,
+    Iterable,
+    Any,
+    Callable,
+    TypeVar,
+)
+from urllib.parse import urlsplit
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from pyrrowhead.management.streaming import iter_json_array
+from pyrrowhead.utils import PyrrowheadError
+
+DEFAULT_POOL_SIZE = 10
+DEFAULT_IDLE_TIMEOUT = 60.0
+DEFAULT_CONCURRENCY = 8
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_PAGE_SIZE = 500
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class DeadlineExceeded(PyrrowheadError):
+    pass
 
 
 def get_ssl_files(cloud_directory: Path):
@@ -18,25 +55,360 @@ def get_ssl_files(cloud_directory: Path):
     )
 
 
+class _PooledSession:
+    def __init__(self, session: requests.Session):
+        self.session = session
+        self.last_used = time.monotonic()
+        self.in_use = 0
+        self.retired = False
+
+
+class SessionPool:
+    """
+    Keep-alive sessions shared by all management calls in the process.
+
+    Sessions are keyed by cloud directory and core system (scheme, address and port),
+    so that consecutive calls to the same core system reuse open connections instead
+    of doing a new TCP connect and TLS handshake each time.
+
+    Sessions are leased with :meth:`acquire` for the duration of a request. Sessions
+    not used for ``idle_timeout`` seconds are closed the next time the pool is
+    accessed, and sessions replaced by :meth:`retire_all` are closed right away.
+    A session that is leased is never closed, it is closed when it is returned
+    instead.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        self.pool_size = pool_size
+        self.idle_timeout = idle_timeout
+        self._sessions: Dict[Tuple[Path, str], _PooledSession] = {}
+        self._lock = Lock()
+
+    def _new_session(self, cloud_directory: Path) -> requests.Session:
+        *certkey, ca_path = get_ssl_files(cloud_directory)
+        session = requests.Session()
+        session.cert = tuple(str(path) for path in certkey)  # type: ignore
+        session.verify = str(ca_path)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _retire(self, pooled: _PooledSession):
+        if pooled.in_use:
+            pooled.retired = True
+        else:
+            pooled.session.close()
+
+    def _evict_idle(self, now: float):
+        idle = [
+            key
+            for key, pooled in self._sessions.items()
+            if not pooled.in_use and now - pooled.last_used > self.idle_timeout
+        ]
+        for key in idle:
+            self._sessions.pop(key).session.close()
+
+    def _release(self, pooled: _PooledSession):
+        with self._lock:
+            pooled.in_use -= 1
+            pooled.last_used = time.monotonic()
+            if pooled.retired and not pooled.in_use:
+                pooled.session.close()
+
+    def acquire(
+        self, url: str, cloud_directory: Path
+    ) -> Tuple[requests.Session, Callable[[], None]]:
+        """
+        Lease the session for the core system of ``url``.
+
+        Returns:
+            The session, and a function that returns it to the pool. Calling the
+            function more than once has no effect.
+        """
+        split_url = urlsplit(url)
+        key = (Path(cloud_directory), f"{split_url.scheme}://{split_url.netloc}")
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            if key not in self._sessions:
+                self._sessions[key] = _PooledSession(
+                    self._new_session(Path(cloud_directory))
+                )
+            pooled = self._sessions[key]
+            pooled.in_use += 1
+            pooled.last_used = time.monotonic()
+
+        released = Lock()
+
+        def release():
+            if released.acquire(blocking=False):
+                self._release(pooled)
+
+        return pooled.session, release
+
+    def retire_all(self):
+        """
+        Remove all sessions from the pool, so that later calls use new sessions.
+
+        Returned sessions are closed right away, and leased sessions when they are
+        returned.
+        """
+        with self._lock:
+            for pooled in self._sessions.values():
+                self._retire(pooled)
+            self._sessions.clear()
+
+    def close(self):
+        self.retire_all()
+
+
+_session_pool = SessionPool()
+atexit.register(_session_pool.close)
+
+
+def configure_session_pool(
+    pool_size: Optional[int] = None,
+    idle_timeout: Optional[float] = None,
+):
+    """
+    Change the connection pool settings used by the management calls.
+
+    The pooled sessions are replaced so the new settings apply to all subsequent
+    calls. Requests in flight complete on their old sessions.
+
+    Args:
+        pool_size: Maximum number of kept-alive connections per core system.
+        idle_timeout: Seconds a session may be unused before it is closed.
+    """
+    if pool_size is not None:
+        _session_pool.pool_size = pool_size
+    if idle_timeout is not None:
+        _session_pool.idle_timeout = idle_timeout
+    _session_pool.retire_all()
+
+
+def ensure_pool_size(pool_size: int):
+    """
+    Grow the connection pool to at least ``pool_size`` connections per core system.
+
+    Used by concurrent callers so that parallel requests are not limited by, or
+    discard connections from, a smaller pool.
+    """
+    if _session_pool.pool_size < pool_size:
+        configure_session_pool(pool_size=pool_size)
+
+
+def map_concurrently(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Iterator[R]:
+    """
+    Apply ``func`` to all items using ``concurrency`` worker threads.
+
+    Results are yielded in the order of ``items``, each one as soon as it and all
+    results before it have completed.
+    """
+    ensure_pool_size(concurrency)
+    with ThreadPoolExecutor(
+        max_workers=concurrency, thread_name_prefix="pyrrowhead"
+    ) as executor:
+        yield from executor.map(func, items)
+
+
+def close_sessions():
+    """Close all pooled sessions."""
+    _session_pool.close()
+
+
+class _RequestSettings:
+    def __init__(self):
+        self.connect_timeout: float = DEFAULT_CONNECT_TIMEOUT
+        self.read_timeout: float = DEFAULT_READ_TIMEOUT
+        self.hedge_delay: Optional[float] = None
+        self.deadline: Optional[float] = None
+
+
+_settings = _RequestSettings()
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+# Default of arguments where None is a valid value
+_UNSET: Any = object()
+
+
+def configure_timeouts(
+    connect: Optional[float] = None,
+    read: Optional[float] = None,
+    hedge_delay: Optional[float] = _UNSET,
+):
+    """
+    Change the default timeouts used by the management calls.
+
+    Settings that are not given are left unchanged.
+
+    Args:
+        connect: Seconds to wait for a connection to a core system.
+        read: Seconds to wait for data from a core system.
+        hedge_delay: If set, GET requests that have not completed after
+          ``hedge_delay`` seconds are sent a second time, and the first response
+          to arrive is used. ``None`` disables hedging, which is the initial
+          setting.
+    """
+    if connect is not None:
+        _settings.connect_timeout = connect
+    if read is not None:
+        _settings.read_timeout = read
+    if hedge_delay is not _UNSET:
+        _settings.hedge_delay = hedge_delay
+
+
+def set_command_deadline(seconds: Optional[float]):
+    """
+    Set an overall deadline, counted from now, for all following management calls.
+
+    Calls started after the deadline raise :class:`DeadlineExceeded`, and calls
+    started before it have their timeouts shortened to the remaining time.
+    ``None`` removes the deadline.
+    """
+    _settings.deadline = None if seconds is None else time.monotonic() + seconds
+
+
+@contextmanager
+def command_deadline(seconds: Optional[float]):
+    """Context manager version of :func:`set_command_deadline`."""
+    previous_deadline = _settings.deadline
+    if seconds is not None:
+        deadline = time.monotonic() + seconds
+        if previous_deadline is not None:
+            deadline = min(deadline, previous_deadline)
+        _settings.deadline = deadline
+    try:
+        yield
+    finally:
+        _settings.deadline = previous_deadline
+
+
+def _get_timeout(timeout: Optional[Tuple[float, float]] = None) -> Tuple[float, float]:
+    connect, read = timeout or (_settings.connect_timeout, _settings.read_timeout)
+    if _settings.deadline is None:
+        return connect, read
+
+    remaining = _settings.deadline - time.monotonic()
+    if remaining <= 0:
+        raise DeadlineExceeded("Command deadline exceeded.")
+
+    return min(connect, remaining), min(read, remaining)
+
+
+def _deadline_passed() -> bool:
+    return _settings.deadline is not None and time.monotonic() >= _settings.deadline
+
+
+def _close_response(future: Future):
+    if future.exception() is None:
+        future.result().close()
+
+
+def _hedged_get(
+    session: requests.Session, url: str, hedge_delay: float, **kwargs
+) -> requests.Response:
+    global _hedge_executor
+    if _hedge_executor is None:
+        _hedge_executor = ThreadPoolExecutor(
+            max_workers=2 * DEFAULT_CONCURRENCY, thread_name_prefix="pyrrowhead-hedge"
+        )
+
+    first = _hedge_executor.submit(session.get, url, **kwargs)
+    done, _ = wait([first], timeout=hedge_delay)
+    if done:
+        return first.result()
+
+    second = _hedge_executor.submit(session.get, url, **kwargs)
+    pending = {first, second}
+    while True:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        succeeded = [future for future in done if future.exception() is None]
+        if succeeded or not pending:
+            winner = (succeeded or list(done))[0]
+            for loser in (done | pending) - {winner}:
+                loser.add_done_callback(_close_response)
+            return winner.result()
+
+
+def _release_on_close(response: requests.Response, release: Callable[[], None]):
+    close = response.close
+
+    def close_and_release():
+        try:
+            close()
+        finally:
+            release()
+
+    response.close = close_and_release  # type: ignore
+
+
+def _send(method: str, session: requests.Session, url: str, **kwargs):
+    try:
+        if method == "GET" and _settings.hedge_delay is not None:
+            return _hedged_get(session, url, _settings.hedge_delay, **kwargs)
+        return session.request(method, url, **kwargs)
+    except requests.Timeout as e:
+        if _deadline_passed():
+            raise DeadlineExceeded(
+                f"Command deadline exceeded during {method} {url}"
+            ) from e
+        raise
+
+
 def get_service(
     url: str,
     cloud_directory: Path,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: Optional[Tuple[float, float]] = None,
+    stream: bool = False,
 ):
-    *certkey, ca_path = get_ssl_files(cloud_directory)
-    resp = requests.get(url, cert=certkey, verify=ca_path)
+    session, release = _session_pool.acquire(url, cloud_directory)
+    try:
+        resp = _send(
+            "GET",
+            session,
+            url,
+            params=params,
+            timeout=_get_timeout(timeout),
+            stream=stream,
+        )
+    except BaseException:
+        release()
+        raise
+    if stream:
+        # The body is still read through the session until the response is closed
+        _release_on_close(resp, release)
+    else:
+        release()
     return resp
 
 
 def post_service(
-    url: str, cloud_directory: Path, json: Union[Dict, List] = None, text: str = ""
+    url: str,
+    cloud_directory: Path,
+    json: Optional[Union[Dict, List]] = None,
+    text: str = "",
+    timeout: Optional[Tuple[float, float]] = None,
 ):
-    *certkey, ca_path = get_ssl_files(cloud_directory)
-    if json:
-        resp = requests.post(url, json=json, cert=certkey, verify=ca_path)
-    elif text:
-        resp = requests.post(url, data=text, cert=certkey, verify=ca_path)
-    else:
-        resp = requests.post(url, cert=certkey, verify=ca_path)
+    session, release = _session_pool.acquire(url, cloud_directory)
+    try:
+        request_timeout = _get_timeout(timeout)
+        if json:
+            resp = _send("POST", session, url, json=json, timeout=request_timeout)
+        elif text:
+            resp = _send("POST", session, url, data=text, timeout=request_timeout)
+        else:
+            resp = _send("POST", session, url, timeout=request_timeout)
+    finally:
+        release()
     return resp
 
 
@@ -44,8 +416,67 @@ def delete_service(
     url: str,
     cloud_directory: Path,
     params: Optional[Dict[str, str]] = None,
+    timeout: Optional[Tuple[float, float]] = None,
 ):
-    *certkey, ca_path = get_ssl_files(cloud_directory)
-
-    resp = requests.delete(url, params=params, cert=certkey, verify=ca_path)
+    session, release = _session_pool.acquire(url, cloud_directory)
+    try:
+        resp = _send(
+            "DELETE", session, url, params=params, timeout=_get_timeout(timeout)
+        )
+    finally:
+        release()
     return resp
+
+
+def get_error_message(response: requests.Response) -> str:
+    try:
+        error_message = response.json().get("errorMessage", response.text)
+    except ValueError:
+        error_message = response.text
+
+    return f"{error_message} (status code {response.status_code})"
+
+
+def get_paged_records(
+    url: str,
+    cloud_directory: Path,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    sort_field: str = "id",
+    direction: str = "ASC",
+) -> Iterator[Dict]:
+    """
+    Lazily walk a paged management endpoint and yield its records one by one.
+
+    Pages of ``page_size`` records are requested one at a time, so the next page is
+    only fetched once all records of the previous page have been consumed. Each page
+    is parsed incrementally while it is read from the connection, so only one record
+    at a time is held in memory.
+
+    Raises:
+        PyrrowheadError: If the core system responds with an error.
+    """
+    page = 0
+    while True:
+        response = get_service(
+            url,
+            cloud_directory,
+            params={
+                "page": page,
+                "item_per_page": page_size,
+                "sort_field": sort_field,
+                "direction": direction,
+            },
+            stream=True,
+        )
+        with response:
+            if response.status_code >= 400:
+                raise PyrrowheadError(get_error_message(response))
+
+            record_count = 0
+            for record in iter_json_array(response.iter_content(STREAM_CHUNK_SIZE)):
+                record_count += 1
+                yield record
+
+        if record_count < page_size:
+            return
+        page += 1
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, NamedTuple
+
+import requests
+from rich.console import Console
+from rich.table import Table
+
+from pyrrowhead import rich_console
+from pyrrowhead.utils import PyrrowheadError
+
+DEFAULT_WATCH_INTERVAL = 2.0
+MAX_WATCH_INTERVAL = 30.0
+
+
+def content_hash(record: Dict) -> str:
+    """Return a hash of the content of a record, independent of key order."""
+    return hashlib.blake2b(
+        json.dumps(record, sort_keys=True, separators=(",", ":")).encode(),
+        digest_size=16,
+    ).hexdigest()
+
+
+class RecordDiff(NamedTuple):
+    added: List[Dict]
+    changed: List[Dict]
+    removed: List[int]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+
+class RecordTracker:
+    """
+    Tracks the records of consecutive list responses by id and content hash.
+
+    Only the hashes of the previous response are kept, so memory use does not grow
+    with the number of polls.
+    """
+
+    def __init__(self):
+        self.hashes: Dict[int, str] = {}
+
+    def update(self, records: Iterable[Dict]) -> RecordDiff:
+        """Return the difference between ``records`` and the previous records."""
+        hashes: Dict[int, str] = {}
+        added, changed = [], []
+        for record in records:
+            record_hash = content_hash(record)
+            hashes[record["id"]] = record_hash
+            previous_hash = self.hashes.get(record["id"])
+            if previous_hash is None:
+                added.append(record)
+            elif previous_hash != record_hash:
+                changed.append(record)
+        removed = sorted(self.hashes.keys() - hashes.keys())
+        self.hashes = hashes
+
+        return RecordDiff(added, changed, removed)
+
+
+class AdaptiveInterval:
+    """
+    Polling interval that backs off while nothing changes.
+
+    The interval is multiplied by ``backoff`` after every poll without changes, up
+    to ``maximum``, and reset to ``minimum`` as soon as something changes.
+    """
+
+    def __init__(self, minimum: float, maximum: float, backoff: float = 2.0):
+        self.minimum = minimum
+        self.maximum = max(minimum, maximum)
+        self.backoff = backoff
+        self.current = minimum
+
+    def update(self, changed: bool) -> float:
+        if changed:
+            self.current = self.minimum
+        else:
+            self.current = min(self.current * self.backoff, self.maximum)
+        return self.current
+
+
+def _titled(table: Table, title: str) -> Table:
+    table.title = title
+    return table
+
+
+def print_diff(
+    diff: RecordDiff,
+    create_table: Callable[[List[Dict]], Table],
+    console: Console = rich_console,
+):
+    """Print the added and changed rows of a diff, and the ids of removed records."""
+    console.rule(datetime.now().strftime("%H:%M:%S"))
+    if diff.added:
+        console.print(_titled(create_table(diff.added), "[green]Added[/green]"))
+    if diff.changed:
+        console.print(_titled(create_table(diff.changed), "[yellow]Changed[/yellow]"))
+    if diff.removed:
+        console.print(f'[red]Removed[/red] id: {", ".join(map(str, diff.removed))}')
+
+
+def watch_records(
+    fetch: Callable[[], Iterable[Dict]],
+    create_table: Callable[[List[Dict]], Table],
+    interval: float = DEFAULT_WATCH_INTERVAL,
+    max_interval: float = MAX_WATCH_INTERVAL,
+    console: Console = rich_console,
+    sleep: Callable[[float], None] = time.sleep,
+):
+    """
+    Poll a list endpoint until interrupted, printing only what changed.
+
+    The first response is printed in full. After that each response is diffed
+    against the previous one, and only added and changed rows and removed ids are
+    printed. Polling starts every ``interval`` seconds and backs off to
+    ``max_interval`` while nothing changes, and never polls more often than a
+    response takes to fetch. Errors after the first poll, including connection
+    errors and timeouts, are printed and polling continues with a back off.
+
+    Raises:
+        ValueError: If the first poll fails because of an invalid filter.
+        PyrrowheadError: If the first poll fails.
+    """
+    tracker = RecordTracker()
+    polling_interval = AdaptiveInterval(interval, max_interval)
+    started = time.monotonic()
+    console.print(create_table(tracker.update(fetch()).added))
+    fetch_time = time.monotonic() - started
+
+    try:
+        while True:
+            sleep(max(polling_interval.current, fetch_time))
+            started = time.monotonic()
+            try:
+                diff = tracker.update(fetch())
+            except (PyrrowheadError, requests.RequestException, OSError) as e:
+                console.print(e)
+                polling_interval.update(changed=False)
+                continue
+            fetch_time = time.monotonic() - started
+            if diff:
+                print_diff(diff, create_table, console)
+            polling_interval.update(changed=bool(diff))
+    except KeyboardInterrupt:
+        pass
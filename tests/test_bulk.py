@@ -0,0 +1,200 @@
+import json
+from itertools import product
+
+import pytest
+
+from pyrrowhead.management.bulk import (
+    load_manifest,
+    load_service_registrations,
+    validate_orchestration_rule,
+    chunk_rules,
+    compact_authorization_rules,
+    AuthorizationRule,
+    ServiceRegistration,
+)
+from pyrrowhead.management.client import ArrowheadClient
+from pyrrowhead.management.common import AccessPolicy
+from pyrrowhead.utils import PyrrowheadError
+
+SERVICE_RECORD = {
+    "service_definition": "temperature",
+    "uri": "/temperature",
+    "interface": "HTTP-SECURE-JSON",
+    "system_name": "sensor",
+    "address": "127.0.0.1",
+    "port": 5000,
+}
+
+RULE_RECORD = {
+    "service_definition": "temperature",
+    "interface": "HTTP-SECURE-JSON",
+    "provider_name": "sensor",
+    "provider_address": "127.0.0.1",
+    "provider_port": 5000,
+    "consumer_name": "display",
+}
+
+
+def test_load_manifest_formats(tmp_path):
+    yaml_manifest = tmp_path / "manifest.yaml"
+    yaml_manifest.write_text(
+        "services:\n"
+        "  - service_definition: temperature\n"
+        "    uri: /temperature\n"
+        "    interface: HTTP-SECURE-JSON\n"
+        "    system_name: sensor\n"
+        "    address: 127.0.0.1\n"
+        "    port: 5000\n"
+    )
+    csv_manifest = tmp_path / "manifest.csv"
+    csv_manifest.write_text(
+        ",".join(SERVICE_RECORD) + "\n" + ",".join(map(str, SERVICE_RECORD.values()))
+    )
+    ndjson_manifest = tmp_path / "manifest.ndjson"
+    ndjson_manifest.write_text(json.dumps(SERVICE_RECORD) + "\n\n")
+
+    expected = [
+        ServiceRegistration(
+            "temperature",
+            "/temperature",
+            "HTTP-SECURE-JSON",
+            AccessPolicy.CERTIFICATE,
+            ("sensor", "127.0.0.1", 5000),
+        )
+    ]
+    for manifest in (yaml_manifest, csv_manifest, ndjson_manifest):
+        assert load_service_registrations(manifest) == expected
+
+
+def test_load_manifest_unsupported_format(tmp_path):
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("")
+
+    with pytest.raises(PyrrowheadError):
+        load_manifest(manifest)
+
+
+def test_invalid_service_records_are_all_reported(tmp_path):
+    manifest = tmp_path / "manifest.ndjson"
+    manifest.write_text(
+        "\n".join(
+            json.dumps(record)
+            for record in (
+                SERVICE_RECORD,
+                {**SERVICE_RECORD, "port": "abc"},
+                {**SERVICE_RECORD, "access_policy": "OPEN"},
+                {**SERVICE_RECORD, "uri": ""},
+            )
+        )
+    )
+
+    with pytest.raises(PyrrowheadError) as exc_info:
+        load_service_registrations(manifest)
+
+    message = str(exc_info.value)
+    assert "3 invalid" in message
+    assert "service 1" in message and "service 2" in message
+    assert "service 3" in message and "service 0" not in message
+
+
+def test_non_scalar_integer_fields_are_reported(tmp_path):
+    manifest = tmp_path / "manifest.yaml"
+    manifest.write_text(
+        "- {service_definition: temperature, uri: /temperature, "
+        "interface: HTTP-SECURE-JSON, system_name: sensor, address: 127.0.0.1, "
+        "port: [5000]}\n"
+    )
+
+    with pytest.raises(PyrrowheadError, match="field 'port' must be an integer"):
+        load_service_registrations(manifest)
+    for field in ("provider_port", "consumer_port", "priority"):
+        with pytest.raises(ValueError, match=field):
+            validate_orchestration_rule({**RULE_RECORD, field: {"value": 1}})
+
+
+def test_chunk_rules():
+    rules = [validate_orchestration_rule(RULE_RECORD)] * 5
+
+    chunks = chunk_rules(rules, 2)
+
+    assert [(chunk.chunk_index, chunk.first_rule) for chunk in chunks] == [
+        (0, 0),
+        (1, 2),
+        (2, 4),
+    ]
+    assert [len(chunk.rules) for chunk in chunks] == [2, 2, 1]
+
+
+def test_add_orchestration_rules_isolates_failed_chunk(monkeypatch):
+    client = ArrowheadClient.__new__(ArrowheadClient)
+    monkeypatch.setattr(
+        client,
+        "list_systems",
+        lambda: iter([{"id": 7, "systemName": "display", "address": "", "port": 1}]),
+    )
+    posted = []
+
+    def add_chunk(chunk):
+        posted.append(chunk)
+        if any(rule.priority == 2 for rule in chunk.rules):
+            return {"errorMessage": "bad rule"}, 400
+        return {"data": []}, 201
+
+    monkeypatch.setattr(client, "add_orchestration_rule_chunk", add_chunk)
+    rules = [
+        validate_orchestration_rule({**RULE_RECORD, "priority": priority})
+        for priority in (1, 1, 1, 2, 1)
+    ]
+
+    results = list(client.add_orchestration_rules(rules, chunk_size=3))
+
+    assert all(rule.consumer_id == 7 for chunk in posted for rule in chunk.rules)
+    assert [(r.item.chunk_index, r.item.first_rule, r.ok) for r in results] == [
+        (0, 0, True),
+        (1, 3, False),
+        (1, 4, True),
+    ]
+
+
+def test_unresolved_consumers_are_reported_before_posting(monkeypatch):
+    client = ArrowheadClient.__new__(ArrowheadClient)
+    monkeypatch.setattr(client, "list_systems", lambda: iter([]))
+    monkeypatch.setattr(client, "add_orchestration_rule_chunk", pytest.fail)
+
+    with pytest.raises(PyrrowheadError) as exc_info:
+        list(
+            client.add_orchestration_rules(
+                [validate_orchestration_rule(RULE_RECORD)] * 2
+            )
+        )
+
+    assert "2 orchestration rule(s)" in str(exc_info.value)
+
+
+def test_compact_authorization_rules_creates_exactly_the_given_rules():
+    rules = [
+        AuthorizationRule(1, provider, interface, service_definition)
+        for provider, interface, service_definition in product(
+            (10, 11, 12), (100, 101), (20, 21)
+        )
+    ]
+    rules += [AuthorizationRule(2, provider, 100, 20) for provider in (10, 11, 12)]
+    rules += [AuthorizationRule(2, 13, 101, 22), AuthorizationRule(1, 10, 100, 20)]
+
+    auth_requests = compact_authorization_rules(rules)
+
+    created = [
+        AuthorizationRule(request.consumer_id, *ids)
+        for request in auth_requests
+        for ids in product(
+            request.provider_ids,
+            request.interface_ids,
+            request.service_definition_ids,
+        )
+    ]
+    assert sorted(created) == sorted(set(rules))
+    assert all(
+        len(request.provider_ids) == 1 or len(request.service_definition_ids) == 1
+        for request in auth_requests
+    )
+    assert len(auth_requests) == 4
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from pyrrowhead.management.async_client import AsyncManagementClient
+from pyrrowhead.utils import PyrrowheadError
+
+
+class FakeClient:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.listing_threads = []
+
+    def remove_system(self, system_id):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.02)
+        with self.lock:
+            self.in_flight -= 1
+        if system_id < 0:
+            raise PyrrowheadError(f"No system with id {system_id}")
+        return {}, 200
+
+    def list_systems(self):
+        for system_id in range(3):
+            self.listing_threads.append(threading.current_thread().name)
+            yield {"id": system_id}
+
+
+def run(client, operations):
+    async def main():
+        async with AsyncManagementClient(concurrency=4, client=client) as async_client:
+            return await operations(async_client)
+
+    return asyncio.run(main())
+
+
+def test_concurrency_is_bounded():
+    client = FakeClient()
+
+    results = run(
+        client,
+        lambda async_client: asyncio.gather(
+            *(async_client.remove_system(system_id) for system_id in range(20))
+        ),
+    )
+
+    assert results == [({}, 200)] * 20
+    assert client.max_in_flight == 4
+
+
+def test_listings_are_collected_in_worker_threads():
+    client = FakeClient()
+
+    systems = run(client, lambda async_client: async_client.list_systems())
+
+    assert systems == [{"id": 0}, {"id": 1}, {"id": 2}]
+    assert len(client.listing_threads) == 3
+    assert all(name.startswith("pyrrowhead") for name in client.listing_threads)
+
+
+def test_errors_propagate():
+    client = FakeClient()
+
+    with pytest.raises(PyrrowheadError):
+        run(
+            client,
+            lambda async_client: asyncio.gather(
+                async_client.remove_system(1), async_client.remove_system(-1)
+            ),
+        )
@@ -0,0 +1,163 @@
+import io
+import json
+from collections import Counter
+
+from pyrrowhead.management.audit import (
+    DANGLING_REFERENCE,
+    DUPLICATE,
+    MISSING_AUTHORIZATION,
+    UNREGISTERED_SERVICE,
+    audit,
+    report_issues,
+)
+
+
+def system(system_id, name=None):
+    return {
+        "id": system_id,
+        "systemName": name or f"system-{system_id}",
+        "address": "127.0.0.1",
+        "port": 5000 + system_id,
+    }
+
+
+def service(
+    service_id,
+    provider,
+    definition="temperature",
+    interface="HTTP-INSECURE-JSON",
+    uri="/temperature",
+):
+    return {
+        "id": service_id,
+        "provider": provider,
+        "serviceDefinition": {"serviceDefinition": definition},
+        "serviceUri": uri,
+        "interfaces": [{"interfaceName": interface}],
+    }
+
+
+def authorization_rule(rule_id, consumer, provider, definition="temperature"):
+    return {
+        "id": rule_id,
+        "consumerSystem": consumer,
+        "providerSystem": provider,
+        "serviceDefinition": {"serviceDefinition": definition},
+        "interfaces": [{"interfaceName": "HTTP-INSECURE-JSON"}],
+    }
+
+
+def orchestration_rule(
+    rule_id, consumer, provider, definition="temperature", foreign=False
+):
+    return {
+        "id": rule_id,
+        "consumerSystem": consumer,
+        "providerSystem": provider,
+        "serviceDefinition": {"serviceDefinition": definition},
+        "serviceInterface": {"interfaceName": "HTTP-INSECURE-JSON"},
+        "foreign": foreign,
+    }
+
+
+SENSOR = system(1)
+DISPLAY = system(2)
+REMOVED = system(3)
+
+
+def test_consistent_cloud():
+    issues = audit(
+        [SENSOR, DISPLAY],
+        [service(10, SENSOR)],
+        [orchestration_rule(20, DISPLAY, SENSOR)],
+        [authorization_rule(30, DISPLAY, SENSOR)],
+    )
+
+    assert list(issues) == []
+
+
+def test_audit_finds_every_kind_of_issue():
+    issues = list(
+        audit(
+            [SENSOR, DISPLAY, {**system(4), "systemName": "system-1", "port": 5001}],
+            [service(10, SENSOR), service(11, SENSOR), service(12, REMOVED)],
+            [
+                orchestration_rule(20, DISPLAY, SENSOR),
+                orchestration_rule(21, DISPLAY, SENSOR),
+                orchestration_rule(22, DISPLAY, SENSOR, definition="humidity"),
+                orchestration_rule(23, REMOVED, system(1, "other"), foreign=True),
+            ],
+            [
+                authorization_rule(30, DISPLAY, SENSOR),
+                authorization_rule(31, DISPLAY, SENSOR),
+                authorization_rule(32, DISPLAY, REMOVED),
+            ],
+        )
+    )
+
+    assert {(issue.check, issue.kind, issue.record_id) for issue in issues} == {
+        (DUPLICATE, "system", 4),
+        (DUPLICATE, "service", 11),
+        (DANGLING_REFERENCE, "service", 12),
+        (DUPLICATE, "authorization", 31),
+        (DANGLING_REFERENCE, "authorization", 32),
+        (DUPLICATE, "orchestration", 21),
+        (UNREGISTERED_SERVICE, "orchestration", 22),
+        (MISSING_AUTHORIZATION, "orchestration", 22),
+        (DANGLING_REFERENCE, "orchestration", 23),
+    }
+    assert len(issues) == 9
+
+
+def test_services_at_different_uris_are_not_duplicates():
+    issues = audit(
+        [SENSOR, DISPLAY],
+        [service(10, SENSOR), service(11, SENSOR, uri="/temperature/celsius")],
+        [orchestration_rule(20, DISPLAY, SENSOR)],
+        [authorization_rule(30, DISPLAY, SENSOR)],
+    )
+
+    assert list(issues) == []
+
+
+def test_report_issues_streams():
+    report_file = io.StringIO()
+    issues = report_issues(
+        audit([SENSOR, SENSOR], [service(12, REMOVED)], [], []), report_file
+    )
+
+    first_issue = next(issues)
+    assert json.loads(report_file.getvalue()) == first_issue._asdict()
+    assert len(list(issues)) == 1
+    assert len(report_file.getvalue().splitlines()) == 2
+
+
+def test_audit_consumes_each_dataset_once():
+    consumed = Counter()
+
+    def once(name, records):
+        for record in records:
+            consumed[name] += 1
+            yield record
+
+    systems = [system(system_id) for system_id in range(1000)]
+    issues = audit(
+        once("systems", systems),
+        once("services", [service(i, systems[i]) for i in range(1000)]),
+        once(
+            "orchestration",
+            [orchestration_rule(i, systems[i], systems[i - 1]) for i in range(1, 1000)],
+        ),
+        once(
+            "authorization",
+            [authorization_rule(i, systems[i], systems[i - 1]) for i in range(1, 1000)],
+        ),
+    )
+
+    assert list(issues) == []
+    assert consumed == {
+        "systems": 1000,
+        "services": 1000,
+        "orchestration": 999,
+        "authorization": 999,
+    }
@@ -0,0 +1,59 @@
+import os
+import time
+
+import pytest
+
+from pyrrowhead.management import cache
+from pyrrowhead.management.cache import SnapshotCache
+
+RECORDS = [{"id": 1, "systemName": "a"}, {"id": 2, "systemName": "b"}]
+
+
+@pytest.fixture
+def snapshot_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "_settings", cache._CacheSettings())
+    return SnapshotCache(tmp_path / "cache")
+
+
+def test_cached_records_are_reused(snapshot_cache):
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return iter(RECORDS)
+
+    assert list(snapshot_cache.cached("systems", fetch)) == RECORDS
+    assert list(snapshot_cache.cached("systems", fetch)) == RECORDS
+    assert len(fetches) == 1
+
+
+def test_expired_and_partial_snapshots_are_not_used(snapshot_cache):
+    records = snapshot_cache.cached("systems", lambda: iter(RECORDS))
+    next(records)
+    records.close()
+    assert snapshot_cache.get("systems") is None
+
+    snapshot_cache.store("systems", RECORDS, time.time())
+    old = time.time() - cache.DEFAULT_CACHE_TTL - 1
+    os.utime(snapshot_cache.directory / "systems.ndjson", (old, old))
+    assert snapshot_cache.get("systems") is None
+
+
+def test_invalidation_discards_snapshots_and_in_flight_fetches(snapshot_cache):
+    snapshot_cache.store("systems", RECORDS, time.time())
+    records = snapshot_cache.cached("services", lambda: iter(RECORDS))
+    next(records)
+
+    snapshot_cache.invalidate()
+    list(records)
+
+    assert snapshot_cache.get("systems") is None
+    assert snapshot_cache.get("services") is None
+
+
+def test_fresh_bypasses_cache(snapshot_cache):
+    snapshot_cache.store("systems", RECORDS, time.time())
+
+    cache.configure_cache(fresh=True)
+
+    assert snapshot_cache.get("systems") is None
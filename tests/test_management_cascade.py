@@ -0,0 +1,118 @@
+import pytest
+from typer.testing import CliRunner
+
+from pyrrowhead.management.cascade import (
+    execute_cascade,
+    format_id_ranges,
+    plan_cascade,
+)
+from pyrrowhead.management.cli import system
+from pyrrowhead.utils import PyrrowheadError
+
+LINE_SENSOR = {"id": 1, "systemName": "line-sensor"}
+LINE_DISPLAY = {"id": 2, "systemName": "line-display"}
+DASHBOARD = {"id": 3, "systemName": "dashboard"}
+
+
+def rule(rule_id, consumer, provider, foreign=False):
+    return {
+        "id": rule_id,
+        "consumerSystem": consumer,
+        "providerSystem": provider,
+        "foreign": foreign,
+    }
+
+
+class FakeClient:
+    def __init__(self, failing_ids=()):
+        self.removed = []
+        self.failing_ids = set(failing_ids)
+
+    def list_systems(self):
+        return iter([LINE_SENSOR, LINE_DISPLAY, DASHBOARD])
+
+    def list_services(self):
+        return iter(
+            [{"id": 10, "provider": LINE_SENSOR}, {"id": 11, "provider": DASHBOARD}]
+        )
+
+    def list_orchestration_rules(self):
+        return iter(
+            [
+                rule(20, LINE_DISPLAY, LINE_SENSOR),
+                rule(21, DASHBOARD, LINE_SENSOR),
+                rule(22, DASHBOARD, {"id": 1, "systemName": "other"}, foreign=True),
+            ]
+        )
+
+    def list_authorization_rules(self):
+        return iter(
+            [rule(30, DASHBOARD, LINE_SENSOR), rule(31, LINE_SENSOR, DASHBOARD)]
+        )
+
+    def _remover(kind):
+        def remove(self, record_id):
+            self.removed.append((kind, record_id))
+            if record_id in self.failing_ids:
+                return {"errorMessage": "Failed"}, 500
+            return {}, 200
+
+        return remove
+
+    remove_authorization_rule = _remover("authorization")
+    remove_orchestration_rule = _remover("orchestration")
+    delete_service = _remover("service")
+    remove_system = _remover("system")
+
+
+def test_cascade_removes_dependents_first():
+    client = FakeClient()
+
+    plan = plan_cascade(client, [1, 2])
+    results = execute_cascade(client, plan, concurrency=1)
+
+    assert len(plan) == 7
+    assert client.removed == [
+        ("authorization", 30),
+        ("authorization", 31),
+        ("orchestration", 20),
+        ("orchestration", 21),
+        ("service", 10),
+        ("system", 1),
+        ("system", 2),
+    ]
+    assert all(result.ok for step in results.values() for result in step)
+
+
+def test_cascade_stops_after_failed_step():
+    client = FakeClient(failing_ids=[20])
+
+    results = execute_cascade(client, plan_cascade(client, [1]), concurrency=1)
+
+    assert list(results) == ["authorization", "orchestration"]
+    assert ("system", 1) not in client.removed
+
+
+def test_cascade_unknown_system():
+    with pytest.raises(PyrrowheadError):
+        plan_cascade(FakeClient(), [1, 99])
+
+
+def test_format_id_ranges():
+    assert format_id_ranges([12, 4, 10, 11, 13, 4]) == "4,10-13"
+    assert format_id_ranges([]) == ""
+
+
+def test_remove_dry_run_without_cascade(monkeypatch):
+    removed = []
+    monkeypatch.setattr(
+        system.systemregistry,
+        "remove_system",
+        lambda system_id: removed.append(system_id) or ({}, 200),
+    )
+
+    result = CliRunner().invoke(system.sys_app, ["remove", "5", "7-8", "--dry-run"])
+
+    assert result.exit_code == 0
+    assert "5,7-8" in result.output
+    assert removed == []
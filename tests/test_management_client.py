@@ -0,0 +1,57 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import requests
+from typer.testing import CliRunner
+
+from pyrrowhead.management.cli import service
+from pyrrowhead.management.client import ArrowheadClient
+
+
+def response(status_code, json_data=None):
+    mock_response = Mock(status_code=status_code)
+    if json_data is None:
+        mock_response.json.side_effect = json.JSONDecodeError("Expecting value", "", 0)
+    else:
+        mock_response.json.return_value = json_data
+    return mock_response
+
+
+def test_inspect_services_reports_errors_per_service():
+    client = object.__new__(ArrowheadClient)
+
+    def get(core_system, path):
+        service_id = int(path.rsplit("/", 1)[1])
+        if service_id == 2:
+            raise requests.ReadTimeout("Read timed out")
+        if service_id == 3:
+            return response(502)
+        return response(200, {"id": service_id})
+
+    client.get = get  # type: ignore
+
+    results = list(client.inspect_services([1, 2, 3, 4], concurrency=2))
+
+    assert [(service_id, status) for service_id, _, status in results] == [
+        (1, 200),
+        (2, 0),
+        (3, 502),
+        (4, 200),
+    ]
+    assert "Read timed out" in results[1][1]["errorMessage"]
+    assert results[2][1] == {"errorMessage": "Could not inspect service 3."}
+    assert results[3][1] == {"id": 4}
+
+
+def test_inspect_without_ids_is_a_usage_error(monkeypatch):
+    def read():
+        raise AssertionError("stdin must not be read when it is a terminal")
+
+    terminal = SimpleNamespace(isatty=lambda: True, read=read)
+    monkeypatch.setattr(service, "sys", SimpleNamespace(stdin=terminal))
+
+    result = CliRunner().invoke(service.sr_app, ["inspect"])
+
+    assert result.exit_code == 2
+    assert "SERVICE_ID" in result.output
@@ -0,0 +1,22 @@
+import pytest
+
+from pyrrowhead.management.common import parse_id_ranges
+
+
+@pytest.mark.parametrize(
+    "values, ids",
+    [
+        (["4"], [4]),
+        (["4", "10-12"], [4, 10, 11, 12]),
+        (["4,10-12 7"], [4, 10, 11, 12, 7]),
+        ([], []),
+    ],
+)
+def test_parse_id_ranges(values, ids):
+    assert parse_id_ranges(values) == ids
+
+
+@pytest.mark.parametrize("value", ["abc", "12-10", "1-a"])
+def test_parse_id_ranges_bad(value):
+    with pytest.raises(ValueError):
+        parse_id_ranges([value])
@@ -0,0 +1,75 @@
+import pytest
+
+from pyrrowhead.management.filters import (
+    RecordFilter,
+    SERVICE_FIELDS,
+    SYSTEM_FIELDS,
+    equality_filter,
+    parse_filter,
+)
+
+
+def make_service(service_id, definition, provider, interfaces, metadata=None):
+    return {
+        "id": service_id,
+        "serviceDefinition": {"id": 1, "serviceDefinition": definition},
+        "provider": {"id": 10, "systemName": provider},
+        "interfaces": [{"interfaceName": interface} for interface in interfaces],
+        "serviceUri": "/",
+        "secure": "CERTIFICATE",
+        "metadata": metadata,
+    }
+
+
+SERVICES = [
+    make_service(1, "temperature", "sensor", ["HTTP-SECURE-JSON"], {"unit": "C"}),
+    make_service(2, "temperature", "sensor", ["HTTP-INSECURE-JSON"]),
+    make_service(3, "humidity", "weather", ["HTTP-SECURE-JSON", "COAP-SECURE-CBOR"]),
+]
+
+
+def matching_ids(expression):
+    record_filter = RecordFilter.parse(expression, SERVICE_FIELDS)
+    return [service["id"] for service in record_filter.apply(SERVICES)]
+
+
+def test_parse_filter():
+    assert parse_filter("provider=sensor and interface ~ 'HTTP-*'") == [
+        ("provider", "=", "sensor"),
+        ("interface", "~", "HTTP-*"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "expression", ["provider", "provider=a and", "=a", "'unclosed"]
+)
+def test_malformed_filter(expression):
+    with pytest.raises(ValueError):
+        parse_filter(expression)
+
+
+def test_unknown_field():
+    with pytest.raises(ValueError):
+        RecordFilter.parse("systemName=a", SYSTEM_FIELDS)
+    with pytest.raises(ValueError):
+        RecordFilter.parse("meta.unit=C", SYSTEM_FIELDS)
+
+
+def test_filter_operators():
+    assert matching_ids(None) == [1, 2, 3]
+    assert matching_ids("definition=temperature") == [1, 2]
+    assert matching_ids("definition!=temperature") == [3]
+    assert matching_ids("interface~COAP-*") == [3]
+    assert matching_ids("interface!~HTTP-SECURE-*") == [2]
+    assert matching_ids("meta.unit=C") == [1]
+    assert matching_ids("provider=sensor and interface~*-SECURE-*") == [1]
+
+
+def test_equality_filter():
+    record_filter = equality_filter(
+        SERVICE_FIELDS, definition="humidity", provider=None
+    ) & RecordFilter.parse("id=3", SERVICE_FIELDS)
+
+    assert record_filter.equality_value("definition") == "humidity"
+    assert record_filter.equality_value("provider") is None
+    assert [service["id"] for service in record_filter.apply(SERVICES)] == [3]
@@ -0,0 +1,38 @@
+from pyrrowhead.management.graph import DependencyGraph, Dependent
+
+
+def system(system_id):
+    return {"id": system_id, "systemName": f"system-{system_id}"}
+
+
+def rule(consumer_id, provider_id, foreign=False):
+    return {
+        "consumerSystem": system(consumer_id),
+        "providerSystem": system(provider_id),
+        "serviceDefinition": {"serviceDefinition": f"service-{provider_id}"},
+        "foreign": foreign,
+    }
+
+
+def test_impact_follows_consumers_transitively():
+    graph = DependencyGraph.from_rules(
+        [rule(2, 1), rule(3, 2), rule(4, 3), rule(5, 9, foreign=True)],
+        [rule(3, 1), rule(6, 5)],
+    )
+
+    assert graph.impact([1]) == [Dependent(2, 1), Dependent(3, 1), Dependent(4, 2)]
+    assert graph.impact([4]) == []
+    assert graph.sources[(3, 1)] == {"authorization"}
+    assert 9 not in graph.systems
+    assert graph.hot_spots(2) == [(1, 2), (2, 1)]
+
+
+def test_strongly_connected_components():
+    chain = [rule(system_id + 1, system_id) for system_id in range(5000)]
+    cycles = [rule(0, 5000), rule(6001, 6002), rule(6002, 6001), rule(7000, 7000)]
+
+    graph = DependencyGraph.from_rules(chain + cycles)
+
+    components = graph.strongly_connected_components()
+    assert [len(component) for component in components] == [5001, 2, 1]
+    assert components[1:] == [[6001, 6002], [7000]]
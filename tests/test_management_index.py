@@ -0,0 +1,103 @@
+import pytest
+
+from pyrrowhead.management.index import (
+    SystemIndex,
+    ServiceIndex,
+    ServiceSearchIndex,
+    parse_search_term,
+    SYSTEM_NOT_FOUND,
+    SYSTEM_AMBIGUOUS,
+)
+from pyrrowhead.utils import PyrrowheadError
+
+SYSTEMS = [
+    {"id": 1, "systemName": "sensor", "address": "10.0.0.1", "port": 5000},
+    {"id": 2, "systemName": "sensor", "address": "10.0.0.2", "port": 5000},
+    {"id": 3, "systemName": "display", "address": "10.0.0.3", "port": 6000},
+]
+
+
+def test_system_index_lookup():
+    index = SystemIndex(SYSTEMS)
+
+    assert index.lookup("display") == 3
+    assert index.lookup("sensor") == SYSTEM_AMBIGUOUS
+    assert index.lookup("sensor", "10.0.0.2", 5000) == 2
+    assert index.lookup("sensor", "10.0.0.3", 5000) == SYSTEM_NOT_FOUND
+    assert index.lookup("actuator") == SYSTEM_NOT_FOUND
+
+
+def test_system_index_lookup_many():
+    index = SystemIndex(SYSTEMS)
+
+    assert index.lookup_many(["display", ("sensor", "10.0.0.1", 5000), "actuator"]) == [
+        3,
+        1,
+        SYSTEM_NOT_FOUND,
+    ]
+
+
+def test_service_index_lookup():
+    grouped = {
+        "servicesGroupedByServiceDefinition": [
+            {
+                "serviceDefinition": "temperature",
+                "providerServices": [
+                    {
+                        "serviceDefinition": {"id": 10},
+                        "provider": SYSTEMS[0],
+                        "interfaces": [
+                            {"id": 20, "interfaceName": "HTTP-SECURE-JSON"},
+                            {"id": 21, "interfaceName": "HTTP-INSECURE-JSON"},
+                        ],
+                    },
+                ],
+            },
+        ]
+    }
+    index = ServiceIndex(grouped)
+
+    assert index.lookup(
+        "temperature", "HTTP-INSECURE-JSON", "sensor", "10.0.0.1", 5000
+    ) == (10, 21, 1)
+    with pytest.raises(PyrrowheadError, match="any services"):
+        index.lookup("humidity", "HTTP-SECURE-JSON", "sensor", "10.0.0.1", 5000)
+    with pytest.raises(PyrrowheadError, match="provider sensor@10.0.0.2:5000"):
+        index.lookup("temperature", "HTTP-SECURE-JSON", "sensor", "10.0.0.2", 5000)
+    with pytest.raises(PyrrowheadError, match="interface COAP"):
+        index.lookup("temperature", "COAP", "sensor", "10.0.0.1", 5000)
+
+
+def test_parse_search_term():
+    assert parse_search_term("provider=sensor") == ("provider", "sensor")
+    assert parse_search_term("unit=celsius") == ("meta", "unit", "celsius")
+    assert parse_search_term("meta.provider=x") == ("meta", "provider", "x")
+    assert parse_search_term("unit") == ("key", "unit")
+    with pytest.raises(ValueError):
+        parse_search_term("=celsius")
+
+
+def test_service_search_index():
+    services = [
+        {
+            "id": service_id,
+            "serviceDefinition": {"serviceDefinition": definition},
+            "provider": SYSTEMS[service_id % 2],
+            "interfaces": [{"interfaceName": "HTTP-SECURE-JSON"}],
+            "metadata": metadata,
+        }
+        for service_id, definition, metadata in (
+            (3, "temperature", {"unit": "celsius", "floor": 2}),
+            (1, "temperature", {"unit": "kelvin"}),
+            (2, "humidity", None),
+        )
+    ]
+    index = ServiceSearchIndex(services)
+
+    def search(*terms):
+        return [service["id"] for service in index.search(terms)]
+
+    assert search("definition=temperature") == [1, 3]
+    assert search("definition=temperature", "floor=2") == [3]
+    assert search("unit", "provider=sensor") == [1, 3]
+    assert search("interface=HTTP-SECURE-JSON", "unit=fahrenheit") == []
@@ -0,0 +1,61 @@
+import configparser
+
+import pytest
+
+from pyrrowhead.management import multicloud
+from pyrrowhead.management.systemregistry import create_system_table
+from pyrrowhead.utils import PyrrowheadError
+
+
+@pytest.fixture
+def local_clouds(monkeypatch, tmp_path):
+    config = configparser.ConfigParser()
+    config["local-clouds"] = {
+        "c1.org": str(tmp_path / "c1"),
+        "c2.org": str(tmp_path / "c2"),
+        "down.org": str(tmp_path / "down"),
+    }
+    monkeypatch.setattr(multicloud, "get_config", lambda: config)
+    return config
+
+
+class FakeClient:
+    def __init__(self, cloud_directory):
+        if cloud_directory.name == "down":
+            raise PyrrowheadError("Could not connect to the service registry.")
+        self.cloud_name = cloud_directory.name
+
+    def list_systems(self):
+        port = 5000 if self.cloud_name == "c1" else 6000
+        return iter(
+            [{"id": 1, "systemName": "sensor", "address": "127.0.0.1", "port": port}]
+        )
+
+
+def test_select_clouds(local_clouds, tmp_path):
+    assert list(multicloud.select_clouds([], all_clouds=True)) == [
+        "c1.org",
+        "c2.org",
+        "down.org",
+    ]
+    assert multicloud.select_clouds(["c2.org", "c2.org"]) == {"c2.org": tmp_path / "c2"}
+    with pytest.raises(PyrrowheadError):
+        multicloud.select_clouds(["c3.org"])
+
+
+def test_fan_out_isolates_failing_clouds(local_clouds, monkeypatch):
+    monkeypatch.setattr(multicloud, "ArrowheadClient", FakeClient)
+
+    results = multicloud.fan_out(
+        lambda client: client.list_systems(),
+        multicloud.select_clouds([], all_clouds=True),
+    )
+
+    assert [result.cloud for result in results] == ["c1.org", "c2.org", "down.org"]
+    assert [len(result.records) for result in results] == [1, 1, 0]
+    assert results[2].error == "Could not connect to the service registry."
+
+    table = multicloud.create_multicloud_table(results, create_system_table)
+    assert [column.header for column in table.columns][:2] == ["Cloud", "id"]
+    assert list(table.columns[0].cells) == ["c1.org", "c2.org"]
+    assert list(table.columns[-1].cells) == ["5000", "6000"]
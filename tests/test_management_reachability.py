@@ -0,0 +1,55 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from pyrrowhead.management.reachability import ReachabilityMatrix  # noqa: E402
+
+DISPLAY = {"id": 1, "systemName": "display"}
+LOGGER = {"id": 2, "systemName": "logger"}
+SENSOR = {"id": 3, "systemName": "sensor"}
+CLOCK = {"id": 4, "systemName": "clock"}
+
+
+def authorization_rule(consumer, provider, service_definition, interface_name):
+    return {
+        "consumerSystem": consumer,
+        "providerSystem": provider,
+        "serviceDefinition": {"serviceDefinition": service_definition},
+        "interfaces": [{"interfaceName": interface_name}],
+    }
+
+
+@pytest.fixture
+def matrix():
+    return ReachabilityMatrix.from_rules(
+        [
+            authorization_rule(DISPLAY, SENSOR, "temperature", "HTTP-SECURE-JSON"),
+            authorization_rule(DISPLAY, SENSOR, "temperature", "COAP-SECURE-JSON"),
+            authorization_rule(LOGGER, SENSOR, "temperature", "HTTP-SECURE-JSON"),
+            authorization_rule(LOGGER, CLOCK, "time", "HTTP-SECURE-JSON"),
+        ]
+    )
+
+
+def test_reachability_queries(matrix):
+    assert matrix.shape == (2, 2, 2)
+    assert len(matrix) == 3
+    assert matrix.dense().sum() == 3
+    assert matrix.consumers_of(SENSOR["id"]) == [1, 2]
+    assert matrix.consumers_of(SENSOR["id"], "time") == []
+    assert matrix.providers_for(LOGGER["id"]) == [3, 4]
+    assert matrix.missing_definitions(DISPLAY["id"]) == ["time"]
+    assert matrix.pair_counts().tolist() == [[1, 0], [1, 1]]
+
+
+def test_reachability_export(matrix, tmp_path):
+    matrix.export(tmp_path / "matrix.npz")
+    matrix.export(tmp_path / "matrix.csv")
+
+    arrays = np.load(tmp_path / "matrix.npz")
+    assert arrays["coordinates"].shape == (3, 3)
+    assert (tmp_path / "matrix.csv").read_text().splitlines() == [
+        ",sensor (3),clock (4)",
+        "display (1),1,0",
+        "logger (2),1,1",
+    ]
@@ -0,0 +1,35 @@
+import json
+
+from pyrrowhead.management.search import (
+    FuzzyIndex,
+    SearchDocument,
+    system_documents,
+)
+
+SYSTEMS = [
+    {"id": 1, "systemName": "temperature-sensor", "address": "10.0.0.1", "port": 80},
+    {"id": 2, "systemName": "humidity-sensor", "address": "10.0.0.2", "port": 80},
+    {"id": 3, "systemName": "display", "address": "10.0.0.3", "port": 80},
+]
+
+
+def test_fuzzy_search_ranks_closest_match_first():
+    index = FuzzyIndex(system_documents(SYSTEMS))
+
+    hits = index.search("temprature sensr", limit=2)
+
+    assert [hit.document.text for hit in hits] == [
+        "temperature-sensor",
+        "humidity-sensor",
+    ]
+    assert index.search("qqq") == []
+
+
+def test_fuzzy_index_round_trip():
+    index = FuzzyIndex(system_documents(SYSTEMS))
+
+    loaded = FuzzyIndex.from_dict(json.loads(json.dumps(index.to_dict())))
+
+    assert loaded.search("10.0.0.3")[0].document == SearchDocument(
+        "address", "10.0.0.3:80", "display (id: 3)"
+    )
@@ -0,0 +1,73 @@
+from pyrrowhead.management.simulator import (
+    NOT_AUTHORIZED,
+    NOT_REGISTERED,
+    OrchestrationSimulator,
+    provider_load,
+)
+
+DISPLAY = {"id": 1, "systemName": "display", "address": "127.0.0.1", "port": 5000}
+SENSOR = {"id": 2, "systemName": "sensor", "address": "127.0.0.1", "port": 5001}
+BACKUP = {"id": 3, "systemName": "backup", "address": "127.0.0.1", "port": 5002}
+TEMPERATURE = {"id": 10, "serviceDefinition": "temperature"}
+HTTP = {"id": 20, "interfaceName": "HTTP-SECURE-JSON"}
+
+
+def store_rule(rule_id, consumer, provider, priority):
+    return {
+        "id": rule_id,
+        "consumerSystem": consumer,
+        "providerSystem": provider,
+        "serviceDefinition": TEMPERATURE,
+        "serviceInterface": HTTP,
+        "priority": priority,
+        "foreign": False,
+    }
+
+
+def service(service_id, provider):
+    return {
+        "id": service_id,
+        "serviceDefinition": TEMPERATURE,
+        "provider": provider,
+        "interfaces": [HTTP],
+    }
+
+
+def authorization_rule(consumer, provider):
+    return {
+        "consumerSystem": consumer,
+        "providerSystem": provider,
+        "serviceDefinition": TEMPERATURE,
+        "interfaces": [HTTP],
+    }
+
+
+def test_orchestrate_orders_by_priority_and_filters():
+    simulator = OrchestrationSimulator(
+        [
+            store_rule(100, DISPLAY, SENSOR, priority=2),
+            store_rule(101, DISPLAY, BACKUP, priority=1),
+            store_rule(102, DISPLAY, DISPLAY, priority=3),
+            store_rule(103, SENSOR, BACKUP, priority=1),
+        ],
+        [service(50, SENSOR), service(51, BACKUP)],
+        [authorization_rule(DISPLAY, SENSOR), authorization_rule(SENSOR, BACKUP)],
+    )
+
+    orchestration = simulator.orchestrate(DISPLAY["id"], "temperature")
+
+    assert [candidate.rule["id"] for candidate in orchestration.candidates] == [
+        101,
+        100,
+        102,
+    ]
+    assert [candidate.excluded for candidate in orchestration.candidates] == [
+        NOT_AUTHORIZED,
+        None,
+        NOT_REGISTERED,
+    ]
+    assert [candidate.service_id for candidate in orchestration.providers] == [50]
+
+    orchestrations = list(simulator.orchestrate_all())
+    assert [o.consumer["id"] for o in orchestrations] == [DISPLAY["id"], SENSOR["id"]]
+    assert provider_load(orchestrations) == {("sensor", 2): 1, ("backup", 3): 1}
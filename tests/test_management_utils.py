@@ -0,0 +1,144 @@
+import json
+import time
+from pathlib import Path
+from unittest.mock import Mock, MagicMock
+
+import pytest
+
+from pyrrowhead.management import utils
+from pyrrowhead.management.utils import (
+    SessionPool,
+    DeadlineExceeded,
+    command_deadline,
+    configure_timeouts,
+    get_service,
+    _hedged_get,
+)
+
+SR_URL = "https://127.0.0.1:8443/serviceregistry/mgmt/"
+
+
+def test_session_reused_per_core_system(tmp_path: Path):
+    pool = SessionPool()
+
+    first, _ = pool.acquire(SR_URL, tmp_path)
+    second, _ = pool.acquire(SR_URL + "systems", tmp_path)
+    other, _ = pool.acquire("https://127.0.0.1:8445/orchestrator/mgmt/store", tmp_path)
+
+    assert first is second
+    assert first is not other
+
+
+def test_idle_sessions_are_evicted(tmp_path: Path):
+    pool = SessionPool(idle_timeout=-1)
+
+    first, release = pool.acquire(SR_URL, tmp_path)
+    release()
+    second, _ = pool.acquire(SR_URL, tmp_path)
+
+    assert first is not second
+
+
+def test_leased_sessions_are_closed_when_returned(monkeypatch, tmp_path: Path):
+    pool = SessionPool(idle_timeout=-1)
+    closed = []
+    monkeypatch.setattr(
+        utils.requests.Session, "close", lambda session: closed.append(session)
+    )
+
+    leased, release = pool.acquire(SR_URL, tmp_path)
+    # Neither idle eviction nor replacing the sessions closes a leased session
+    assert pool.acquire(SR_URL, tmp_path)[0] is leased
+    pool.retire_all()
+    assert closed == []
+
+    replacement, release_replacement = pool.acquire(SR_URL, tmp_path)
+    release()
+    release()
+    assert replacement is not leased
+    assert closed == []
+
+    release_replacement()
+    pool.retire_all()
+    assert closed == [replacement]
+
+
+def test_streamed_response_holds_session_until_closed(monkeypatch, tmp_path: Path):
+    pool = SessionPool(idle_timeout=-1)
+    monkeypatch.setattr(utils, "_session_pool", pool)
+    response = MagicMock()
+    monkeypatch.setattr(utils, "_send", lambda *args, **kwargs: response)
+
+    get_service(SR_URL, tmp_path, stream=True)
+    streaming_session, release = pool.acquire(SR_URL, tmp_path)
+    release()
+
+    # Still leased by the open response, so it is not evicted
+    session, release = pool.acquire(SR_URL, tmp_path)
+    release()
+    assert session is streaming_session
+
+    response.close()
+    assert pool.acquire(SR_URL, tmp_path)[0] is not streaming_session
+
+
+def test_deadline_exceeded(tmp_path: Path):
+    with pytest.raises(DeadlineExceeded):
+        with command_deadline(-1):
+            get_service("https://127.0.0.1:8443/serviceregistry/mgmt/", tmp_path)
+
+
+def test_configure_timeouts_keeps_unset_settings(monkeypatch):
+    monkeypatch.setattr(utils, "_settings", utils._RequestSettings())
+
+    configure_timeouts(hedge_delay=0.5)
+    configure_timeouts(connect=1.0, read=2.0)
+
+    assert utils._settings.hedge_delay == 0.5
+    assert (utils._settings.connect_timeout, utils._settings.read_timeout) == (1.0, 2.0)
+
+    configure_timeouts(hedge_delay=None)
+
+    assert utils._settings.hedge_delay is None
+    assert utils._settings.connect_timeout == 1.0
+
+
+def test_hedged_get_uses_first_response():
+    class SlowFirstSession:
+        def __init__(self):
+            self.calls = 0
+            self.responses = [Mock(name="slow"), Mock(name="fast")]
+
+        def get(self, url, **kwargs):
+            self.calls += 1
+            if self.calls == 1:
+                time.sleep(0.5)
+                return self.responses[0]
+            return self.responses[1]
+
+    session = SlowFirstSession()
+
+    response = _hedged_get(session, "https://127.0.0.1:8443/", 0.05)  # type: ignore
+
+    assert response is session.responses[1]
+
+
+def test_paged_records_walks_pages(monkeypatch, tmp_path: Path):
+    records = [{"id": i} for i in range(5)]
+    requested_pages = []
+
+    def mock_get_service(url, cloud_directory, params=None, timeout=None, stream=False):
+        page, page_size = params["page"], params["item_per_page"]
+        requested_pages.append(page)
+        data = records[page * page_size : (page + 1) * page_size]
+        payload = json.dumps({"data": data, "count": len(records)}).encode()
+        return MagicMock(status_code=200, iter_content=Mock(return_value=[payload]))
+
+    monkeypatch.setattr(utils, "get_service", mock_get_service)
+
+    paged_records = utils.get_paged_records("url", tmp_path, page_size=2)
+
+    assert next(paged_records) == {"id": 0}
+    assert requested_pages == [0]
+    assert list(paged_records) == records[1:]
+    assert requested_pages == [0, 1, 2]
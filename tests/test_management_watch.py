@@ -0,0 +1,95 @@
+import io
+
+import requests
+from rich.console import Console
+from rich.table import Table
+
+from pyrrowhead.management.watch import (
+    AdaptiveInterval,
+    RecordTracker,
+    watch_records,
+)
+
+SYSTEMS = [
+    {"id": 1, "systemName": "sensor", "address": "10.0.0.1", "port": 80},
+    {"id": 2, "systemName": "display", "address": "10.0.0.2", "port": 80},
+]
+
+
+def test_tracker_diffs_by_id_and_content():
+    tracker = RecordTracker()
+    assert tracker.update(SYSTEMS).added == SYSTEMS
+
+    moved_sensor = {**SYSTEMS[0], "port": 8080}
+    actuator = {"id": 3, "systemName": "actuator", "address": "10.0.0.3", "port": 80}
+    diff = tracker.update([actuator, moved_sensor])
+
+    assert diff.added == [actuator]
+    assert diff.changed == [moved_sensor]
+    assert diff.removed == [2]
+    assert not tracker.update([{**moved_sensor}, actuator])
+
+
+def test_adaptive_interval_backs_off_and_resets():
+    interval = AdaptiveInterval(1.0, 5.0)
+
+    assert [interval.update(changed=False) for _ in range(4)] == [2.0, 4.0, 5.0, 5.0]
+    assert interval.update(changed=True) == 1.0
+
+
+def test_watch_prints_only_changes():
+    polls = iter([SYSTEMS, SYSTEMS, SYSTEMS[:1]])
+    printed_rows = []
+    sleeps = []
+
+    def fetch():
+        try:
+            return next(polls)
+        except StopIteration:
+            raise KeyboardInterrupt
+
+    def create_table(systems):
+        printed_rows.extend(system["id"] for system in systems)
+        return Table()
+
+    watch_records(
+        fetch,
+        create_table,
+        interval=1.0,
+        console=Console(file=io.StringIO()),
+        sleep=sleeps.append,
+    )
+
+    assert printed_rows == [1, 2]
+    assert sleeps == [1.0, 2.0, 1.0]
+
+
+def test_watch_survives_connection_errors():
+    polls = iter(
+        [SYSTEMS, requests.ConnectionError("refused"), requests.Timeout(), SYSTEMS[:1]]
+    )
+    printed_rows = []
+    sleeps = []
+    output = io.StringIO()
+
+    def fetch():
+        poll = next(polls, KeyboardInterrupt())
+        if isinstance(poll, BaseException):
+            raise poll
+        return poll
+
+    def create_table(systems):
+        printed_rows.extend(system["id"] for system in systems)
+        return Table()
+
+    watch_records(
+        fetch,
+        create_table,
+        interval=1.0,
+        console=Console(file=output),
+        sleep=sleeps.append,
+    )
+
+    assert printed_rows == [1, 2]
+    assert sleeps == [1.0, 2.0, 4.0, 1.0]
+    assert "refused" in output.getvalue()
@@ -0,0 +1,178 @@
+import pytest
+
+from pyrrowhead.management.reconcile import (
+    ADD,
+    REMOVE,
+    UPDATE,
+    current_state,
+    plan,
+)
+from pyrrowhead.utils import PyrrowheadError
+
+SENSOR = {"id": 1, "systemName": "sensor", "address": "127.0.0.1", "port": 5000}
+DISPLAY = {"id": 2, "systemName": "display", "address": "127.0.0.1", "port": 5001}
+OLD = {"id": 3, "systemName": "old", "address": "127.0.0.1", "port": 5002}
+SERVICE_REGISTRY = {
+    "id": 4,
+    "systemName": "serviceregistry",
+    "address": "172.16.1.3",
+    "port": 8443,
+}
+
+STATE_FILE = """
+systems:
+  - {system_name: sensor, address: 127.0.0.1, port: 5000}
+  - {system_name: display, address: 127.0.0.1, port: 5001}
+services:
+  - service_definition: temperature
+    uri: /temperature
+    interface: HTTP-SECURE-JSON
+    system_name: sensor
+    address: 127.0.0.1
+    port: 5000
+orchestration:
+  - service_definition: temperature
+    interface: HTTP-SECURE-JSON
+    provider_name: sensor
+    provider_address: 127.0.0.1
+    provider_port: 5000
+    consumer_name: display
+    priority: 2
+"""
+
+
+def service(service_id, definition, provider, uri):
+    return {
+        "id": service_id,
+        "serviceDefinition": {"serviceDefinition": definition},
+        "provider": provider,
+        "serviceUri": uri,
+        "interfaces": [{"interfaceName": "HTTP-SECURE-JSON"}],
+        "secure": "CERTIFICATE",
+    }
+
+
+class FakeClient:
+    def list_systems(self):
+        return iter([SENSOR, DISPLAY, OLD, SERVICE_REGISTRY])
+
+    def list_services(self):
+        return iter(
+            [
+                service(10, "temperature", SENSOR, "/temperature"),
+                service(11, "service-register", SERVICE_REGISTRY, "/register"),
+            ]
+        )
+
+    def list_orchestration_rules(self):
+        return iter(
+            [
+                {
+                    "id": 20,
+                    "serviceDefinition": {"serviceDefinition": "temperature"},
+                    "serviceInterface": {"interfaceName": "HTTP-SECURE-JSON"},
+                    "consumerSystem": DISPLAY,
+                    "providerSystem": SENSOR,
+                    "priority": 1,
+                    "attribute": {},
+                }
+            ]
+        )
+
+    def list_authorization_rules(self):
+        return iter(
+            [
+                {
+                    "id": 30,
+                    "serviceDefinition": {"serviceDefinition": "temperature"},
+                    "interfaces": [{"interfaceName": "HTTP-SECURE-JSON"}],
+                    "consumerSystem": DISPLAY,
+                    "providerSystem": SENSOR,
+                }
+            ]
+        )
+
+    def is_core_system(self, system):
+        return system[0] == "serviceregistry"
+
+
+def plan_file(tmp_path, content, prune=False):
+    state_path = tmp_path / "state.yaml"
+    state_path.write_text(content)
+    return plan(FakeClient(), state_path, prune)
+
+
+def test_plan_changes(tmp_path):
+    changes = plan_file(tmp_path, STATE_FILE)
+
+    assert [(change.action, change.kind) for change in changes] == [
+        (UPDATE, "orchestration")
+    ]
+    assert changes[0].record_id == 20
+    assert changes[0].content[0] == 2
+
+
+def test_plan_changes_prune(tmp_path):
+    changes = plan_file(tmp_path, STATE_FILE.replace("priority: 2", ""), prune=True)
+
+    assert [(change.action, change.identity) for change in changes] == [
+        (REMOVE, ("old", "127.0.0.1", 5002))
+    ]
+
+
+def test_prune_only_sections_in_file(tmp_path):
+    systems_only = STATE_FILE.split("services:")[0]
+
+    changes = plan_file(tmp_path, systems_only, prune=True)
+
+    assert [(change.action, change.kind, change.record_id) for change in changes] == [
+        (REMOVE, "system", 3)
+    ]
+
+
+def test_services_with_different_uris(tmp_path):
+    class TwoUriClient(FakeClient):
+        def list_services(self):
+            return iter(
+                [
+                    service(10, "temperature", SENSOR, "/temperature"),
+                    service(12, "temperature", SENSOR, "/temperature/celsius"),
+                    service(11, "service-register", SERVICE_REGISTRY, "/register"),
+                ]
+            )
+
+    current, current_ids = current_state(TwoUriClient())
+    assert sorted(current_ids["service"].values()) == [10, 11, 12]
+
+    state_path = tmp_path / "state.yaml"
+    state_path.write_text(STATE_FILE.split("orchestration:")[0])
+    changes = plan(TwoUriClient(), state_path, prune=True)
+
+    assert [(change.action, change.record_id) for change in changes] == [
+        (REMOVE, 3),
+        (REMOVE, 12),
+    ]
+
+
+def test_plan_changes_adds_missing_entries(tmp_path):
+    changes = plan_file(tmp_path, "")
+    assert changes == []
+
+    changes = plan_file(
+        tmp_path,
+        STATE_FILE.replace("5001", "5003").replace(
+            "consumer_name: display", "consumer_name: display\n    consumer_port: 5003"
+        ),
+    )
+
+    assert {(change.action, change.kind) for change in changes} == {
+        (ADD, "system"),
+        (ADD, "orchestration"),
+    }
+
+
+def test_unresolved_consumer(tmp_path):
+    with pytest.raises(PyrrowheadError):
+        plan_file(
+            tmp_path, STATE_FILE.replace("consumer_name: display", "consumer_name: x")
+        )
@@ -0,0 +1,249 @@
+import gzip
+
+import pytest
+
+from pyrrowhead.cloud.snapshot import export_snapshot, import_snapshot, read_snapshot
+from pyrrowhead.management.bulk import AuthorizationRule, BulkResult
+from pyrrowhead.management.client import is_core_system_name
+from pyrrowhead.management.index import ServiceIndex, SystemIndex
+from pyrrowhead.utils import PyrrowheadError
+
+SENSOR = {"id": 4, "systemName": "sensor", "address": "127.0.0.1", "port": 5000}
+DISPLAY = {"id": 7, "systemName": "display", "address": "127.0.0.1", "port": 5001}
+ORCHESTRATOR = {
+    "id": 2,
+    "systemName": "orchestrator",
+    "address": "172.16.1.4",
+    "port": 8441,
+}
+ORCHESTRATION_SERVICE = {
+    "id": 3,
+    "serviceDefinition": {"id": 31, "serviceDefinition": "orchestration-service"},
+    "provider": ORCHESTRATOR,
+    "serviceUri": "/orchestrator/orchestration",
+    "interfaces": [{"id": 2, "interfaceName": "HTTP-SECURE-JSON"}],
+    "secure": "CERTIFICATE",
+}
+SERVICE = {
+    "id": 12,
+    "serviceDefinition": {"id": 30, "serviceDefinition": "temperature"},
+    "provider": SENSOR,
+    "serviceUri": "/temperature",
+    "interfaces": [{"id": 2, "interfaceName": "HTTP-SECURE-JSON"}],
+    "secure": "CERTIFICATE",
+    "metadata": {"unit": "C"},
+    "version": 1,
+}
+STORE_RULE = {
+    "id": 40,
+    "serviceDefinition": SERVICE["serviceDefinition"],
+    "serviceInterface": SERVICE["interfaces"][0],
+    "consumerSystem": DISPLAY,
+    "providerSystem": SENSOR,
+    "priority": 1,
+    "foreign": False,
+}
+AUTH_RULE = {
+    "id": 50,
+    "serviceDefinition": SERVICE["serviceDefinition"],
+    "interfaces": SERVICE["interfaces"],
+    "consumerSystem": DISPLAY,
+    "providerSystem": SENSOR,
+}
+
+
+def store_key(rule):
+    provider = rule["providerSystem"]
+    return (
+        rule["consumerSystem"]["id"],
+        (provider["systemName"], provider["address"], provider["port"]),
+        rule["serviceDefinition"]["serviceDefinition"],
+        rule["serviceInterface"]["interfaceName"],
+    )
+
+
+class FakeClient:
+    """Client of a cloud where every system, service and rule gets a new id."""
+
+    def __init__(self, systems=(), services=(), store=(), auth=()):
+        self.systems, self.services = list(systems), list(services)
+        self.store, self.auth = list(store), list(auth)
+
+    def list_systems(self):
+        return iter(self.systems)
+
+    def list_services(self):
+        return iter(self.services)
+
+    def list_orchestration_rules(self):
+        return iter(self.store)
+
+    def list_authorization_rules(self):
+        return iter(self.auth)
+
+    def add_systems(self, system_records, concurrency):
+        for system in system_records:
+            self.systems.append({"id": 100 + len(self.systems), **system})
+            yield BulkResult(system, self.systems[-1], 201)
+
+    def is_core_system(self, system):
+        return is_core_system_name(system[0])
+
+    def get_system_ids(self, systems):
+        return SystemIndex(self.systems).lookup_many(systems)
+
+    def register_services(self, registry_requests, concurrency):
+        for request in registry_requests:
+            provider_name = request["providerSystem"]["systemName"]
+            provider = next(
+                system
+                for system in self.systems
+                if system["systemName"] == provider_name
+            )
+            self.services.append(
+                {
+                    "id": 200 + len(self.services),
+                    "serviceDefinition": {
+                        "id": 300,
+                        "serviceDefinition": request["serviceDefinition"],
+                    },
+                    "provider": provider,
+                    "serviceUri": request["serviceUri"],
+                    "interfaces": [
+                        {"id": 400, "interfaceName": name}
+                        for name in request["interfaces"]
+                    ],
+                }
+            )
+            yield BulkResult(request, self.services[-1], 201)
+
+    @property
+    def service_index(self):
+        return ServiceIndex(
+            {
+                "servicesGroupedByServiceDefinition": [
+                    {
+                        "serviceDefinition": "temperature",
+                        "providerServices": self.services,
+                    }
+                ]
+            }
+        )
+
+    def add_orchestration_rules(self, rules, chunk_size, concurrency):
+        if not rules:
+            return []
+        store_rules = []
+        for rule in rules:
+            name, address, port = rule.provider
+            store_rules.append(
+                {
+                    "id": 500 + len(self.store) + len(store_rules),
+                    "serviceDefinition": {"serviceDefinition": rule.service_definition},
+                    "serviceInterface": {"interfaceName": rule.interface},
+                    "consumerSystem": {"id": rule.consumer_id},
+                    "providerSystem": {
+                        "systemName": name,
+                        "address": address,
+                        "port": port,
+                    },
+                    "priority": rule.priority,
+                }
+            )
+        # Like the orchestrator, reject chunks with rules that are already stored
+        if any(store_key(rule) in map(store_key, self.store) for rule in store_rules):
+            return [BulkResult(rules, {"errorMessage": "Duplicate rule"}, 400)]
+        self.store.extend(store_rules)
+        return [BulkResult(rules, {}, 201)]
+
+    def add_authorization_rules(self, rules, concurrency):
+        self.auth.extend(rules)
+        return [BulkResult(rules, {}, 201)]
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    snapshot_path = tmp_path / "snapshot.ndjson.gz"
+    source = FakeClient([SENSOR, DISPLAY], [SERVICE], [STORE_RULE], [AUTH_RULE])
+    counts = export_snapshot(source, snapshot_path)
+    assert counts == {"system": 2, "service": 1, "orchestration": 1, "authorization": 1}
+    return snapshot_path
+
+
+def test_export_round_trip(snapshot_path):
+    snapshot = read_snapshot(snapshot_path)
+
+    assert [system["name"] for system in snapshot["system"]] == ["sensor", "display"]
+    assert snapshot["service"][0]["provider"] == SENSOR["id"]
+    assert snapshot["service"][0]["metadata"] == {"unit": "C"}
+    assert snapshot["orchestration"][0]["consumer"] == DISPLAY["id"]
+    assert snapshot["authorization"][0]["interfaces"] == ["HTTP-SECURE-JSON"]
+    assert not list(snapshot_path.parent.glob(".*.tmp"))
+
+
+def test_import_remaps_ids(snapshot_path):
+    target = FakeClient()
+
+    results = import_snapshot(target, snapshot_path)
+
+    assert all(result.ok for section in results.values() for result in section)
+    sensor_id, display_id = 100, 101
+    assert target.services[0]["provider"]["id"] == sensor_id
+    assert store_key(target.store[0]) == (
+        display_id,
+        ("sensor", "127.0.0.1", 5000),
+        "temperature",
+        "HTTP-SECURE-JSON",
+    )
+    assert target.auth == [AuthorizationRule(display_id, sensor_id, 400, 300)]
+
+
+def test_reimport_reports_existing_records(snapshot_path):
+    target = FakeClient()
+    import_snapshot(target, snapshot_path)
+
+    results = import_snapshot(target, snapshot_path)
+
+    assert all(result.ok for section in results.values() for result in section)
+    for section in ("system", "service", "orchestration"):
+        assert all(result.response_data["exists"] for result in results[section])
+    assert len(target.systems) == 2
+    assert len(target.services) == 1
+    assert len(target.store) == 1
+
+
+def test_import_into_running_cloud(tmp_path):
+    snapshot_path = tmp_path / "snapshot.ndjson.gz"
+    source = FakeClient(
+        [ORCHESTRATOR, SENSOR, DISPLAY],
+        [ORCHESTRATION_SERVICE, SERVICE],
+        [STORE_RULE],
+        [AUTH_RULE],
+    )
+    export_snapshot(source, snapshot_path)
+    target_orchestrator = {**ORCHESTRATOR, "id": 50, "address": "10.0.0.4"}
+    target = FakeClient([target_orchestrator, {**SENSOR, "id": 60}])
+    target.services.append({**SERVICE, "id": 70, "provider": target.systems[1]})
+
+    results = import_snapshot(target, snapshot_path)
+
+    assert all(result.ok for section in results.values() for result in section)
+    assert [result.response_data.get("exists") for result in results["system"]] == [
+        True,
+        None,
+    ]
+    assert results["service"][0].response_data == {"id": 70, "exists": True}
+    assert [system["id"] for system in target.systems] == [50, 60, 102]
+    assert [service["id"] for service in target.services] == [70]
+
+
+def test_read_invalid_snapshot(tmp_path):
+    not_gzip = tmp_path / "snapshot.ndjson"
+    not_gzip.write_text('{"format": "pyrrowhead-snapshot", "version": 1}\n')
+    wrong_version = tmp_path / "snapshot.ndjson.gz"
+    with gzip.open(wrong_version, "wt") as snapshot_file:
+        snapshot_file.write('{"format": "pyrrowhead-snapshot", "version": 99}\n')
+
+    for snapshot_path in (not_gzip, wrong_version):
+        with pytest.raises(PyrrowheadError):
+            read_snapshot(snapshot_path)
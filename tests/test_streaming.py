@@ -0,0 +1,45 @@
+import json
+
+import pytest
+
+from pyrrowhead.management.streaming import iter_json_array
+
+DOCUMENT = {
+    "count": 3,
+    "data": [
+        {"id": 1, "serviceUri": "/temp", "metadata": {"unit": "°C", "nested": [1, 2]}},
+        {"id": 2, "serviceUri": "/hum", "metadata": None},
+        {"id": 12345, "serviceUri": '"]}\\', "metadata": {}},
+    ],
+    "trailing": {"data": ["not", "this"]},
+}
+
+
+def chunked(document: bytes, size: int):
+    return (document[i : i + size] for i in range(0, len(document), size))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 64, 4096])
+@pytest.mark.parametrize("indent", [None, 4])
+def test_iter_json_array(chunk_size, indent):
+    document = json.dumps(DOCUMENT, indent=indent, ensure_ascii=False).encode()
+
+    records = list(iter_json_array(chunked(document, chunk_size)))
+
+    assert records == DOCUMENT["data"]
+
+
+def test_iter_json_array_numbers_split_between_chunks():
+    records = iter_json_array([b'{"data": [12', b"34, 5", b"6]}"])
+
+    assert list(records) == [1234, 56]
+
+
+@pytest.mark.parametrize("document", [b"{}", b'{"data": []}', b'{"count": 0}'])
+def test_iter_json_array_empty(document):
+    assert list(iter_json_array([document])) == []
+
+
+def test_iter_json_array_malformed():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array([b'{"data": [{"id": 1}, {"id": ']))
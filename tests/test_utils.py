@@ -3,11 +3,28 @@ These tests cover code that is not run in the integration tests.
 """
 from sys import platform
 
+from pyrrowhead import utils
+from pyrrowhead._setup import _setup_pyrrowhead
 from pyrrowhead.utils import get_pyrrowhead_path
-from pyrrowhead.constants import APP_NAME
+from pyrrowhead.constants import (
+    APP_NAME,
+    CACHE_SUBDIR,
+    CONFIG_FILE,
+    LOCAL_CLOUDS_SUBDIR,
+)
 
 
 def test_get_pyrrowhead_path():
     # get_pyrrowhead_path is mocked in the integration tests,
 
     assert get_pyrrowhead_path().name == APP_NAME
+
+
+def test_setup_with_only_cache_directory(monkeypatch, tmp_path):
+    monkeypatch.setattr(utils, "get_pyrrowhead_path", lambda: tmp_path)
+    tmp_path.joinpath(CACHE_SUBDIR).mkdir()
+
+    _setup_pyrrowhead()
+
+    assert tmp_path.joinpath(CONFIG_FILE).is_file()
+    assert tmp_path.joinpath(LOCAL_CLOUDS_SUBDIR).is_dir()